@@ -0,0 +1,273 @@
+"""
+Offline package bundles for Agent Warden.
+
+A bundle is one gzip-compressed tar archive holding package checkouts (with
+their git metadata), the registry entries describing them and their content
+indexes, so hosts without access to GitHub can install the same packages.
+The manifest is the first member, which lets an import unpack the archive in
+a single streaming pass.
+
+Layout:
+    bundle.json                      manifest: {'version', 'created_at', 'packages'}
+    packages/<owner-repo>/...        package checkout, .git included (with any
+                                     objects borrowed from a package cache)
+    index/<owner-repo>/<commit>.json content index of the checkout's commit
+
+Only the parts of a git dir that describe the repository travel: hooks,
+links to other repositories and host settings stay behind, and an imported
+checkout's .git/config is rebuilt from a few portable settings, so nothing
+in a bundle runs on the importing host.
+"""
+
+import io
+import json
+import os
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Tuple
+
+from agent_warden.exceptions import WardenError
+
+BUNDLE_VERSION = 1
+MANIFEST_NAME = 'bundle.json'
+
+# Registry fields that describe the exporting host rather than the package
+HOST_FIELDS = ('remote_ref', 'remote_checked_at')
+
+# Git dir entries a bundle carries (no hooks, commondir or worktrees)
+GIT_DIR_ENTRIES = ('HEAD', 'ORIG_HEAD', 'FETCH_HEAD', 'config', 'index', 'packed-refs',
+                   'shallow', 'refs', 'objects', 'info', 'logs')
+
+# Settings kept in an imported checkout's .git/config (shallow, sparse and
+# partial clones need theirs); remote.origin.url is set by the importer
+PORTABLE_GIT_CONFIG = ('core.repositoryformatversion', 'core.sparsecheckout', 'core.sparsecheckoutcone',
+                       'extensions.partialclone', 'extensions.objectformat', 'remote.origin.fetch',
+                       'remote.origin.promisor', 'remote.origin.partialclonefilter')
+
+
+def _portable_git_path(parts: Tuple[str, ...]) -> bool:
+    """Whether a path in a git dir (its parts below .git) belongs in a bundle."""
+    if not parts:
+        return True
+    if parts[0] not in GIT_DIR_ENTRIES:
+        return False
+    # Borrowed objects are bundled in place of the link to them
+    return parts[:2] != ('objects', 'info') or parts[2:3] not in (('alternates',), ('http-alternates',))
+
+
+def write_portable_git_config(source: Path, dest: Path, url: Optional[str] = None):
+    """Write a git config holding only source's PORTABLE_GIT_CONFIG settings.
+
+    Args:
+        source: Config file to take settings from (may be missing)
+        dest: Config file to write (may be source)
+        url: remote.origin.url to set, if any
+
+    Raises:
+        WardenError: If git can't read or write the config
+    """
+    settings = [('core.bare', 'false')]
+    if source.is_file():
+        # --file doesn't follow include directives
+        stdout = _git_config(['--file', str(source), '--null', '--list'])
+        for entry in stdout.split('\0'):
+            key, _, value = entry.partition('\n')
+            if key in PORTABLE_GIT_CONFIG:
+                settings.append((key, value))
+    if url:
+        settings.append(('remote.origin.url', url))
+
+    tmp = dest.parent / f".{dest.name}.{uuid.uuid4().hex}"
+    try:
+        tmp.write_text('')
+        for key, value in settings:
+            _git_config(['--file', str(tmp), '--add', key, value])
+        os.replace(tmp, dest)
+    except OSError as e:
+        raise WardenError(f"Could not write git config {dest}: {e}") from e
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _git_config(args: List[str]) -> str:
+    try:
+        result = subprocess.run(['git', 'config'] + args, capture_output=True, text=True, timeout=30)
+    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        raise WardenError(f"git config failed: {e}") from e
+    if result.returncode != 0:
+        raise WardenError(f"git config failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def write_bundle(output_path: Path, packages: List[Tuple[Dict, Path, Path, Optional[Path]]]):
+    """Write a bundle.
+
+    Args:
+        output_path: Archive to create
+        packages: (registry entry, checkout dir, git dir, content index file
+                  or None) per package; the git dir may lie outside the
+                  checkout (submodule installs)
+    """
+    entries = {}
+    for package_data, _, _, _ in packages:
+        entry = {k: v for k, v in package_data.items() if k not in HOST_FIELDS}
+        entries[f"{entry['owner']}/{entry['repo']}"] = entry
+    manifest = {
+        'version': BUNDLE_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'packages': entries,
+    }
+
+    tmp = output_path.parent / f".{output_path.name}.{uuid.uuid4().hex}"
+    try:
+        with tarfile.open(tmp, 'w:gz') as tar:
+            data = json.dumps(manifest, indent=2).encode()
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(data)
+            info.mtime = int(datetime.now(timezone.utc).timestamp())
+            tar.addfile(info, io.BytesIO(data))
+
+            for _, package_dir, git_dir, index_file in packages:
+                arc_dir = f"packages/{package_dir.name}"
+                arc_git = f"{arc_dir}/.git"
+
+                # A submodule checkout's .git is a file pointing elsewhere;
+                # bundle the git dir it points to in its place
+                def skip_git(member: tarfile.TarInfo, arc_git=arc_git) -> Optional[tarfile.TarInfo]:
+                    return None if member.name == arc_git else member
+
+                def portable_only(member: tarfile.TarInfo, arc_git=arc_git) -> Optional[tarfile.TarInfo]:
+                    parts = PurePosixPath(member.name).relative_to(arc_git).parts
+                    return member if _portable_git_path(parts) and parts != ('config',) else None
+
+                tar.add(package_dir, arcname=arc_dir, filter=skip_git)
+                tar.add(git_dir, arcname=arc_git, filter=portable_only)
+                with tempfile.TemporaryDirectory() as config_dir:
+                    config = Path(config_dir) / 'config'
+                    write_portable_git_config(git_dir / 'config', config)
+                    tar.add(config, arcname=f"{arc_git}/config")
+
+                # Objects borrowed from a shared package cache go into the
+                # checkout's own object dir, so the bundled copy stands alone
+                for objects_dir in _alternate_object_dirs(git_dir):
+                    for entry in sorted(objects_dir.rglob('*')):
+                        rel_path = entry.relative_to(objects_dir)
+                        if (entry.is_dir() or rel_path.parts[0] == 'info'
+                                or (git_dir / 'objects' / rel_path).exists()):
+                            continue
+                        tar.add(entry, arcname=f"{arc_git}/objects/{rel_path.as_posix()}")
+                if index_file is not None:
+                    tar.add(index_file, arcname=f"index/{package_dir.name}/{index_file.name}")
+        os.replace(tmp, output_path)
+    except (OSError, tarfile.TarError) as e:
+        raise WardenError(f"Could not write bundle {output_path}: {e}") from e
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _alternate_object_dirs(git_dir: Path) -> List[Path]:
+    """Object dirs a repository borrows from (objects/info/alternates)."""
+    objects_dir = git_dir / 'objects'
+    try:
+        lines = (objects_dir / 'info' / 'alternates').read_text().splitlines()
+    except OSError:
+        return []
+    dirs = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            alternate = (objects_dir / line).resolve()
+            if alternate.is_dir():
+                dirs.append(alternate)
+    return dirs
+
+
+def _member_dest(member: tarfile.TarInfo, package_dirs: Dict[str, str]) -> Optional[Tuple[str, PurePosixPath]]:
+    """Where a member goes: ('packages' | 'index', path below it), or None to skip."""
+    path = PurePosixPath(member.name)
+    if path.is_absolute() or '..' in path.parts or len(path.parts) < 2:
+        return None
+    if path.parts[0] not in ('packages', 'index') or path.parts[1] not in package_dirs.values():
+        return None
+    if not (member.isfile() or member.isdir() or member.issym()):
+        return None
+    if member.issym() and (PurePosixPath(member.linkname).is_absolute() or '..' in PurePosixPath(member.linkname).parts):
+        return None
+    if path.parts[0] == 'packages' and path.parts[2:3] == ('.git',):
+        # The git dir itself, and only the portable parts of it
+        git_parts = path.parts[3:]
+        if (not git_parts and not member.isdir()) or not _portable_git_path(git_parts):
+            return None
+    return path.parts[0], PurePosixPath(*path.parts[1:])
+
+
+def read_bundle(source: Path, staging: Path) -> Dict:
+    """Unpack a bundle into a staging directory in one pass over the archive.
+
+    Package checkouts end up in staging/packages/<owner-repo> and content
+    indexes in staging/index/<owner-repo>. Members outside those packages,
+    absolute or escaping paths, links out of the tree, special files and
+    git dir entries other than GIT_DIR_ENTRIES (hooks, etc.) are skipped.
+
+    Returns:
+        The manifest
+
+    Raises:
+        WardenError: If the archive is not a readable bundle
+    """
+    # Use the standard library's extraction safeguards where available
+    extract_kwargs = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+    try:
+        with tarfile.open(source, 'r|gz') as tar:
+            members = iter(tar)
+            first = next(members, None)
+            if first is None or first.name != MANIFEST_NAME or not first.isfile():
+                raise WardenError(f"{source} is not an Agent Warden bundle")
+            try:
+                manifest = json.load(tar.extractfile(first))
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                raise WardenError(f"Invalid bundle manifest in {source}: {e}") from e
+            if manifest.get('version') != BUNDLE_VERSION:
+                raise WardenError(f"Unsupported bundle version {manifest.get('version')} in {source}")
+
+            package_dirs = {name: f"{data['owner']}-{data['repo']}"
+                            for name, data in manifest.get('packages', {}).items()}
+            for member in members:
+                dest = _member_dest(member, package_dirs)
+                if dest is None:
+                    continue
+                area, rel_path = dest
+                member.name = str(rel_path)
+                tar.extract(member, staging / area, **extract_kwargs)
+    except (OSError, tarfile.TarError, EOFError) as e:
+        raise WardenError(f"Could not read bundle {source}: {e}") from e
+    return manifest
+
+
+def install_staged_package(staging: Path, package_dir_name: str, repo_dir: Path, index_path: Path,
+                           url: str):
+    """Move one unpacked package checkout to repo_dir, and its content indexes into place.
+
+    The checkout's git config is rebuilt first (see write_portable_git_config),
+    with url as its origin, before git ever runs in it.
+    """
+    git_config = staging / 'packages' / package_dir_name / '.git' / 'config'
+    write_portable_git_config(git_config, git_config, url)
+
+    repo_dir.parent.mkdir(parents=True, exist_ok=True)
+    if repo_dir.exists():
+        shutil.rmtree(repo_dir)
+    os.replace(staging / 'packages' / package_dir_name, repo_dir)
+
+    staged_index = staging / 'index' / package_dir_name
+    if staged_index.is_dir():
+        (index_path / package_dir_name).mkdir(parents=True, exist_ok=True)
+        for index_file in staged_index.iterdir():
+            os.replace(index_file, index_path / package_dir_name / index_file.name)
@@ -5,8 +5,11 @@ Handles loading, saving, and accessing configuration, state, and registry data.
 """
 
 import json
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional
 
 
 class WardenConfig:
@@ -54,15 +57,25 @@ class WardenConfig:
     DEFAULT_TARGET = 'augment'
     CONFIG_FILE = '.warden_config.json'
     STATE_FILE = '.warden_state.json'
+    JOURNAL_FILE = '.warden_state.journal'
+    JOURNAL_COMPACT_BYTES = 1024 * 1024  # Fold the journal into the snapshot past this size
+    INDEX_FILE = '.warden_index.json'
+    RENDER_CACHE_FILE = '.warden_render_cache.json'
+    STATUS_CACHE_FILE = '.warden_status_cache.json'
     RULES_DIR = 'rules'
     COMMANDS_DIR = 'commands'
     PACKAGES_DIR = 'packages'
     REGISTRY_FILE = '.registry.json'
+    STORE_DIR = '.store'  # Pinned package versions, under the packages directory
+    PACKAGE_INDEX_DIR = '.index'  # Package content indexes, under the packages directory
+    REPOS_DIR = '.repos'  # Package git checkouts, under the packages directory
+    DEFAULT_PACKAGE_REF_TTL = 15 * 60  # Seconds a package's recorded remote ref is trusted
 
     def __init__(self, base_path: Path):
         self.base_path = Path(base_path).resolve()
         self.config_path = self.base_path / self.CONFIG_FILE
         self.state_path = self.base_path / self.STATE_FILE
+        self.journal_path = self.base_path / self.JOURNAL_FILE
         self.rules_dir = self.base_path / self.RULES_DIR
         self.commands_path = self.base_path / self.COMMANDS_DIR
         self.packages_path = self.base_path / self.PACKAGES_DIR
@@ -72,6 +85,21 @@ class WardenConfig:
         self.state = self._load_state()
         self.registry = self._load_registry()
 
+        # Write coalescing (see transaction()): nesting depth and the files
+        # whose save was requested while a transaction was open
+        self._transaction_lock = threading.RLock()
+        self._transaction_depth = 0
+        self._dirty: set = set()
+
+        # Projects changed since the last save, for journal mode (state_journal)
+        self._changed_projects: set = set()
+        # Top-level state keys (everything but 'projects') as last persisted,
+        # so journal mode can record the ones that changed since
+        self._saved_top_level = self._top_level_state()
+
+        # Called after every state save (see after_state_save)
+        self._state_save_hooks: List[Callable[[], None]] = []
+
         self.commands_path.mkdir(exist_ok=True)
         self.packages_path.mkdir(exist_ok=True)
 
@@ -86,6 +114,16 @@ class WardenConfig:
                         config['update_remote_projects'] = True
                     if 'auto_update' not in config:
                         config['auto_update'] = True
+                    if 'state_journal' not in config:
+                        config['state_journal'] = False
+                    if 'package_ref_ttl' not in config:
+                        config['package_ref_ttl'] = self.DEFAULT_PACKAGE_REF_TTL
+                    if 'package_prefetch' not in config:
+                        config['package_prefetch'] = False
+                    if 'package_clone' not in config:
+                        config['package_clone'] = 'full'
+                    if 'package_cache' not in config:
+                        config['package_cache'] = None
                     return config
             except (OSError, json.JSONDecodeError) as e:
                 print(f"Warning: Could not load config file: {e}")
@@ -95,19 +133,56 @@ class WardenConfig:
             'targets': self.TARGET_CONFIGS.copy(),
             'default_target': self.DEFAULT_TARGET,
             'update_remote_projects': True,
-            'auto_update': True
+            'auto_update': True,
+            'state_journal': False,
+            'package_ref_ttl': self.DEFAULT_PACKAGE_REF_TTL,
+            'package_prefetch': False,
+            'package_clone': 'full',
+            'package_cache': None
         }
 
     def _load_state(self) -> Dict:
-        """Load state from file or create empty state."""
+        """Load state from file or create empty state, then replay the journal."""
+        state = {'projects': {}}
         if self.state_path.exists():
             try:
                 with open(self.state_path) as f:
-                    return json.load(f)
+                    state = json.load(f)
             except (OSError, json.JSONDecodeError) as e:
                 print(f"Warning: Could not load state file: {e}")
 
-        return {'projects': {}}
+        # The journal is replayed even when journal mode is off, so switching
+        # the option off never loses changes that were only journaled.
+        self._replay_journal(state)
+        return state
+
+    def _replay_journal(self, state: Dict):
+        """Apply journaled project and top-level changes on top of the loaded snapshot.
+
+        Replay stops at the first unreadable line: that can only be a record
+        whose append was interrupted, and everything before it is intact.
+        """
+        if not self.journal_path.exists():
+            return
+        projects = state.setdefault('projects', {})
+        try:
+            with open(self.journal_path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        op = record['op']
+                        if op == 'put':
+                            projects[record['project']] = record['data']
+                        elif op == 'del':
+                            projects.pop(record['project'], None)
+                        elif op == 'set':
+                            state[record['key']] = record['value']
+                        elif op == 'unset':
+                            state.pop(record['key'], None)
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        break
+        except OSError as e:
+            print(f"Warning: Could not read state journal: {e}")
 
     def _load_registry(self) -> Dict:
         """Load package registry from file or create empty registry."""
@@ -120,6 +195,37 @@ class WardenConfig:
 
         return {'packages': {}, 'last_update_check': None}
 
+    @contextmanager
+    def transaction(self) -> Iterator['WardenConfig']:
+        """Coalesce state and registry writes until the outermost block exits.
+
+        Inside the block, save_state() and save_registry() only mark the file
+        dirty. On exit (normal or via exception) each dirty file is written
+        once; if nothing asked to be saved, nothing is written. Transactions
+        nest, and only the outermost one flushes.
+        """
+        with self._transaction_lock:
+            self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            with self._transaction_lock:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    dirty, self._dirty = self._dirty, set()
+                    if 'state' in dirty:
+                        self._flush_state()
+                    if 'registry' in dirty:
+                        self._write_registry()
+
+    def _defer_save(self, name: str) -> bool:
+        """Record a save request if a transaction is open; return True if deferred."""
+        with self._transaction_lock:
+            if self._transaction_depth:
+                self._dirty.add(name)
+                return True
+        return False
+
     def save_config(self):
         """Save current configuration to file."""
         try:
@@ -128,16 +234,108 @@ class WardenConfig:
         except OSError as e:
             raise RuntimeError(f"Could not save config file: {e}") from e
 
+    def mark_project_changed(self, project_name: str):
+        """Note that a project entry was written or removed since the last save.
+
+        In journal mode only these projects are appended on the next save.
+        """
+        with self._transaction_lock:
+            self._changed_projects.add(project_name)
+
+    def after_state_save(self, hook: Callable[[], None]):
+        """Run hook after every state save, e.g. to persist data derived from state."""
+        self._state_save_hooks.append(hook)
+
     def save_state(self):
-        """Save current state to file."""
+        """Save current state to file (deferred inside a transaction)."""
+        if not self._defer_save('state'):
+            self._flush_state()
+
+    def _top_level_state(self) -> Dict[str, str]:
+        """Serialize each top-level state key except 'projects', for change detection."""
+        return {key: json.dumps(value, sort_keys=True)
+                for key, value in self.state.items() if key != 'projects'}
+
+    def _flush_state(self):
+        """Journal the changed projects and top-level keys if possible, otherwise write a snapshot.
+
+        A save with no tracked changes (e.g. after a project entry was edited
+        directly) always falls back to a full snapshot.
+        """
+        with self._transaction_lock:
+            changed, self._changed_projects = self._changed_projects, set()
+        top_level = self._top_level_state()
+        changed_keys = {key for key in top_level.keys() | self._saved_top_level.keys()
+                        if top_level.get(key) != self._saved_top_level.get(key)}
+        if self.config.get('state_journal') and (changed or changed_keys):
+            self._append_journal(changed, changed_keys)
+            if self.journal_path.stat().st_size > self.JOURNAL_COMPACT_BYTES:
+                self.compact_state()
+        else:
+            self._write_state()
+        self._saved_top_level = top_level
+        for hook in self._state_save_hooks:
+            hook()
+
+    def _append_journal(self, project_names, keys=()):
+        projects = self.state.get('projects', {})
+        lines = []
+        for key in sorted(keys):
+            if key in self.state:
+                lines.append(json.dumps({'op': 'set', 'key': key, 'value': self.state[key]}))
+            else:
+                lines.append(json.dumps({'op': 'unset', 'key': key}))
+        for name in sorted(project_names):
+            if name in projects:
+                lines.append(json.dumps({'op': 'put', 'project': name, 'data': projects[name]}))
+            else:
+                lines.append(json.dumps({'op': 'del', 'project': name}))
+        try:
+            with open(self.journal_path, 'a') as f:
+                f.write('\n'.join(lines) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            raise RuntimeError(f"Could not append to state journal: {e}") from e
+
+    def compact_state(self):
+        """Fold the journal into a fresh snapshot and remove it.
+
+        The snapshot is written to a temporary file and moved into place, so a
+        crash leaves either the old snapshot plus journal or the new snapshot.
+        """
+        tmp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.state, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.state_path)
+            self.journal_path.unlink(missing_ok=True)
+            self._saved_top_level = self._top_level_state()
+        except OSError as e:
+            raise RuntimeError(f"Could not compact state file: {e}") from e
+
+    def _write_state(self):
         try:
             with open(self.state_path, 'w') as f:
                 json.dump(self.state, f, indent=2)
+            # The snapshot now holds everything the journal had
+            if self.journal_path.exists():
+                self.journal_path.unlink()
         except OSError as e:
             raise RuntimeError(f"Could not save state file: {e}") from e
 
+    def reload_registry(self):
+        """Re-read the registry from disk, dropping unsaved changes."""
+        self.registry = self._load_registry()
+
     def save_registry(self):
-        """Save current registry to file."""
+        """Save current registry to file (deferred inside a transaction)."""
+        if not self._defer_save('registry'):
+            self._write_registry()
+
+    def _write_registry(self):
         try:
             with open(self.registry_path, 'w') as f:
                 json.dump(self.registry, f, indent=2)
@@ -0,0 +1,198 @@
+"""
+Per-commit index of package content for Agent Warden.
+
+For every rule and command in a package commit, records its path, the
+frontmatter fields Agent Warden shows (description, globs, alwaysApply, tags,
+argument-hint), its size and its digest (git blob id). Indexes are read from
+git objects rather than the working tree, and a new commit's index is derived
+from its predecessor's by diffing the two commits, so discovery, search and
+info never walk a package.
+"""
+
+import json
+import os
+import subprocess
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from agent_warden.exceptions import WardenError
+from agent_warden.utils import parse_frontmatter
+
+# Package directories that are indexed, by item kind
+INDEXED_DIRS = {'rules': 'rules', 'commands': 'commands'}
+
+# Rule files that describe the rule format rather than being rules
+META_RULES = ('mdc', 'meta', 'format', 'template')
+
+FRONTMATTER_FIELDS = {
+    'description': 'description',
+    'globs': 'globs',
+    'alwaysApply': 'always_apply',
+    'tags': 'tags',
+    'argument-hint': 'argument_hint',
+}
+
+
+def _json_safe(value):
+    """Frontmatter values as JSON types (YAML can produce dates and the like)."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    return str(value)
+
+
+class PackageContentIndex:
+    """Indexes of package commits, stored as one JSON file per commit."""
+
+    VERSION = 1
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._loaded: Dict[tuple, Dict] = {}
+
+    def path(self, package_dir: str, commit: str) -> Path:
+        return self.root / package_dir / f"{commit}.json"
+
+    def load(self, package_dir: str, commit: Optional[str]) -> Optional[Dict]:
+        """The index of a commit, or None if it hasn't been built."""
+        if not commit:
+            return None
+        key = (package_dir, commit)
+        with self._lock:
+            if key in self._loaded:
+                return self._loaded[key]
+        try:
+            with open(self.path(package_dir, commit)) as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if index.get('version') != self.VERSION:
+            return None
+        with self._lock:
+            self._loaded[key] = index
+        return index
+
+    def build(self, repo_dir: Path, package_dir: str, commit: str,
+              base_commit: Optional[str] = None) -> Dict:
+        """Index a commit, incrementally from base_commit's index when there is one.
+
+        Raises:
+            WardenError: If git can't read the commits
+        """
+        index = self.load(package_dir, commit)
+        if index is not None:
+            return index
+
+        base = self.load(package_dir, base_commit)
+        dirs = list(INDEXED_DIRS.values())
+        if base is None:
+            listing = self._git(repo_dir, ['ls-tree', '-r', '--name-only', '-z', commit, '--'] + dirs)
+            changed = [p for p in os.fsdecode(listing).split('\0') if p]
+            items = {}
+        else:
+            diff = self._git(repo_dir, ['diff', '--name-status', '--no-renames', '-z',
+                                        base_commit, commit, '--'] + dirs)
+            fields = [f for f in os.fsdecode(diff).split('\0') if f]
+            items = dict(base['items'])
+            changed = []
+            for status, rel_path in zip(fields[::2], fields[1::2]):
+                if status == 'D':
+                    items.pop(rel_path, None)
+                else:
+                    changed.append(rel_path)
+
+        items.update(self._read_items(repo_dir, commit, [p for p in changed if p.endswith('.md')]))
+
+        index = {'version': self.VERSION, 'commit': commit, 'items': items}
+        self._save(package_dir, commit, index)
+        return index
+
+    def remove_package(self, package_dir: str):
+        """Forget every index of a package."""
+        with self._lock:
+            for key in [k for k in self._loaded if k[0] == package_dir]:
+                del self._loaded[key]
+        target = self.root / package_dir
+        if target.is_dir():
+            for index_file in target.iterdir():
+                index_file.unlink()
+            target.rmdir()
+
+    @staticmethod
+    def content(index: Dict) -> Dict[str, List[str]]:
+        """Rule and command names in an index (the registry's 'content' format)."""
+        content = {'rules': [], 'commands': []}
+        for rel_path in sorted(index['items']):
+            for kind, dir_name in INDEXED_DIRS.items():
+                if not rel_path.startswith(f"{dir_name}/"):
+                    continue
+                name = rel_path[len(dir_name) + 1:-len('.md')]
+                if kind == 'rules' and name.lower() in META_RULES:
+                    continue
+                content[kind].append(name)
+        return content
+
+    @staticmethod
+    def entry(index: Dict, kind: str, name: str) -> Optional[Dict]:
+        """Index entry of a rule or command, or None."""
+        return index['items'].get(f"{INDEXED_DIRS[kind]}/{name}.md")
+
+    @staticmethod
+    def _git(repo_dir: Path, args: List[str], input_data: Optional[bytes] = None) -> bytes:
+        try:
+            result = subprocess.run(['git'] + args, cwd=repo_dir, input=input_data,
+                                    capture_output=True, timeout=120)
+        except (subprocess.TimeoutExpired, FileNotFoundError, NotADirectoryError) as e:
+            raise WardenError(f"git {args[0]} failed: {e}") from e
+        if result.returncode != 0:
+            raise WardenError(f"git {args[0]} failed: {result.stderr.decode(errors='replace').strip()}")
+        return result.stdout
+
+    def _read_items(self, repo_dir: Path, commit: str, rel_paths: Iterable[str]) -> Dict[str, Dict]:
+        """Index entries for files of a commit, read with one cat-file process."""
+        rel_paths = list(rel_paths)
+        if not rel_paths:
+            return {}
+
+        output = self._git(repo_dir, ['cat-file', '--batch'],
+                           input_data=''.join(f"{commit}:{p}\n" for p in rel_paths).encode())
+        items = {}
+        pos = 0
+        for rel_path in rel_paths:
+            header_end = output.index(b'\n', pos)
+            header = output[pos:header_end].decode().split()
+            if len(header) != 3:  # "<spec> missing"
+                pos = header_end + 1
+                continue
+            blob, _, size = header
+            data = output[header_end + 1:header_end + 1 + int(size)]
+            pos = header_end + 1 + int(size) + 1
+
+            frontmatter, _ = parse_frontmatter(data.decode('utf-8', errors='replace'))
+            if not isinstance(frontmatter, dict):
+                frontmatter = {}
+            entry = {'path': rel_path, 'size': int(size), 'digest': blob}
+            for field, key in FRONTMATTER_FIELDS.items():
+                if field in frontmatter:
+                    entry[key] = _json_safe(frontmatter[field])
+            items[rel_path] = entry
+        return items
+
+    def _save(self, package_dir: str, commit: str, index: Dict):
+        index_path = self.path(package_dir, commit)
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = index_path.parent / f".{index_path.name}.{uuid.uuid4().hex}"
+            with open(tmp, 'w') as f:
+                json.dump(index, f)
+            os.replace(tmp, index_path)
+        except OSError as e:
+            print(f"Warning: Could not save package index: {e}")
+        with self._lock:
+            self._loaded[(package_dir, commit)] = index
@@ -4,7 +4,8 @@ Output formatting utilities for Agent Warden.
 Provides color codes and formatting functions for terminal output.
 """
 
-from typing import TYPE_CHECKING, Dict
+import json
+from typing import TYPE_CHECKING, Dict, Optional
 
 if TYPE_CHECKING:
     from agent_warden.project import ProjectState
@@ -168,7 +169,7 @@ def format_project_detailed(project: 'ProjectState', manager) -> str:
 
                 for rule_info in target_config['installed_rules']:
                     rule_name = rule_info['name'] if isinstance(rule_info, dict) else rule_info
-                    rule_status = get_item_status(rule_name, 'rule', status)
+                    rule_status = get_item_status(rule_name, 'rule', status, target_name)
                     info += f"         • {rule_name:<{max_rule_len}} {rule_status}\n"
 
             # Display commands
@@ -180,7 +181,7 @@ def format_project_detailed(project: 'ProjectState', manager) -> str:
 
                 for cmd_info in target_config['installed_commands']:
                     cmd_name = cmd_info['name'] if isinstance(cmd_info, dict) else cmd_info
-                    cmd_status = get_item_status(cmd_name, 'command', status)
+                    cmd_status = get_item_status(cmd_name, 'command', status, target_name)
                     info += f"         • {cmd_name:<{max_cmd_len}} {cmd_status}\n"
     except Exception as e:
         info += f"\n   [WARNING] Could not retrieve status: {e}\n"
@@ -188,17 +189,34 @@ def format_project_detailed(project: 'ProjectState', manager) -> str:
     return info
 
 
-def get_item_status(item_name: str, item_type: str, status: Dict) -> str:
+# Status label for each check_project_status category
+ITEM_STATUS_LABELS = {
+    'conflict_rules': 'CONFLICT', 'conflict_commands': 'CONFLICT',
+    'user_modified_rules': 'MODIFIED', 'user_modified_commands': 'MODIFIED',
+    'outdated_rules': 'OUTDATED', 'outdated_commands': 'OUTDATED',
+    'missing_sources': 'MISSING SOURCE',
+    'missing_installed': 'MISSING FILE',
+}
+
+
+def get_item_status(item_name: str, item_type: str, status: Dict, target: Optional[str] = None) -> str:
     """Get status indicator for an item with color.
 
     Args:
         item_name: Name of the item (rule or command)
         item_type: Type of item ('rule' or 'command')
         status: Status dictionary from check_project_status
+        target: Target the item is installed in. With a status that has an
+                'item_status' index this is a single lookup for that target;
+                otherwise the status lists are scanned by name across targets.
 
     Returns:
         Colored status string
     """
+    if target is not None and 'item_status' in status:
+        category = status['item_status'].get(item_type, {}).get(target, {}).get(item_name)
+        return colored_status(ITEM_STATUS_LABELS[category] if category else 'UP TO DATE')
+
     # Check if item is in any status category
     if item_type == 'rule':
         if any(r['name'] == item_name for r in status.get('conflict_rules', [])):
@@ -225,3 +243,35 @@ def get_item_status(item_name: str, item_type: str, status: Dict) -> str:
 
     return colored_status('UP TO DATE')
 
+
+STATUS_COUNT_KEYS = (
+    'outdated_rules', 'outdated_commands',
+    'user_modified_rules', 'user_modified_commands',
+    'conflict_rules', 'conflict_commands',
+    'missing_sources', 'missing_installed',
+)
+
+
+def format_status_ndjson(project_name: str, status: Optional[Dict]) -> str:
+    """Format one project's status as a single-line JSON object.
+
+    Args:
+        project_name: Name of the project
+        status: Status dictionary from check_project_status, None for a
+                project without issues, or {'error': message}
+
+    Returns:
+        JSON string without a trailing newline
+    """
+    if status is None:
+        record = {'project': project_name, 'state': 'clean',
+                  'counts': dict.fromkeys(STATUS_COUNT_KEYS, 0)}
+    elif 'error' in status:
+        record = {'project': project_name, 'state': 'error', 'error': status['error']}
+    else:
+        counts = {key: len(status.get(key, [])) for key in STATUS_COUNT_KEYS}
+        record = {'project': project_name,
+                  'state': 'drifted' if any(counts.values()) else 'clean',
+                  'counts': counts}
+        record.update({key: status[key] for key in STATUS_COUNT_KEYS if status.get(key)})
+    return json.dumps(record)
@@ -0,0 +1,194 @@
+"""
+Reverse installation index for Agent Warden.
+
+Maps every installed rule and command back to the projects and targets it
+is installed in, so questions like "where is this rule installed?" can be
+answered without walking every project in the state file.
+"""
+
+import json
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from agent_warden.config import WardenConfig
+    from agent_warden.project import ProjectState
+
+
+class InstallationIndex:
+    """Persistent reverse index from item name to installations.
+
+    The index is stored per project together with a fingerprint of the state
+    entry it was built from (timestamp, path and item counts). On load, only projects whose
+    fingerprint changed - or which appeared or disappeared - are reindexed, so
+    edits made by other processes or by hand are picked up without a full
+    rebuild.
+    """
+
+    VERSION = 1
+
+    def __init__(self, config: 'WardenConfig'):
+        self.config = config
+        self.index_path = config.base_path / config.INDEX_FILE
+        self._projects: Dict[str, Dict] = {}
+        self._by_name: Dict[Tuple[str, str], List[Dict]] = {}
+        self._dirty = False
+
+    @staticmethod
+    def _fingerprint(data: Dict) -> List:
+        """Cheap summary of a state entry: timestamp, location and item counts."""
+        counts = sorted(
+            [target, len(config.get('installed_rules', [])), len(config.get('installed_commands', []))]
+            for target, config in data.get('targets', {}).items()
+        )
+        return [data.get('timestamp'), data.get('path'), counts]
+
+    def load(self):
+        """Load the index file and bring it in line with the current state."""
+        stored = {}
+        if self.index_path.exists():
+            try:
+                with open(self.index_path) as f:
+                    raw = json.load(f)
+                if raw.get('version') == self.VERSION:
+                    stored = raw.get('projects', {})
+            except (OSError, json.JSONDecodeError, AttributeError):
+                stored = {}
+                self._dirty = True
+
+        self._projects = stored
+        self._by_name = {}
+        for project_name, record in self._projects.items():
+            self._link(project_name, record)
+
+    def sync(self, get_project_state) -> bool:
+        """Reindex projects whose state entry changed since the index was written.
+
+        Args:
+            get_project_state: Callable returning the ProjectState for a name
+
+        Returns:
+            True if any project had to be reindexed or dropped
+        """
+        state_projects = self.config.state.get('projects', {})
+        changed = False
+
+        for project_name in list(self._projects):
+            if project_name not in state_projects:
+                self.remove_project(project_name)
+                changed = True
+
+        for project_name, data in state_projects.items():
+            record = self._projects.get(project_name)
+            if record is None or record.get('fingerprint') != self._fingerprint(data):
+                self.update_project(get_project_state(project_name))
+                changed = True
+
+        return changed
+
+    def update_project(self, project_state: 'ProjectState'):
+        """Replace all index entries for a project with its current installations."""
+        self._unlink(project_state.name)
+
+        path = str(project_state.path)
+        is_remote = project_state.is_remote()
+        entries = []
+        for target_name, target_config in project_state.targets.items():
+            for kind, key in (('rule', 'installed_rules'), ('command', 'installed_commands')):
+                items = target_config.get(key, [])
+                if not items:
+                    continue
+                if kind == 'rule':
+                    dest_dir = project_state.get_rules_destination_path(self.config, target_name)
+                    extension = self.config.get_target_rule_extension(target_name)
+                else:
+                    dest_dir = project_state.get_commands_destination_path(self.config, target_name)
+                    extension = '.md'
+                for item in items:
+                    item_name = item['name'] if isinstance(item, dict) else item
+                    file_name = item_name.split(':', 1)[1] if ':' in item_name else item_name
+                    entries.append({
+                        'kind': kind,
+                        'name': item_name,
+                        'target': target_name,
+                        'full_path': str(dest_dir / f"{file_name}{extension}"),
+                    })
+
+        record = {
+            'fingerprint': self._fingerprint(project_state.to_dict()),
+            'path': path,
+            'is_remote': is_remote,
+            'entries': entries,
+        }
+        self._projects[project_state.name] = record
+        self._link(project_state.name, record)
+        self._dirty = True
+
+    def remove_project(self, project_name: str):
+        """Drop every index entry belonging to a project."""
+        if project_name in self._projects:
+            self._unlink(project_name)
+            del self._projects[project_name]
+            self._dirty = True
+
+    def _installation(self, project_name: str, record: Dict, entry: Dict) -> Dict:
+        return {
+            'project': project_name,
+            'path': record['path'],
+            'target': entry['target'],
+            'full_path': entry['full_path'],
+            'is_remote': record['is_remote'],
+        }
+
+    def _link(self, project_name: str, record: Dict):
+        for entry in record.get('entries', []):
+            installation = self._installation(project_name, record, entry)
+            self._by_name.setdefault((entry['kind'], entry['name']), []).append(installation)
+
+    def _unlink(self, project_name: str):
+        record = self._projects.get(project_name)
+        if record is None:
+            return
+        for entry in record.get('entries', []):
+            key = (entry['kind'], entry['name'])
+            remaining = [i for i in self._by_name.get(key, []) if i['project'] != project_name]
+            if remaining:
+                self._by_name[key] = remaining
+            else:
+                self._by_name.pop(key, None)
+
+    def installations(self, kind: str, item_name: str) -> List[Dict]:
+        """Get every installation of a rule or command by its installed name.
+
+        Args:
+            kind: 'rule' or 'command'
+            item_name: Name as stored in state (e.g. 'coding-style' or 'owner/repo:deploy')
+        """
+        return list(self._by_name.get((kind, item_name), []))
+
+    def installed_names(self, kind: str) -> Dict[str, List[Dict]]:
+        """Get a map of installed item name -> installations for one kind."""
+        return {name: list(installs) for (k, name), installs in self._by_name.items() if k == kind}
+
+    def save(self, force: bool = False):
+        """Write the index to disk if it changed."""
+        if not self._dirty and not force:
+            return
+        try:
+            with open(self.index_path, 'w') as f:
+                json.dump({'version': self.VERSION, 'projects': self._projects}, f, indent=2)
+        except OSError as e:
+            raise RuntimeError(f"Could not save index file: {e}") from e
+        self._dirty = False
+
+
+def package_item_names(package_name: str, content: Optional[Dict]) -> List[Tuple[str, str]]:
+    """List (kind, installed name) pairs for a package's discovered content."""
+    if not content:
+        return []
+    names = []
+    for rule in content.get('rules', []):
+        names.append(('rule', f"{package_name}:{rule}"))
+    for command in content.get('commands', []):
+        names.append(('command', f"{package_name}:{command}"))
+    return names
+
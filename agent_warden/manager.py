@@ -5,15 +5,24 @@ Handles project installation, updates, removal, and synchronization.
 """
 
 import difflib
+import functools
+import hashlib
+import json
 import os
 import shutil
 import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
+from agent_warden.bundle import install_staged_package, read_bundle, write_bundle
 from agent_warden.config import WardenConfig
+from agent_warden.content_index import FRONTMATTER_FIELDS, PackageContentIndex
 from agent_warden.exceptions import (
     FileOperationError,
     InvalidTargetError,
@@ -22,11 +31,24 @@ from agent_warden.exceptions import (
     WardenError,
 )
 from agent_warden.hal import convert_rule_format
-from agent_warden.package import GitHubPackage
+from agent_warden.index import InstallationIndex, package_item_names
+from agent_warden.mirror import PackageMirrors
+from agent_warden.package import (
+    CLONE_STRATEGIES,
+    COMMAND_DIRS,
+    CONTENT_DIRS,
+    GitHubPackage,
+)
+from agent_warden.parallel import project_host, run_by_host
 from agent_warden.project import ProjectState
+from agent_warden.status_cache import StatusCache
+from agent_warden.store import PackageStore
 from agent_warden.utils import (
+    DigestTable,
+    RenderedDigestCache,
     calculate_content_checksum,
     calculate_file_checksum,
+    parse_frontmatter,
     process_command_template,
 )
 from fs_backend import (
@@ -34,7 +56,6 @@ from fs_backend import (
     FileSystemBackend,
     LocalBackend,
     RemoteBackend,
-    RemoteOperationError,
     RemotePathError,
     RemotePermissionError,
     SSHConnectionError,
@@ -42,9 +63,29 @@ from fs_backend import (
 )
 
 
+def _in_run_scope(method):
+    """Run a manager method inside WardenManager._run_scope()."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._run_scope():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class WardenManager:
     """Main manager class for Agent Warden operations."""
 
+    # Projects with at least this many installed items have their status
+    # checked item by item on the shared item pool
+    ITEM_PARALLEL_THRESHOLD = 32
+    ITEM_WORKERS = 16
+
+    # Concurrent git processes when checking every package for updates
+    PACKAGE_PROBE_WORKERS = 8
+
+    # Concurrent package clones / updates in install_packages and update_packages
+    PACKAGE_WORKERS = 4
+
     def __init__(self, base_path: Optional[Union[str, Path]] = None):
         if base_path is None:
             # Always use the directory where warden.py is located
@@ -55,6 +96,46 @@ class WardenManager:
 
         self.config = WardenConfig(base_path)
 
+        # Identity map: project name -> (state entry it was built from, ProjectState).
+        # Lets every project be materialised once per command instead of on
+        # every from_dict call.
+        self._project_cache: Dict[str, Tuple[Dict, ProjectState]] = {}
+        self._project_cache_lock = threading.Lock()
+
+        # Reverse index (item -> installations); loaded on first use
+        self._installation_index: Optional[InstallationIndex] = None
+
+        # Source digests for the current run (see _run_scope)
+        self._digests: Optional[DigestTable] = None
+        self._run_depth = 0
+        self._run_lock = threading.Lock()
+
+        # Digests of rendered (template-processed / HAL-converted) items,
+        # persisted between runs; loaded on first use
+        self._render_cache: Optional[RenderedDigestCache] = None
+
+        # Last status verdict per project (see check_all_projects_status)
+        self._status_cache: Optional[StatusCache] = None
+
+        # Pool for per-item status checks, shared by all projects in a run.
+        # Separate from the per-project pools so item tasks never wait on a
+        # worker that is itself waiting on them.
+        self._item_executor: Optional[ThreadPoolExecutor] = None
+
+        # Staged (rendered / renamed) files shared by every install in a run
+        # (see _stage_item); removed when the run ends
+        self._stage_dir: Optional[Path] = None
+
+        # Pinned package versions (see _package_version_dir); created on first use
+        self._package_store: Optional[PackageStore] = None
+
+        # Per-commit package content indexes (see _index_package_content)
+        self._content_index: Optional[PackageContentIndex] = None
+
+        # Serializes git commands that change the warden repository itself
+        # (submodule add / mv), which concurrent package installs would race on
+        self._base_repo_lock = threading.Lock()
+
         # Ensure rules directory exists
         if not self.config.rules_dir.exists():
             raise FileNotFoundError(f"Rules directory not found: {self.config.rules_dir}")
@@ -95,6 +176,246 @@ class WardenManager:
         else:
             return location_str, project_path, backend
 
+    def _get_project_state(self, project_name: str) -> ProjectState:
+        """Get the ProjectState for a tracked project, materialising it once.
+
+        The cached instance is reused for as long as the state entry it was
+        built from is still the one stored in config.state and unchanged.
+
+        Args:
+            project_name: Exact project name as stored in state
+        """
+        data = self.config.state['projects'][project_name]
+        with self._project_cache_lock:
+            cached = self._project_cache.get(project_name)
+            if cached is not None and cached[0] is data and cached[1].matches_dict(data):
+                return cached[1]
+            project_state = ProjectState.from_dict(data)
+            self._project_cache[project_name] = (data, project_state)
+            return project_state
+
+    def _store_project_state(self, project_name: str, project_state: ProjectState):
+        """Write a project back to state and keep the identity map in sync."""
+        data = project_state.to_dict()
+        self.config.state['projects'][project_name] = data
+        self.config.mark_project_changed(project_name)
+        with self._project_cache_lock:
+            self._project_cache[project_name] = (data, project_state)
+            if self._installation_index is not None:
+                self._installation_index.update_project(project_state)
+
+    def _project_host(self, project_name: str) -> Optional[str]:
+        """Scheduling key for fleet operations: the project's SSH target, None if local."""
+        try:
+            return project_host(self._get_project_state(project_name))
+        except (BackendError, ValueError):
+            return None  # The task itself will report the bad location
+
+    def _forget_project_state(self, project_name: str):
+        """Drop a project from the identity map (after untrack or rename)."""
+        self.config.mark_project_changed(project_name)
+        with self._project_cache_lock:
+            self._project_cache.pop(project_name, None)
+            if self._installation_index is not None:
+                self._installation_index.remove_project(project_name)
+
+    def _get_installation_index(self) -> InstallationIndex:
+        """Get the reverse installation index.
+
+        The index is loaded from disk and synced with the state file once per
+        manager, which reindexes any project whose state entry was changed
+        behind its back; afterwards it is kept current by
+        _store_project_state/_forget_project_state, so lookups don't touch
+        every project, and saved along with the state.
+        """
+        if self._installation_index is None:
+            index = InstallationIndex(self.config)
+            index.load()
+            index.sync(self._get_project_state)
+            self._installation_index = index
+            self._save_installation_index()
+            self.config.after_state_save(self._save_installation_index)
+        return self._installation_index
+
+    def _save_installation_index(self):
+        """Write the installation index if it changed (runs after each state save)."""
+        with self._project_cache_lock:
+            try:
+                self._installation_index.save()
+            except RuntimeError as e:
+                print(f"Warning: {e}")
+
+    def get_item_installations(self, item_name: str, item_type: str = 'rule') -> List[Dict]:
+        """Get every project/target an item is installed in.
+
+        Args:
+            item_name: Item name as installed (e.g. 'coding-style' or 'owner/repo:deploy')
+            item_type: 'rule' or 'command'
+
+        Returns:
+            List of dicts with project, path, target, full_path and is_remote
+        """
+        return self._get_installation_index().installations(item_type, item_name)
+
+    def get_rule_installations(self) -> Dict[str, List[Dict]]:
+        """Get a map of rule name -> installations, including uninstalled rules."""
+        installed = self._get_installation_index().installed_names('rule')
+        rule_installations = {rule: [] for rule in self._get_available_rules()}
+        rule_installations.update(installed)
+        return rule_installations
+
+    @contextmanager
+    def _run_scope(self) -> Iterator[DigestTable]:
+        """Share one source digest table across everything done in this block.
+
+        A rule installed in many projects is hashed once per run rather than
+        once per project. Scopes nest; the table is dropped when the outermost
+        scope exits, so files edited between runs are always re-read.
+        """
+        with self._run_lock:
+            if self._run_depth == 0:
+                self._digests = DigestTable()
+            self._run_depth += 1
+            table = self._digests
+        try:
+            yield table
+        finally:
+            with self._run_lock:
+                self._run_depth -= 1
+                if self._run_depth == 0:
+                    self._digests = None
+                    if self._render_cache is not None:
+                        self._render_cache.save()
+                    if self._item_executor is not None:
+                        self._item_executor.shutdown(wait=False)
+                        self._item_executor = None
+                    if self._stage_dir is not None:
+                        shutil.rmtree(self._stage_dir, ignore_errors=True)
+                        self._stage_dir = None
+
+    def _source_checksum(self, source_path: Path) -> str:
+        """Checksum of a source file, memoized for the current run if one is open."""
+        table = self._digests
+        if table is None:
+            return calculate_file_checksum(source_path)
+        return table.file_checksum(source_path)
+
+    def _get_render_cache(self) -> RenderedDigestCache:
+        """Get the persistent rendered-digest cache, loading it on first use."""
+        with self._run_lock:
+            if self._render_cache is None:
+                # Tie cached digests to the exact renderer code that produced them
+                renderer = hashlib.sha256()
+                for module_path in (Path(__file__).with_name('hal.py'), Path(__file__).with_name('utils.py')):
+                    renderer.update(module_path.read_bytes())
+                self._render_cache = RenderedDigestCache(
+                    self.config.base_path / self.config.RENDER_CACHE_FILE, renderer.hexdigest())
+            return self._render_cache
+
+    @staticmethod
+    def _is_rendered(source_path: Path, target: Optional[str], use_copy: bool) -> bool:
+        """Whether an item is installed as rendered content rather than as-is.
+
+        Markdown sources are template-processed (commands) or HAL-converted
+        (rules) whenever they are copied, which includes every remote install.
+        """
+        return target is not None and use_copy and source_path.suffix == '.md'
+
+    def _render_item(self, source_path: Path, target: str, is_command: bool) -> str:
+        """Render a source file the way it is written into a project for target."""
+        def render() -> str:
+            content = source_path.read_text()
+            if is_command:
+                return process_command_template(content, target, self.config.get_target_rules_path(target))
+            return convert_rule_format(content, target)
+
+        table = self._digests
+        if table is None:
+            return render()
+        return table.get(('rendered', str(source_path), target, is_command), render)
+
+    def _expected_checksum(self, source_path: Path, target: Optional[str], is_command: bool,
+                           use_copy: bool) -> str:
+        """Checksum an installed copy of source_path should have for target.
+
+        For rendered items the digest comes from the persistent render cache,
+        keyed by source checksum, target and template inputs, so each distinct
+        source is rendered at most once across projects and runs.
+        """
+        source_checksum = self._source_checksum(source_path)
+        if not self._is_rendered(source_path, target, use_copy):
+            return source_checksum
+
+        template_input = self.config.get_target_rules_path(target) if is_command else ''
+        key = ('command' if is_command else 'rule', target, template_input, source_checksum)
+        return self._get_render_cache().get(
+            key, lambda: calculate_content_checksum(self._render_item(source_path, target, is_command)))
+
+    def _compare_checksums(self, stored_checksum: str, installed_checksum: str, source_path: Path,
+                           target: str, is_command: bool, use_copy: bool) -> Tuple[str, bool, bool]:
+        """Three-way compare an installed item against its source.
+
+        Returns:
+            Tuple of (expected source checksum, source_changed, user_modified)
+        """
+        source_checksum = self._expected_checksum(source_path, target, is_command, use_copy)
+        raw_checksum = self._source_checksum(source_path)
+
+        if source_checksum != raw_checksum and stored_checksum == raw_checksum:
+            # Recorded from the unrendered source (a severed symlink or an
+            # older install): both the raw and the rendered form are current
+            return source_checksum, False, installed_checksum not in (raw_checksum, source_checksum)
+
+        return (source_checksum,
+                source_checksum != stored_checksum,
+                installed_checksum != stored_checksum)
+
+    def _get_stage_dir(self) -> Path:
+        """Get the staging directory for the current run, creating it on first use."""
+        with self._run_lock:
+            if self._stage_dir is None:
+                self._stage_dir = Path(tempfile.mkdtemp(prefix='warden-stage-'))
+            return self._stage_dir
+
+    def _stage_item(self, source_path: Path, target: Optional[str], is_command: bool,
+                    dest_filename: str, copy_mode: bool) -> str:
+        """Get a local file with exactly the content and name an item is installed as.
+
+        Batch transfers keep file names, so items that are rendered or renamed
+        (e.g. .md -> .mdc) are staged under their destination name. Each is
+        staged once per run and shared by every project that installs it.
+        Must be called inside _run_scope().
+        """
+        rendered = self._is_rendered(source_path, target, copy_mode)
+        if not rendered and source_path.name == dest_filename:
+            return str(source_path)
+
+        key = ('staged', str(source_path), target, is_command, dest_filename, rendered)
+
+        def stage() -> str:
+            subdir = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()[:16]
+            staged = self._get_stage_dir() / subdir / dest_filename
+            staged.parent.mkdir(parents=True, exist_ok=True)
+            if rendered:
+                staged.write_text(self._render_item(source_path, target, is_command))
+            else:
+                shutil.copyfile(source_path, staged)
+            return str(staged)
+
+        return self._digests.get(key, stage)
+
+    def _installed_item_path(self, project_state: ProjectState, target: str, item_name: str,
+                             is_command: bool) -> Path:
+        """Path an installed rule or command lives at in a project.
+
+        Package items ('owner/repo:name') are installed under their bare name.
+        """
+        file_name = item_name.split(':', 1)[1] if ':' in item_name else item_name
+        if is_command:
+            return project_state.get_commands_destination_path(self.config, target) / f"{file_name}.md"
+        rule_extension = self.config.get_target_rule_extension(target)
+        return project_state.get_rules_destination_path(self.config, target) / f"{file_name}{rule_extension}"
+
     def _get_project_name(self, project_path: str, backend: FileSystemBackend) -> str:
         """Generate project name from path.
 
@@ -130,13 +451,6 @@ class WardenManager:
 
         return None
 
-    def _create_target_directory(self, destination_path: Path):
-        """Create target directory if it doesn't exist."""
-        try:
-            destination_path.parent.mkdir(parents=True, exist_ok=True)
-        except (OSError, PermissionError) as e:
-            raise FileOperationError(f"Could not create target directory {destination_path.parent}: {e}") from e
-
     def _get_available_commands(self) -> List[str]:
         """Get list of available command files from built-in and packages."""
         commands = []
@@ -192,22 +506,178 @@ class WardenManager:
 
         return sorted(rules)
 
+    def _get_package_store(self) -> PackageStore:
+        """Get the package version store, creating it on first use."""
+        with self._run_lock:
+            if self._package_store is None:
+                self._package_store = PackageStore(self.config.packages_path / self.config.STORE_DIR)
+            return self._package_store
+
+    def _get_content_index(self) -> PackageContentIndex:
+        """Get the package content index, creating it on first use."""
+        with self._run_lock:
+            if self._content_index is None:
+                self._content_index = PackageContentIndex(
+                    self.config.packages_path / self.config.PACKAGE_INDEX_DIR)
+            return self._content_index
+
+    def _package_repo(self, package: GitHubPackage) -> Path:
+        """Git checkout of a package.
+
+        Checkouts live in packages/.repos/<owner-repo>; packages/<owner-repo>
+        itself is a symlink to the installed commit (see _publish_package).
+        Packages installed before that keep their checkout at
+        packages/<owner-repo> until their next update moves it.
+        """
+        repo_dir = self.config.packages_path / self.config.REPOS_DIR / package.directory_name
+        legacy_dir = self.config.packages_path / package.directory_name
+        if not repo_dir.exists() and legacy_dir.is_dir() and not legacy_dir.is_symlink():
+            return legacy_dir
+        return repo_dir
+
+    def _publish_package(self, package: GitHubPackage):
+        """Point packages/<owner-repo> at the package's installed commit.
+
+        The commit is exported to the store first, then the symlink is
+        replaced in a single rename, so readers see the old tree or the new
+        one, never a mix, and never wait on a lock. A checkout that can't be
+        exported (e.g. it isn't a git checkout) is served as is.
+        """
+        package_dir = self.config.packages_path / package.directory_name
+        if package_dir.is_dir() and not package_dir.is_symlink():
+            return  # Checkout still in place (see _adopt_package_checkout)
+
+        target = self._package_repo(package)
+        if package.installed_ref:
+            try:
+                target = self._get_package_store().export(
+                    target, package.directory_name, package.installed_ref, CONTENT_DIRS)
+            except WardenError:
+                pass
+
+        link = package_dir.parent / f".{package_dir.name}.{uuid.uuid4().hex}"
+        try:
+            link.symlink_to(os.path.relpath(target, package_dir.parent), target_is_directory=True)
+            os.replace(link, package_dir)
+        except OSError as e:
+            if link.is_symlink():
+                link.unlink()
+            raise WardenError(f"Failed to publish package {package.name}: {e}") from e
+
+    def _adopt_package_checkout(self, package: GitHubPackage) -> Path:
+        """Move a checkout from packages/<owner-repo> to packages/.repos.
+
+        Returns:
+            The checkout's directory (unchanged if it couldn't be moved, in
+            which case the package keeps being updated in place)
+        """
+        legacy_dir = self.config.packages_path / package.directory_name
+        repo_dir = self.config.packages_path / self.config.REPOS_DIR / package.directory_name
+        repo_dir.parent.mkdir(parents=True, exist_ok=True)
+
+        if (legacy_dir / '.git').is_file():
+            # Submodule: git mv rewrites its .git file and core.worktree
+            with self._base_repo_lock:
+                code, stdout, stderr = self._run_git_command(
+                    ['mv', str(legacy_dir), str(repo_dir)], cwd=self.config.base_path)
+            error = stderr if code != 0 else None
+        else:
+            try:
+                legacy_dir.rename(repo_dir)
+                error = None
+            except OSError as e:
+                error = str(e)
+        if error:
+            print(f"Warning: Could not move {package.name} to {repo_dir.parent}, updating it in place: {error}")
+            return legacy_dir
+
+        # packages/<owner-repo> is missing only until this, once per package
+        self._publish_package(package)
+        return repo_dir
+
+    def _index_package_content(self, package: GitHubPackage, base_commit: Optional[str] = None) -> Dict:
+        """Rules and commands of a package's installed commit, from its content index.
+
+        The index is built if needed, from base_commit's index plus a diff
+        when that one exists. Falls back to scanning the checkout when it
+        can't be indexed (e.g. it isn't a git checkout).
+        """
+        if package.installed_ref:
+            try:
+                index = self._get_content_index().build(
+                    self._package_repo(package), package.directory_name, package.installed_ref, base_commit)
+                return PackageContentIndex.content(index)
+            except WardenError:
+                pass
+        return self._discover_package_content(self._package_repo(package))
+
+    def _package_index(self, package_name: str) -> Optional[Dict]:
+        """Content index of a package's installed commit, if it has been built."""
+        package = GitHubPackage.from_dict(self.config.registry['packages'][package_name])
+        return self._get_content_index().load(package.directory_name, package.installed_ref)
+
+    def _resolve_package_commit(self, package: GitHubPackage, ref: str) -> str:
+        """Full commit hash of a package ref, fetching it if the checkout lacks it."""
+        package_dir = self._package_repo(package)
+
+        # origin/<ref> first so a branch resolves to what was last fetched
+        for candidate in (f'origin/{ref}', ref):
+            code, commit, stderr = self._run_git_command(
+                ['rev-parse', '--verify', '--quiet', f'{candidate}^{{commit}}'], cwd=package_dir)
+            if code == 0:
+                return commit
+
+        depth = ['--depth', '1'] if package.clone != 'full' else []
+        code, stdout, stderr = self._run_git_command(['fetch'] + depth + ['origin', ref], cwd=package_dir)
+        if code != 0:
+            raise WardenError(f"Unknown ref '{ref}' for package '{package.name}': {stderr}")
+        code, commit, stderr = self._run_git_command(
+            ['rev-parse', '--verify', 'FETCH_HEAD^{commit}'], cwd=package_dir)
+        if code != 0:
+            raise WardenError(f"Unknown ref '{ref}' for package '{package.name}': {stderr}")
+        return commit
+
+    def _package_version_dir(self, package: GitHubPackage, ref: str) -> Path:
+        """Store directory holding a package's content at ref, exported on first use."""
+        def export() -> Path:
+            commit = self._resolve_package_commit(package, ref)
+            return self._get_package_store().export(
+                self._package_repo(package), package.directory_name, commit, CONTENT_DIRS)
+
+        if self._digests is None:
+            return export()
+        # Resolve and export each version once per run
+        return self._digests.get(('package_version', package.name, ref), export)
+
+    def _resolve_package_dir(self, package_spec: str) -> Tuple[str, Path]:
+        """Directory to read a package's content from.
+
+        Args:
+            package_spec: 'owner/repo' for the package's checkout, or
+                          'owner/repo@ref' for the pinned version at ref
+
+        Returns:
+            Tuple of (package name, directory)
+        """
+        package_name, _, ref = package_spec.partition('@')
+
+        if package_name not in self.config.registry['packages']:
+            raise FileNotFoundError(f"Package '{package_name}' not found")
+
+        package = GitHubPackage.from_dict(self.config.registry['packages'][package_name])
+        if ref:
+            return package_name, self._package_version_dir(package, ref)
+        return package_name, self.config.packages_path / package.directory_name
+
     def _resolve_command_path(self, command_spec: str) -> Tuple[Path, str]:
         """Resolve command specification to actual file path and source."""
         if ':' in command_spec:
-            # Package command: package_name:command_name
-            package_name, command_name = command_spec.split(':', 1)
-
-            if package_name not in self.config.registry['packages']:
-                raise FileNotFoundError(f"Package '{package_name}' not found")
-
-            package_data = self.config.registry['packages'][package_name]
-            package = GitHubPackage.from_dict(package_data)
-            package_dir = self.config.packages_path / package.directory_name
+            # Package command: package_name[@ref]:command_name
+            package_spec, command_name = command_spec.split(':', 1)
+            package_name, package_dir = self._resolve_package_dir(package_spec)
 
             # Try multiple possible command directories
-            possible_commands_dirs = ['commands', 'commands-mdc', 'mdc-commands', 'cursor-commands']
-            for dir_name in possible_commands_dirs:
+            for dir_name in COMMAND_DIRS:
                 command_path = package_dir / dir_name / f"{command_name}.md"
                 if command_path.exists():
                     return command_path, f"package:{package_name}"
@@ -229,15 +699,9 @@ class WardenManager:
     def _resolve_rule_path(self, rule_spec: str) -> Tuple[Path, str]:
         """Resolve rule specification to actual file path and source."""
         if ':' in rule_spec:
-            # Package rule: package_name:rule_name
-            package_name, rule_name = rule_spec.split(':', 1)
-
-            if package_name not in self.config.registry['packages']:
-                raise FileNotFoundError(f"Package '{package_name}' not found")
-
-            package_data = self.config.registry['packages'][package_name]
-            package = GitHubPackage.from_dict(package_data)
-            package_dir = self.config.packages_path / package.directory_name
+            # Package rule: package_name[@ref]:rule_name
+            package_spec, rule_name = rule_spec.split(':', 1)
+            package_name, package_dir = self._resolve_package_dir(package_spec)
 
             # Look for rule in package's rules directory
             rule_path = package_dir / 'rules' / f"{rule_name}.md"
@@ -264,22 +728,24 @@ class WardenManager:
             if ':' not in cmd and query_lower in cmd.lower():
                 results['commands'].append(cmd)
 
-        # Search package content
+        # Search package content (names, plus descriptions and tags when indexed)
         for package_name, package_data in self.config.registry['packages'].items():
             if 'content' not in package_data:
                 continue
 
             content = package_data['content']
-
-            # Search rules
-            for rule in content.get('rules', []):
-                if query_lower in rule.lower():
-                    results['rules'].append(f"{package_name}:{rule}")
-
-            # Search commands
-            for cmd in content.get('commands', []):
-                if query_lower in cmd.lower():
-                    results['commands'].append(f"{package_name}:{cmd}")
+            index = self._package_index(package_name)
+
+            for kind in ('rules', 'commands'):
+                for item_name in content.get(kind, []):
+                    text = item_name
+                    entry = PackageContentIndex.entry(index, kind, item_name) if index else None
+                    if entry:
+                        tags = entry.get('tags') or []
+                        text += ' ' + str(entry.get('description') or '') + ' ' + ' '.join(
+                            map(str, tags if isinstance(tags, list) else [tags]))
+                    if query_lower in text.lower():
+                        results[kind].append(f"{package_name}:{item_name}")
 
         return results
 
@@ -329,125 +795,6 @@ class WardenManager:
         except FileNotFoundError:
             return 1, "", "Git not found. Please install git."
 
-    def _install_command(self, command_spec: str, destination_dir: Path, use_copy: bool, target: str = None) -> Dict:
-        """Install a specific command or rule to the destination (local only). Returns installation info with checksum."""
-        try:
-            source_path, source_type = self._resolve_command_path(command_spec)
-        except FileNotFoundError as e:
-            raise FileNotFoundError(f"Command '{command_spec}' not found: {e}") from e
-
-        if ':' in command_spec:
-            _, command_name = command_spec.split(':', 1)
-        else:
-            command_name = command_spec
-
-        # Determine if this is a command file (vs a rule file)
-        is_command = '/commands/' in str(destination_dir) or str(destination_dir).endswith('/commands')
-
-        # Determine file extension based on target and file type
-        # Commands always use .md, rules use target-specific extension
-        if is_command:
-            file_extension = '.md'
-        else:
-            # For rules, use target-specific extension (e.g., .mdc for cursor, .md for others)
-            file_extension = self.config.get_target_rule_extension(target) if target else '.md'
-
-        dest_filename = f"{command_name}{file_extension}"
-
-        dest_path = destination_dir / dest_filename
-        dest_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Process template if copying a command file with a target specified
-        if use_copy and is_command and target:
-            content = source_path.read_text()
-            rules_dir = self.config.get_target_rules_path(target)
-            processed_content = process_command_template(content, target, rules_dir)
-            dest_path.write_text(processed_content)
-            # Store checksum of processed content, not template
-            checksum = calculate_content_checksum(processed_content)
-        elif use_copy:
-            self._copy_file(source_path, dest_path)
-            checksum = calculate_file_checksum(source_path)
-        else:
-            self._create_symlink(source_path, dest_path)
-            checksum = calculate_file_checksum(source_path)
-
-        return {
-            "name": command_spec,
-            "checksum": checksum,
-            "source": str(source_path),
-            "source_type": source_type,
-            "installed_at": datetime.now(timezone.utc).isoformat()
-        }
-
-    def _install_command_with_backend(self, command_spec: str, destination_dir: str,
-                                     backend: FileSystemBackend, use_copy: bool, target: str = None) -> Dict:
-        """Install a specific command or rule using backend. Returns installation info with checksum.
-
-        Args:
-            command_spec: Command specification (e.g., 'coding-no-emoji' or 'owner/repo:rule-name')
-            destination_dir: Destination directory path (relative to backend's base)
-            backend: Backend to use for installation
-            use_copy: Whether to use copy mode
-            target: Target assistant (e.g., 'claude', 'augment', 'cursor')
-        """
-        try:
-            source_path, source_type = self._resolve_command_path(command_spec)
-        except FileNotFoundError as e:
-            raise FileNotFoundError(f"Command '{command_spec}' not found: {e}") from e
-
-        if ':' in command_spec:
-            _, command_name = command_spec.split(':', 1)
-        else:
-            command_name = command_spec
-
-        # Determine if this is a command file (vs a rule file)
-        is_command = '/commands/' in destination_dir or destination_dir.endswith('/commands')
-
-        # Determine file extension based on target and file type
-        # Commands always use .md, rules use target-specific extension
-        if is_command:
-            file_extension = '.md'
-        else:
-            # For rules, use target-specific extension (e.g., .mdc for cursor, .md for others)
-            file_extension = self.config.get_target_rule_extension(target) if target else '.md'
-
-        dest_filename = f"{command_name}{file_extension}"
-
-        # Construct destination path
-        dest_path = f"{destination_dir.rstrip('/')}/{dest_filename}"
-
-        # Ensure parent directory exists
-        backend.mkdir(destination_dir, parents=True, exist_ok=True)
-
-        # Calculate checksum - use processed content checksum if template processing will occur
-        should_process = (
-            target is not None and
-            source_path.suffix == '.md' and
-            (isinstance(backend, RemoteBackend) or use_copy)
-        )
-
-        if should_process and is_command:
-            # For commands that will be template-processed, calculate checksum from processed content
-            content = source_path.read_text()
-            rules_dir = self.config.get_target_rules_path(target)
-            processed_content = process_command_template(content, target, rules_dir)
-            checksum = calculate_content_checksum(processed_content)
-        else:
-            # For non-processed files or rules, use source file checksum
-            checksum = calculate_file_checksum(source_path)
-
-        # Install file using backend
-        self._install_file_with_backend(source_path, dest_path, backend, use_copy, target)
-
-        return {
-            "name": command_spec,
-            "checksum": checksum,
-            "source": str(source_path),
-            "source_type": source_type,
-            "installed_at": datetime.now(timezone.utc).isoformat()
-        }
-
     def _update_commands(self, project_state: ProjectState, use_copy: bool):
         """Update all installed commands for a project."""
         if not project_state.has_commands:
@@ -498,71 +845,6 @@ class WardenManager:
         except (OSError, shutil.Error) as e:
             raise FileOperationError(f"Failed to copy file from {source} to {destination}: {e}") from e
 
-    def _install_file_with_backend(self, source_path: Path, dest_path: str,
-                                   backend: FileSystemBackend, use_copy: bool, target: str = None):
-        """Install a file using the appropriate backend.
-
-        Args:
-            source_path: Local source file path (from warden installation)
-            dest_path: Destination path (relative to backend's base path)
-            backend: Backend to use for installation
-            use_copy: Whether to use copy mode (symlinks only for local)
-            target: Target assistant (e.g., 'claude', 'augment', 'cursor')
-        """
-        try:
-            # Determine if this is a command file (vs a rule file)
-            is_command = '/commands/' in dest_path or dest_path.endswith('/commands')
-
-            # Check if we need to process the file content
-            # Process when: copying (not symlinking) and target is specified
-            should_process = (
-                target is not None and
-                source_path.suffix == '.md' and
-                (isinstance(backend, RemoteBackend) or use_copy)
-            )
-
-            if should_process:
-                # Read source file
-                content = source_path.read_text()
-
-                # Process based on file type
-                if is_command:
-                    # For commands: process template variables
-                    # Determine rules directory path for this target
-                    rules_dir = self.config.get_target_rules_path(target)
-                    processed_content = process_command_template(content, target, rules_dir)
-                else:
-                    # For rules: convert format for target
-                    processed_content = convert_rule_format(content, target)
-
-                # Write processed content to destination
-                if isinstance(backend, RemoteBackend):
-                    # For remote, we need to write to a temp file first
-                    import tempfile
-                    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.md') as tmp:
-                        tmp.write(processed_content)
-                        tmp_path = tmp.name
-                    try:
-                        backend.copy_file(tmp_path, dest_path)
-                    finally:
-                        Path(tmp_path).unlink()
-                else:
-                    # For local, write directly
-                    Path(dest_path).write_text(processed_content)
-            elif isinstance(backend, RemoteBackend):
-                # Remote always uses copy
-                backend.copy_file(str(source_path), dest_path)
-            elif use_copy:
-                # Local copy
-                backend.copy_file(str(source_path), dest_path)
-            else:
-                # Local symlink
-                if not backend.supports_symlinks():
-                    raise WardenError(f"Backend {backend.__class__.__name__} does not support symlinks")
-                backend.create_symlink(str(source_path), dest_path)
-        except (RemoteOperationError, BackendError) as e:
-            raise FileOperationError(f"Failed to install file to {dest_path}: {e}") from e
-
     def _is_symlink_to_rules(self, file_path: Path) -> bool:
         """Check if file is a symlink to our rules directory or a rule file."""
         if not file_path.is_symlink():
@@ -591,6 +873,124 @@ class WardenManager:
         except OSError as e:
             raise FileOperationError(f"Failed to convert symlink to copy: {e}") from e
 
+    def _plan_items(self, item_names: List[str], destination_dir: str, backend: FileSystemBackend,
+                    use_copy: bool, target: str, is_command: bool) -> List[Tuple[str, str, Dict]]:
+        """Resolve, render and checksum items for installation into destination_dir.
+
+        Returns:
+            List of (local file to transfer, destination path, installation info)
+        """
+        copy_mode = use_copy or isinstance(backend, RemoteBackend)
+        plan = []
+
+        for item_spec in item_names:
+            try:
+                # Package rules live in the package's rules/ directory
+                if ':' in item_spec and not is_command:
+                    source_path, source_type = self._resolve_rule_path(item_spec)
+                else:
+                    source_path, source_type = self._resolve_command_path(item_spec)
+            except FileNotFoundError as e:
+                raise FileNotFoundError(f"Item '{item_spec}' not found: {e}") from e
+
+            if ':' in item_spec:
+                _, item_name = item_spec.split(':', 1)
+            else:
+                item_name = item_spec
+
+            # Determine file extension
+            if is_command:
+                file_extension = '.md'
+            else:
+                file_extension = self.config.get_target_rule_extension(target) if target else '.md'
+
+            dest_filename = f"{item_name}{file_extension}"
+            dest_path = f"{destination_dir.rstrip('/')}/{dest_filename}"
+
+            # Copies (always the case for remote) transfer the rendered content;
+            # symlinks point at the source itself
+            if copy_mode:
+                transfer_path = self._stage_item(source_path, target, is_command, dest_filename, copy_mode)
+            else:
+                transfer_path = str(source_path)
+
+            plan.append((transfer_path, dest_path, {
+                "name": item_spec,
+                "checksum": self._expected_checksum(source_path, target, is_command, copy_mode),
+                "source": str(source_path),
+                "source_type": source_type,
+                "installed_at": datetime.now(timezone.utc).isoformat()
+            }))
+
+        return plan
+
+    @staticmethod
+    def _record_installed_stats(backend: FileSystemBackend, installed: List[Tuple[str, Dict]]):
+        """Remember size and mtime of freshly written files (see check_project_status fast mode).
+
+        Args:
+            backend: Backend the files were written with
+            installed: List of (destination path, installed item dict) to annotate
+        """
+        if not installed:
+            return
+        try:
+            stats = backend.stat_files([dest for dest, _ in installed])
+        except (BackendError, NotImplementedError, OSError):
+            return  # Fast mode will hash these files instead
+        for dest, item in installed:
+            stat = stats.get(dest)
+            if stat is not None:
+                item['installed_size'], item['installed_mtime'] = stat
+
+    @staticmethod
+    def _copy_batch(backend: FileSystemBackend, pairs: List[Tuple[str, str]]) -> Dict[str, str]:
+        """Copy files in one batch transfer.
+
+        A batch can fail part way, leaving some files written; it is then
+        retried one file at a time, so callers know exactly which
+        destinations hold the new content.
+
+        Returns:
+            Dict of destination -> error for files that couldn't be written
+        """
+        if not pairs:
+            return {}
+        try:
+            backend.copy_files_batch(pairs)
+            return {}
+        except (BackendError, OSError):
+            pass
+        failed = {}
+        for source, dest in pairs:
+            try:
+                backend.copy_file(source, dest)
+            except (BackendError, OSError) as e:
+                failed[dest] = str(e)
+        return failed
+
+    def _push_items(self, backend: FileSystemBackend, copies: List[Tuple[str, str]],
+                    links: List[Tuple[str, str]]) -> Dict[str, str]:
+        """Transfer planned items: copies in one batch, then symlinks (local only).
+
+        Returns:
+            Dict of destination -> error for items that couldn't be written
+        """
+        failed = self._copy_batch(backend, copies)
+        for source, dest in links:
+            try:
+                backend.create_symlink(source, dest)
+            except (BackendError, OSError) as e:
+                failed[dest] = str(e)
+        return failed
+
+    @staticmethod
+    def _failed_writes_error(failed: Dict[str, str]) -> FileOperationError:
+        """Error reporting the files _push_items couldn't write."""
+        details = '; '.join(f"{dest}: {error}" for dest, error in failed.items())
+        return FileOperationError(f"Could not write {len(failed)} file(s): {details}")
+
+    @_in_run_scope
     def _batch_install_items(self, item_names: List[str], destination_dir: str,
                             backend: FileSystemBackend, use_copy: bool, target: str,
                             is_command: bool) -> List[Dict]:
@@ -613,91 +1013,146 @@ class WardenManager:
         # Ensure destination directory exists
         backend.mkdir(destination_dir, parents=True, exist_ok=True)
 
-        # Prepare all items: resolve paths, process content, calculate checksums
-        items_to_install = []
-        install_infos = []
+        plan = self._plan_items(item_names, destination_dir, backend, use_copy, target, is_command)
+        pairs = [(src, dest) for src, dest, _ in plan]
+        if use_copy or isinstance(backend, RemoteBackend):
+            failed = self._push_items(backend, pairs, [])
+        else:
+            failed = self._push_items(backend, [], pairs)
+        if failed:
+            raise self._failed_writes_error(failed)
+        self._record_installed_stats(backend, [(dest, info) for _, dest, info in plan])
 
-        for item_spec in item_names:
-            try:
-                source_path, source_type = self._resolve_command_path(item_spec)
-            except FileNotFoundError as e:
-                raise FileNotFoundError(f"Item '{item_spec}' not found: {e}") from e
+        return [info for _, _, info in plan]
 
-            if ':' in item_spec:
-                _, item_name = item_spec.split(':', 1)
-            else:
-                item_name = item_spec
+    def _resolve_add_targets(self, project_name: str, project_state: ProjectState,
+                             target: Optional[str]) -> List[str]:
+        """Targets that add_to_project-style installs go to for a project."""
+        # Verify project path still exists (only for local projects)
+        if not project_state.is_remote() and not project_state.path.exists():
+            raise FileNotFoundError(f"Project path no longer exists: {project_state.path}")
 
-            # Determine file extension
-            if is_command:
-                file_extension = '.md'
-            else:
-                file_extension = self.config.get_target_rule_extension(target) if target else '.md'
+        if target:
+            if not project_state.has_target(target):
+                raise WardenError(f"Project '{project_name}' does not have target '{target}' installed")
+            return [target]
+        if project_state.default_targets:
+            # Use configured default targets
+            targets = [t for t in project_state.default_targets if project_state.has_target(t)]
+            if not targets:
+                raise WardenError(f"None of the default targets are installed for project '{project_name}'")
+            return targets
+        # Fall back to all targets
+        return list(project_state.targets.keys())
+
+    @_in_run_scope
+    def _install_items_to_project(self, project_state: ProjectState, targets: List[str],
+                                  rule_names: Optional[List[str]],
+                                  command_names: Optional[List[str]],
+                                  messages: Optional[List[str]] = None
+                                  ) -> Tuple[Dict[str, Dict[str, List[Dict]]], Dict[str, str]]:
+        """Install items a project doesn't have yet into each of targets.
+
+        Every item is planned first (so a missing item fails before anything
+        is written), then all copies go out in one batch transfer. State is
+        left alone; see _record_added_items. Progress messages are printed,
+        or appended to messages if given (see _report).
 
-            dest_filename = f"{item_name}{file_extension}"
-            dest_path = f"{destination_dir.rstrip('/')}/{dest_filename}"
+        Returns:
+            (added, failed): dict of target -> {'rules': [install info],
+            'commands': [install info]} for the items written, and dict of
+            destination -> error for items that couldn't be written
+        """
+        backend = project_state.backend
+        copies, links = [], []
+        written = []  # (destination path, install info)
+        added = {}
 
-            # Check if we need to process the file content
-            should_process = (
-                target is not None and
-                source_path.suffix == '.md' and
-                (isinstance(backend, RemoteBackend) or use_copy)
-            )
+        for target_name in targets:
+            target_config = project_state.targets[target_name]
+            use_copy = target_config['install_type'] == 'copy'
+            copy_mode = use_copy or project_state.is_remote()
+            added[target_name] = {'rules': [], 'commands': []}
 
-            if should_process:
-                # Read and process content
-                content = source_path.read_text()
+            for kind, names, is_command in (('rules', rule_names, False), ('commands', command_names, True)):
+                if not names:
+                    continue
+                if is_command and not self.config.target_supports_commands(target_name):
+                    self._report(messages,
+                                 f"[WARNING] Target '{target_name}' does not support custom commands, skipping")
+                    continue
+
+                label = 'Command' if is_command else 'Rule'
+                installed = {item.get('name') for item in target_config.get(f'installed_{kind}', [])}
+                new_names = []
+                for name in names:
+                    if name in installed:
+                        self._report(messages, f"[INFO] {label} '{name}' is already installed "
+                                               f"for target '{target_name}', skipping")
+                        continue
+                    installed.add(name)
+                    new_names.append(name)
+                if not new_names:
+                    continue
 
                 if is_command:
-                    # For commands: process template variables
-                    rules_dir = self.config.get_target_rules_path(target)
-                    processed_content = process_command_template(content, target, rules_dir)
+                    destination = project_state.get_commands_destination_path(self.config, target_name)
                 else:
-                    # For rules: convert format for target
-                    processed_content = convert_rule_format(content, target)
-
-                # Write to temp file for batch transfer
-                import tempfile
-                tmp = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=file_extension)
-                tmp.write(processed_content)
-                tmp.close()
-
-                items_to_install.append((tmp.name, dest_path, tmp.name))  # (source, dest, temp_to_cleanup)
+                    destination = project_state.get_rules_destination_path(self.config, target_name)
+
+                plan = self._plan_items(new_names, str(destination), backend, use_copy, target_name, is_command)
+                (copies if copy_mode else links).extend((src, dest) for src, dest, _ in plan)
+                written.extend((dest, info) for _, dest, info in plan)
+                added[target_name][kind] = [(dest, info) for _, dest, info in plan]
+
+        # Only items that made it to the project are recorded
+        failed = self._push_items(backend, copies, links)
+        written = [(dest, info) for dest, info in written if dest not in failed]
+        for items in added.values():
+            for kind in items:
+                items[kind] = [info for dest, info in items[kind] if dest not in failed]
+        self._record_installed_stats(backend, written)
+        return added, failed
+
+    @staticmethod
+    def _report(messages: Optional[List[str]], message: str):
+        """Print a progress message, or collect it if messages is given.
+
+        Workers on run_by_host collect their messages so the calling thread
+        can print each project's output in one piece.
+        """
+        if messages is None:
+            print(message)
+        else:
+            messages.append(message)
 
-                # Calculate checksum from processed content
-                checksum = calculate_content_checksum(processed_content)
-            else:
-                # No processing needed
-                items_to_install.append((str(source_path), dest_path, None))
-                checksum = calculate_file_checksum(source_path)
+    def _record_added_items(self, project_name: str, project_state: ProjectState,
+                            added: Dict[str, Dict[str, List[Dict]]]):
+        """Record items installed by _install_items_to_project and save the project.
 
-            # Store installation info
-            install_infos.append({
-                "name": item_spec,
-                "checksum": checksum,
-                "source": str(source_path),
-                "source_type": source_type,
-                "installed_at": datetime.now(timezone.utc).isoformat()
-            })
+        An item replaces any recorded item that was installed to the same file
+        (e.g. another version of the same package item).
+        """
+        def file_name(item: Dict) -> str:
+            return item['name'].split(':', 1)[-1]
 
-        # Batch transfer all files
-        try:
-            if use_copy or isinstance(backend, RemoteBackend):
-                # Use batch copy for better performance
-                file_pairs = [(src, dest) for src, dest, _ in items_to_install]
-                backend.copy_files_batch(file_pairs)
-            else:
-                # Symlink mode (local only)
-                for src, dest, _ in items_to_install:
-                    backend.create_symlink(src, dest)
-        finally:
-            # Clean up temp files
-            for _, _, temp_file in items_to_install:
-                if temp_file:
-                    Path(temp_file).unlink()
+        for target_name, items in added.items():
+            target_config = project_state.targets[target_name]
+            for kind in ('rules', 'commands'):
+                if not items[kind]:
+                    continue
+                replaced = {file_name(item) for item in items[kind]}
+                target_config[f'installed_{kind}'] = [
+                    item for item in target_config.get(f'installed_{kind}', [])
+                    if file_name(item) not in replaced
+                ] + items[kind]
+                target_config[f'has_{kind}'] = True
 
-        return install_infos
+        project_state.timestamp = datetime.now(timezone.utc).isoformat()
+        self._store_project_state(project_name, project_state)
+        self.config.save_state()
 
+    @_in_run_scope
     def install_project(self, project_path: Union[str, Path], target: Optional[str] = None,
                        use_copy: bool = False,
                        install_commands: bool = False, command_names: Optional[List[str]] = None,
@@ -747,15 +1202,15 @@ class WardenManager:
 
         # Check if project location already exists
         existing_project_name = None
-        for existing_name, existing_data in self.config.state['projects'].items():
-            existing = ProjectState.from_dict(existing_data)
+        for existing_name in self.config.state['projects']:
+            existing = self._get_project_state(existing_name)
             if existing.location_string == location_string:
                 existing_project_name = existing_name
                 break
 
         if existing_project_name:
             # Add target to existing project
-            project_state = ProjectState.from_dict(self.config.state['projects'][existing_project_name])
+            project_state = self._get_project_state(existing_project_name)
 
             if project_state.has_target(target):
                 raise WardenError(
@@ -802,7 +1257,7 @@ class WardenManager:
             )
 
             project_state.timestamp = datetime.now(timezone.utc).isoformat()
-            self.config.state['projects'][existing_project_name] = project_state.to_dict()
+            self._store_project_state(existing_project_name, project_state)
             self.config.save_state()
 
             return project_state
@@ -863,7 +1318,7 @@ class WardenManager:
         )
 
         # Update state
-        self.config.state['projects'][project_name] = project_state.to_dict()
+        self._store_project_state(project_name, project_state)
         self.config.save_state()
 
         return project_state
@@ -880,7 +1335,7 @@ class WardenManager:
         if not actual_name:
             raise ProjectNotFoundError(f"Project '{project_name}' not found")
 
-        project_state = ProjectState.from_dict(self.config.state['projects'][actual_name])
+        project_state = self._get_project_state(actual_name)
 
         # Verify project path still exists
         if not project_state.path.exists():
@@ -912,7 +1367,7 @@ class WardenManager:
 
         # Update timestamp
         project_state.timestamp = datetime.now(timezone.utc).isoformat()
-        self.config.state['projects'][actual_name] = project_state.to_dict()
+        self._store_project_state(actual_name, project_state)
         self.config.save_state()
 
         return project_state
@@ -932,7 +1387,7 @@ class WardenManager:
         if not actual_name:
             raise ProjectNotFoundError(f"Project '{project_name}' not found")
 
-        project_state = ProjectState.from_dict(self.config.state['projects'][actual_name])
+        project_state = self._get_project_state(actual_name)
 
         # Ask for confirmation unless skipped
         if not skip_confirm:
@@ -1004,17 +1459,14 @@ class WardenManager:
 
         # Update timestamp and save
         project_state.timestamp = datetime.now(timezone.utc).isoformat()
-        self.config.state['projects'][actual_name] = project_state.to_dict()
+        self._store_project_state(actual_name, project_state)
         self.config.save_state()
 
         return project_state
 
     def list_projects(self) -> List[ProjectState]:
         """List all registered projects."""
-        projects = []
-        for project_data in self.config.state['projects'].values():
-            projects.append(ProjectState.from_dict(project_data))
-        return projects
+        return [self._get_project_state(name) for name in self.config.state['projects']]
 
     def untrack_project(self, project_name: str, skip_confirm: bool = False) -> bool:
         """Remove a project from tracking (does not delete files).
@@ -1033,7 +1485,7 @@ class WardenManager:
 
         # Ask for confirmation unless skipped
         if not skip_confirm:
-            project_state = ProjectState.from_dict(self.config.state['projects'][actual_name])
+            project_state = self._get_project_state(actual_name)
             print(f"\n[WARNING] About to untrack project '{actual_name}'")
             print(f"   Path: {project_state.path}")
             print(f"   Targets: {', '.join(project_state.targets.keys())}")
@@ -1044,6 +1496,7 @@ class WardenManager:
                 return False
 
         del self.config.state['projects'][actual_name]
+        self._forget_project_state(actual_name)
         self.config.save_state()
         return True
 
@@ -1074,7 +1527,7 @@ class WardenManager:
         if not rule_names and not command_names:
             raise WardenError("Must specify at least one rule or command to remove")
 
-        project_state = ProjectState.from_dict(self.config.state['projects'][actual_name])
+        project_state = self._get_project_state(actual_name)
 
         # Determine which targets to remove from
         if target:
@@ -1110,7 +1563,6 @@ class WardenManager:
 
             # Remove rules
             if rule_names:
-                rules_destination = project_state.get_rules_destination_path(self.config, target_name)
                 for rule_name in rule_names:
                     # Check if rule is installed
                     rule_index = None
@@ -1121,8 +1573,7 @@ class WardenManager:
 
                     if rule_index is not None:
                         # Delete the file with target-specific extension
-                        rule_extension = self.config.get_target_rule_extension(target_name)
-                        rule_file = rules_destination / f"{rule_name}{rule_extension}"
+                        rule_file = self._installed_item_path(project_state, target_name, rule_name, False)
                         try:
                             backend.remove_file(str(rule_file))
                             # Remove from state
@@ -1137,7 +1588,6 @@ class WardenManager:
 
             # Remove commands
             if command_names:
-                commands_destination = project_state.get_commands_destination_path(self.config, target_name)
                 for command_name in command_names:
                     # Check if command is installed
                     command_index = None
@@ -1148,7 +1598,7 @@ class WardenManager:
 
                     if command_index is not None:
                         # Delete the file
-                        command_file = commands_destination / f"{command_name}.md"
+                        command_file = self._installed_item_path(project_state, target_name, command_name, True)
                         try:
                             backend.remove_file(str(command_file))
                             # Remove from state
@@ -1165,7 +1615,7 @@ class WardenManager:
         project_state.timestamp = datetime.now(timezone.utc).isoformat()
 
         # Save state
-        self.config.state['projects'][actual_name] = project_state.to_dict()
+        self._store_project_state(actual_name, project_state)
         self.config.save_state()
 
         return {
@@ -1194,8 +1644,7 @@ class WardenManager:
             raise WardenError("New project name cannot be empty")
 
         # Get the project data
-        project_data = self.config.state['projects'][actual_old_name]
-        project_state = ProjectState.from_dict(project_data)
+        project_state = self._get_project_state(actual_old_name)
 
         # Update the project name
         project_state.name = new_name
@@ -1203,7 +1652,8 @@ class WardenManager:
 
         # Remove old entry and add new one
         del self.config.state['projects'][actual_old_name]
-        self.config.state['projects'][new_name] = project_state.to_dict()
+        self._forget_project_state(actual_old_name)
+        self._store_project_state(new_name, project_state)
         self.config.save_state()
 
         return project_state
@@ -1223,7 +1673,7 @@ class WardenManager:
         if not actual_name:
             raise ProjectNotFoundError(f"Project '{project_name}' not found")
 
-        project_state = ProjectState.from_dict(self.config.state['projects'][actual_name])
+        project_state = self._get_project_state(actual_name)
 
         # Validate that all default targets are installed
         invalid_targets = [t for t in default_targets if not project_state.has_target(t)]
@@ -1238,11 +1688,69 @@ class WardenManager:
         project_state.timestamp = datetime.now(timezone.utc).isoformat()
 
         # Save state
-        self.config.state['projects'][actual_name] = project_state.to_dict()
+        self._store_project_state(actual_name, project_state)
         self.config.save_state()
 
         return project_state
 
+    @_in_run_scope
+    def pin_package(self, project_name: str, package_spec: str,
+                    target: Optional[str] = None) -> Dict[str, List[str]]:
+        """Point a project's items from a package at one version of it.
+
+        Pinned items are installed from the package store, so they stay on
+        that version when the package is updated. Switching versions only
+        re-links (or re-copies) the items; other versions stay in the store.
+        Local changes to the re-pointed items are overwritten.
+
+        Args:
+            project_name: Name of the project
+            package_spec: 'owner/repo@ref' to pin to ref, or 'owner/repo' to
+                          follow the package's checkout again
+            target: Only re-point items in this target
+
+        Returns:
+            Dict of target -> names of the items re-pointed there
+        """
+        package_name = package_spec.partition('@')[0]
+        if package_name not in self.config.registry['packages']:
+            raise WardenError(f"Package '{package_name}' not found")
+
+        actual_name = self._find_project_case_insensitive(project_name)
+        if not actual_name:
+            raise ProjectNotFoundError(f"Project '{project_name}' not found")
+
+        project_state = self._get_project_state(actual_name)
+        if target and not project_state.has_target(target):
+            raise WardenError(f"Target '{target}' is not installed for project '{actual_name}'")
+
+        added, failed = {}, {}
+        for target_name in [target] if target else list(project_state.targets):
+            target_config = project_state.targets[target_name]
+            specs = {'rules': [], 'commands': []}
+            for kind in specs:
+                for item in target_config.get(f'installed_{kind}', []):
+                    item_package, sep, item_name = item['name'].partition(':')
+                    new_name = f"{package_spec}:{item_name}"
+                    if sep and item_package.partition('@')[0] == package_name and new_name != item['name']:
+                        specs[kind].append(new_name)
+            if specs['rules'] or specs['commands']:
+                target_added, target_failed = self._install_items_to_project(
+                    project_state, [target_name], specs['rules'], specs['commands'])
+                added.update(target_added)
+                failed.update(target_failed)
+
+        repointed = {
+            target_name: [item['name'] for kind in ('rules', 'commands') for item in items[kind]]
+            for target_name, items in added.items()
+        }
+        if any(repointed.values()):
+            self._record_added_items(actual_name, project_state, added)
+        if failed:
+            raise self._failed_writes_error(failed)
+        return {target_name: names for target_name, names in repointed.items() if names}
+
+    @_in_run_scope
     def add_to_project(self, project_name: str, rule_names: Optional[List[str]] = None,
                        command_names: Optional[List[str]] = None, target: Optional[str] = None) -> ProjectState:
         """Add rules and/or commands to an existing project.
@@ -1258,95 +1766,14 @@ class WardenManager:
         if not actual_name:
             raise ProjectNotFoundError(f"Project '{project_name}' not found")
 
-        project_state = ProjectState.from_dict(self.config.state['projects'][actual_name])
-
-        # Verify project path still exists (only for local projects)
-        if not project_state.is_remote() and not project_state.path.exists():
-            raise FileNotFoundError(f"Project path no longer exists: {project_state.path}")
-
-        # Determine which targets to update
-        if target:
-            if not project_state.has_target(target):
-                raise WardenError(f"Project '{project_name}' does not have target '{target}' installed")
-            targets_to_update = [target]
-        elif project_state.default_targets:
-            # Use configured default targets
-            targets_to_update = [t for t in project_state.default_targets if project_state.has_target(t)]
-            if not targets_to_update:
-                raise WardenError(f"None of the default targets are installed for project '{project_name}'")
-        else:
-            # Fall back to all targets
-            targets_to_update = list(project_state.targets.keys())
-
-        # Update each target
-        for target_name in targets_to_update:
-            target_config = project_state.targets[target_name]
-            use_copy = target_config['install_type'] == 'copy'
-
-            # Add rules if requested
-            if rule_names:
-                rules_destination = project_state.get_rules_destination_path(self.config, target_name)
-
-                # Use backend-aware installation for remote projects
-                if project_state.is_remote():
-                    rules_dest_str = str(rules_destination)
-                    project_state.backend.mkdir(rules_dest_str, parents=True, exist_ok=True)
-                else:
-                    self._create_target_directory(rules_destination / "dummy")
-
-                for rule_name in rule_names:
-                    # Check if rule is already installed for this target
-                    already_installed = any(r.get('name') == rule_name for r in target_config['installed_rules'])
-                    if already_installed:
-                        print(f"[INFO] Rule '{rule_name}' is already installed for target '{target_name}', skipping")
-                        continue
-
-                    # Use appropriate installation method based on project type
-                    if project_state.is_remote():
-                        rules_dest_str = str(rules_destination)
-                        install_info = self._install_command_with_backend(rule_name, rules_dest_str, project_state.backend, use_copy, target_name)
-                    else:
-                        install_info = self._install_command(rule_name, rules_destination, use_copy, target_name)
-
-                    target_config['installed_rules'].append(install_info)
-                    target_config['has_rules'] = True
-
-            # Add commands if requested
-            if command_names:
-                if not self.config.target_supports_commands(target_name):
-                    print(f"[WARNING] Target '{target_name}' does not support custom commands, skipping")
-                    continue
-
-                commands_destination = project_state.get_commands_destination_path(self.config, target_name)
-
-                # Use backend-aware installation for remote projects
-                if project_state.is_remote():
-                    commands_dest_str = str(commands_destination)
-                    project_state.backend.mkdir(commands_dest_str, parents=True, exist_ok=True)
-                else:
-                    self._create_target_directory(commands_destination / "dummy")
-
-                for command_name in command_names:
-                    # Check if command is already installed for this target
-                    already_installed = any(c.get('name') == command_name for c in target_config['installed_commands'])
-                    if already_installed:
-                        print(f"[INFO] Command '{command_name}' is already installed for target '{target_name}', skipping")
-                        continue
-
-                    # Use appropriate installation method based on project type
-                    if project_state.is_remote():
-                        commands_dest_str = str(commands_destination)
-                        install_info = self._install_command_with_backend(command_name, commands_dest_str, project_state.backend, use_copy, target_name)
-                    else:
-                        install_info = self._install_command(command_name, commands_destination, use_copy, target_name)
+        project_state = self._get_project_state(actual_name)
+        targets_to_update = self._resolve_add_targets(project_name, project_state, target)
 
-                    target_config['installed_commands'].append(install_info)
-                    target_config['has_commands'] = True
-
-        # Update timestamp and save
-        project_state.timestamp = datetime.now(timezone.utc).isoformat()
-        self.config.state['projects'][actual_name] = project_state.to_dict()
-        self.config.save_state()
+        # Plan and render everything, push it in one batch, then save once
+        added, failed = self._install_items_to_project(project_state, targets_to_update, rule_names, command_names)
+        self._record_added_items(actual_name, project_state, added)
+        if failed:
+            raise self._failed_writes_error(failed)
 
         return project_state
 
@@ -1427,7 +1854,7 @@ class WardenManager:
         # Get or create @global project
         if GLOBAL_PROJECT_NAME in self.config.state['projects']:
             # Load existing @global project
-            project_state = ProjectState.from_dict(self.config.state['projects'][GLOBAL_PROJECT_NAME])
+            project_state = self._get_project_state(GLOBAL_PROJECT_NAME)
         else:
             # Create new @global project
             project_state = ProjectState(
@@ -1451,7 +1878,7 @@ class WardenManager:
         project_state.timestamp = datetime.now(timezone.utc).isoformat()
 
         # Save to state
-        self.config.state['projects'][GLOBAL_PROJECT_NAME] = project_state.to_dict()
+        self._store_project_state(GLOBAL_PROJECT_NAME, project_state)
         self.config.save_state()
 
     def _create_claude_global_config(self, config_path: Path,
@@ -1681,8 +2108,18 @@ file = "~/.codex/warden.log"
         """List all available commands."""
         return self._get_available_commands()
 
-    def get_command_info(self, command_name: str) -> Dict:
-        """Get information about a specific command."""
+    def get_command_info(self, command_name: str, include_content: bool = True) -> Dict:
+        """Get information about a specific command.
+
+        Args:
+            command_name: Built-in command name, or 'owner/repo:name' for a
+                          package command
+            include_content: Also read the command body ('content' is empty
+                             otherwise; package metadata comes from the index)
+        """
+        if ':' in command_name:
+            return self._get_package_command_info(command_name, include_content)
+
         command_path = self.config.commands_path / f"{command_name}.md"
 
         if not command_path.exists():
@@ -1737,8 +2174,47 @@ file = "~/.codex/warden.log"
             'content': content
         }
 
-    def install_package(self, package_spec: str, ref: Optional[str] = None) -> GitHubPackage:
-        """Install a GitHub package."""
+    def _get_package_command_info(self, command_spec: str, include_content: bool) -> Dict:
+        """get_command_info for a package command, from the package's content index."""
+        package_spec, command_name = command_spec.split(':', 1)
+        entry = None
+        if '@' not in package_spec and package_spec in self.config.registry['packages']:
+            index = self._package_index(package_spec)
+            if index:
+                entry = PackageContentIndex.entry(index, 'commands', command_name)
+
+        frontmatter, body = {}, ''
+        if entry is None or include_content:
+            # Not indexed (or the body is wanted): read the file itself
+            command_path, _ = self._resolve_command_path(command_spec)
+            frontmatter, body = parse_frontmatter(command_path.read_text())
+            if not isinstance(frontmatter, dict):
+                frontmatter = {}
+        if entry is not None:
+            _, package_dir = self._resolve_package_dir(package_spec)
+            command_path = package_dir / entry['path']
+            frontmatter = {field: entry[key] for field, key in FRONTMATTER_FIELDS.items() if key in entry}
+
+        tags = frontmatter.get('tags') or []
+        return {
+            'name': command_spec,
+            'path': str(command_path),
+            'description': frontmatter.get('description') or 'No description available',
+            'argument_hint': frontmatter.get('argument-hint') or '',
+            'tags': tags if isinstance(tags, list) else [tags],
+            'content': body.strip()
+        }
+
+    def install_package(self, package_spec: str, ref: Optional[str] = None,
+                        clone: Optional[str] = None) -> GitHubPackage:
+        """Install a GitHub package.
+
+        Args:
+            package_spec: owner/repo[@ref]
+            ref: Branch or tag to install (overrides the spec's)
+            clone: Clone strategy, one of CLONE_STRATEGIES (default: the
+                   configured package_clone)
+        """
         try:
             package = GitHubPackage.from_spec(package_spec)
             if ref:
@@ -1746,38 +2222,53 @@ file = "~/.codex/warden.log"
         except ValueError as e:
             raise WardenError(str(e)) from e
 
+        package.clone = clone or self.config.config.get('package_clone', 'full')
+        if package.clone not in CLONE_STRATEGIES:
+            raise WardenError(f"Unknown clone strategy '{package.clone}'. "
+                              f"Available: {', '.join(CLONE_STRATEGIES)}")
+
         package_dir = self.config.packages_path / package.directory_name
+        repo_dir = self.config.packages_path / self.config.REPOS_DIR / package.directory_name
 
         # Check if package already exists
         if package.name in self.config.registry['packages']:
-            GitHubPackage.from_dict(self.config.registry['packages'][package.name])
-            if package_dir.exists():
+            if package_dir.exists() or repo_dir.exists():
                 raise WardenError(f"Package '{package.name}' is already installed")
+        repo_dir.parent.mkdir(parents=True, exist_ok=True)
 
         print(f"[INSTALL] Installing package {package.name}@{package.ref}...")
 
-        # Clone the repository as a submodule
-        code, stdout, stderr = self._run_git_command([
-            'submodule', 'add', '-b', package.ref,
-            package.github_url, str(package_dir)
-        ], cwd=self.config.base_path)
+        # Borrow objects from the shared package cache, if one is configured
+        mirror = self._package_mirror(package)
+        reference = ['--reference', str(mirror)] if mirror else []
 
-        if code != 0:
-            # Try regular clone if submodule fails
-            code, stdout, stderr = self._run_git_command([
-                'clone', '-b', package.ref, package.github_url, str(package_dir)
-            ], cwd=self.config.base_path)
+        if package.clone == 'full':
+            # Clone the repository as a submodule
+            with self._base_repo_lock:
+                code, stdout, stderr = self._run_git_command([
+                    'submodule', 'add'] + reference + ['-b', package.ref,
+                    package.github_url, str(repo_dir)
+                ], cwd=self.config.base_path)
 
             if code != 0:
-                raise WardenError(f"Failed to clone repository: {stderr}")
+                # Try regular clone if submodule fails
+                code, stdout, stderr = self._run_git_command([
+                    'clone'] + reference + ['-b', package.ref, package.github_url, str(repo_dir)
+                ], cwd=self.config.base_path)
+
+                if code != 0:
+                    raise WardenError(f"Failed to clone repository: {stderr}")
+        else:
+            self._clone_package_lean(package, repo_dir, reference)
 
         # Get the actual commit hash
-        code, commit_hash, stderr = self._run_git_command(['rev-parse', 'HEAD'], cwd=package_dir)
+        code, commit_hash, stderr = self._run_git_command(['rev-parse', 'HEAD'], cwd=repo_dir)
         if code == 0:
             package.installed_ref = commit_hash
 
-        # Discover package content
-        content = self._discover_package_content(package_dir)
+        # Index package content and serve it at packages/<owner-repo>
+        content = self._index_package_content(package)
+        self._publish_package(package)
 
         # Update registry
         package_data = package.to_dict()
@@ -1785,16 +2276,102 @@ file = "~/.codex/warden.log"
         self.config.registry['packages'][package.name] = package_data
         self.config.save_registry()
 
-        print(f"[SUCCESS] Package {package.name} installed successfully")
+        # One print per package, so concurrent installs don't interleave
+        lines = [f"[SUCCESS] Package {package.name} installed successfully"]
         if content['rules']:
-            print(f"   Rules: {', '.join(content['rules'])}")
+            lines.append(f"   Rules: {', '.join(content['rules'])}")
         if content['commands']:
-            print(f"   Commands: {', '.join(content['commands'])}")
+            lines.append(f"   Commands: {', '.join(content['commands'])}")
+        print('\n'.join(lines))
 
         return package
 
+    def install_packages(self, package_specs: List[str], clone: Optional[str] = None) -> Dict:
+        """Install several GitHub packages concurrently.
+
+        Packages are cloned PACKAGE_WORKERS at a time, and the registry is
+        written once, after the last one. Specs naming the same package with
+        different refs are reported as errors and none of them is installed.
+
+        Args:
+            package_specs: owner/repo[@ref] of each package
+            clone: Clone strategy for all of them (see install_package)
+
+        Returns:
+            Dict with 'installed' (specs) and 'errors' ((spec, error) tuples)
+        """
+        summary = {'installed': [], 'errors': []}
+
+        # One task per package: two specs for the same package would clone
+        # into the same checkout at once, and which ref is wanted is unclear
+        by_package = {}
+        for spec in dict.fromkeys(package_specs):
+            try:
+                package_name = GitHubPackage.from_spec(spec).name
+            except ValueError:
+                package_name = spec  # install_package reports the bad spec
+            by_package.setdefault(package_name, []).append(spec)
+        specs = []
+        for package_name, same_package in by_package.items():
+            if len(same_package) == 1:
+                specs.extend(same_package)
+                continue
+            error = f"Conflicting specs for package {package_name}: {', '.join(same_package)}"
+            summary['errors'].extend((spec, error) for spec in same_package)
+
+        def install(spec: str) -> str:
+            self.install_package(spec, clone=clone)
+            return 'installed'
+
+        self._run_package_tasks(specs, install, summary)
+        return summary
+
+    def _package_mirror(self, package: GitHubPackage) -> Optional[Path]:
+        """A package's mirror in the shared package cache, synced with its remote.
+
+        Returns None when no package cache is configured or the mirror can't
+        be synced (packages are then cloned on their own).
+        """
+        cache = self.config.config.get('package_cache')
+        if not cache:
+            return None
+        try:
+            return PackageMirrors(Path(cache)).sync(package.directory_name, package.github_url)
+        except (WardenError, OSError) as e:
+            print(f"Warning: Could not use package cache: {e}")
+            return None
+
+    def _clone_package_lean(self, package: GitHubPackage, package_dir: Path, reference: List[str]):
+        """Clone only the latest commit of a package (shallow / sparse strategies)."""
+        args = ['clone', '--depth', '1'] + reference + ['-b', package.ref]
+        if package.clone == 'sparse':
+            args += ['--filter=blob:none', '--sparse']
+        code, stdout, stderr = self._run_git_command(
+            args + [package.github_url, str(package_dir)], cwd=self.config.base_path)
+        if code != 0:
+            raise WardenError(f"Failed to clone repository: {stderr}")
+
+        if package.clone == 'sparse':
+            code, stdout, stderr = self._run_git_command(
+                ['sparse-checkout', 'set'] + list(CONTENT_DIRS), cwd=package_dir)
+            if code != 0:
+                shutil.rmtree(package_dir, ignore_errors=True)
+                raise WardenError(f"Failed to set up sparse checkout: {stderr}")
+
     def update_package(self, package_name: str, ref: Optional[str] = None) -> GitHubPackage:
         """Update a GitHub package."""
+        package, content = self._update_package(package_name, ref)
+        if content is not None:
+            self._report_package_impact(package.name, content)
+        return package
+
+    def _update_package(self, package_name: str, ref: Optional[str]) -> Tuple[GitHubPackage, Optional[Dict]]:
+        """Update a GitHub package without reporting which projects it affects.
+
+        Returns:
+            (package, content): content is the package's new content index,
+            or None if it was already up to date
+        """
         if package_name not in self.config.registry['packages']:
             raise WardenError(f"Package '{package_name}' not found")
 
@@ -1804,125 +2381,486 @@ file = "~/.codex/warden.log"
         if ref:
             package.ref = ref
 
-        package_dir = self.config.packages_path / package.directory_name
+        repo_dir = self._package_repo(package)
+
+        if not repo_dir.exists():
+            raise WardenError(f"Package directory not found: {repo_dir}")
+
+        print(f"[UPDATE] Updating package {package.name} to {package.ref}...")
+
+        # The checkout is updated out of sight; readers keep being served the
+        # installed commit until the new one is published below
+        if repo_dir == self.config.packages_path / package.directory_name:
+            repo_dir = self._adopt_package_checkout(package)
+
+        # Fetch into the shared cache first, so the fetch below only needs
+        # objects the cache doesn't have (none, for checkouts borrowing from it)
+        self._package_mirror(package)
+
+        if package.clone == 'full':
+            # Fetch latest changes
+            code, stdout, stderr = self._run_git_command(['fetch', 'origin'], cwd=repo_dir)
+            if code != 0:
+                raise WardenError(f"Failed to fetch updates: {stderr}")
+
+            # Checkout the target ref
+            code, stdout, stderr = self._run_git_command(['checkout', package.ref], cwd=repo_dir)
+            if code != 0:
+                raise WardenError(f"Failed to checkout {package.ref}: {stderr}")
+
+            # Pull if it's a branch
+            if package.ref in ['main', 'master'] or not package.ref.startswith('v'):
+                code, stdout, stderr = self._run_git_command(['pull', 'origin', package.ref], cwd=repo_dir)
+        else:
+            # Fetch just the new tip (the blob filter and sparse patterns
+            # recorded at clone time still apply)
+            code, stdout, stderr = self._run_git_command(
+                ['fetch', '--depth', '1', 'origin', package.ref], cwd=repo_dir)
+            if code != 0:
+                raise WardenError(f"Failed to fetch updates: {stderr}")
+
+            code, stdout, stderr = self._run_git_command(['checkout', '--detach', 'FETCH_HEAD'], cwd=repo_dir)
+            if code != 0:
+                raise WardenError(f"Failed to checkout {package.ref}: {stderr}")
+
+        # Get the new commit hash
+        old_ref = package.installed_ref
+        code, commit_hash, stderr = self._run_git_command(['rev-parse', 'HEAD'], cwd=repo_dir)
+        if code == 0:
+            package.installed_ref = commit_hash
+
+            if old_ref == commit_hash:
+                print(f"[INFO] Package {package.name} is already up to date")
+                return package, None
+
+        # Re-index content (from the old commit's index and the diff between
+        # them), then swap the new commit in
+        content = self._index_package_content(package, base_commit=old_ref)
+        self._publish_package(package)
+
+        # Update registry
+        package_data = package.to_dict()
+        package_data['content'] = content
+        self.config.registry['packages'][package.name] = package_data
+        self.config.save_registry()
+
+        print(f"[SUCCESS] Package {package.name} updated successfully")
+        return package, content
+
+    def update_packages(self, package_names: Optional[List[str]] = None, ref: Optional[str] = None) -> Dict:
+        """Update several GitHub packages concurrently.
+
+        Packages are updated PACKAGE_WORKERS at a time, and the registry is
+        written once, after the last one.
+
+        Args:
+            package_names: Packages to update (default: all)
+            ref: Branch or tag to move every package to (see update_package)
+
+        Returns:
+            Dict with 'updated' and 'unchanged' (package names) and 'errors'
+            ((package name, error) tuples)
+        """
+        if package_names is None:
+            package_names = sorted(self.config.registry['packages'])
+        summary = {'updated': [], 'unchanged': [], 'errors': []}
+        contents = {}
+
+        def update(package_name: str) -> str:
+            _, content = self._update_package(package_name, ref)
+            if content is None:
+                return 'unchanged'
+            contents[package_name] = content
+            return 'updated'
+
+        self._run_package_tasks(list(dict.fromkeys(package_names)), update, summary)
+
+        # The installation index isn't shared with the workers; report here
+        for package_name in summary['updated']:
+            self._report_package_impact(package_name, contents[package_name])
+        return summary
+
+    def _run_package_tasks(self, items: List[str], task: Callable[[str], str], summary: Dict):
+        """Run a task per package on a bounded pool, with one registry write.
+
+        task returns the summary list an item goes in; exceptions are
+        recorded in summary['errors']. Prints progress as tasks complete.
+        """
+        def run(item: str) -> Tuple[Optional[str], Optional[str]]:
+            try:
+                return task(item), None
+            except Exception as e:
+                return None, str(e)
+
+        with self.config.transaction():
+            results = run_by_host(items, run, lambda item: None, max_workers=self.PACKAGE_WORKERS)
+            for done, (item, (outcome, error)) in enumerate(results, 1):
+                if error is not None:
+                    summary['errors'].append((item, error))
+                    print(f"[{done}/{len(items)}] {item}: failed: {error}")
+                else:
+                    summary[outcome].append(item)
+                    print(f"[{done}/{len(items)}] {item}: {outcome}")
+
+    def _report_package_impact(self, package_name: str, content: Dict):
+        """Print which projects use items from a package that just changed."""
+        index = self._get_installation_index()
+        affected = {}
+        for kind, item_name in package_item_names(package_name, content):
+            for install in index.installations(kind, item_name):
+                affected.setdefault(install['project'], set()).add(install['target'])
+
+        if affected:
+            lines = [f"[INFO] {len(affected)} project(s) use content from {package_name}:"]
+            for project_name in sorted(affected):
+                lines.append(f"   {project_name} ({', '.join(sorted(affected[project_name]))})")
+            lines.append("[TIP] Use 'warden project update' to update these projects")
+            print('\n'.join(lines))
+
+    def remove_package(self, package_name: str) -> bool:
+        """Remove a GitHub package."""
+        if package_name not in self.config.registry['packages']:
+            return False
+
+        package_data = self.config.registry['packages'][package_name]
+        package = GitHubPackage.from_dict(package_data)
+        package_dir = self.config.packages_path / package.directory_name
+        repo_dir = self._package_repo(package)
+
+        # Remove the published symlink and the checkout
+        if package_dir.is_symlink():
+            package_dir.unlink()
+        if repo_dir.exists():
+            shutil.rmtree(repo_dir)
+
+        # And every pinned version and content index of it
+        self._get_package_store().remove_package(package.directory_name)
+        self._get_content_index().remove_package(package.directory_name)
+
+        # Remove from registry
+        del self.config.registry['packages'][package_name]
+        self.config.save_registry()
+
+        print(f"[SUCCESS] Package {package.name} removed successfully")
+        return True
+
+    def list_packages(self) -> List[GitHubPackage]:
+        """List all installed packages."""
+        packages = []
+        for package_data in self.config.registry['packages'].values():
+            packages.append(GitHubPackage.from_dict(package_data))
+        return packages
+
+    def export_bundle(self, output_path: Union[str, Path],
+                      package_names: Optional[List[str]] = None) -> List[str]:
+        """Write packages, at their installed commits, to an offline bundle.
+
+        Args:
+            output_path: Archive to create (.tar.gz)
+            package_names: Packages to include (default: all)
+
+        Returns:
+            Names of the bundled packages
+        """
+        package_names = package_names or sorted(self.config.registry['packages'])
+        if not package_names:
+            raise WardenError("No packages to bundle")
+
+        contents = []
+        for package_name in package_names:
+            if package_name not in self.config.registry['packages']:
+                raise WardenError(f"Package '{package_name}' not found")
+            package_data = self.config.registry['packages'][package_name]
+            package = GitHubPackage.from_dict(package_data)
+            package_dir = self._package_repo(package)
+            if not package_dir.exists():
+                raise WardenError(f"Package directory not found: {package_dir}")
+
+            code, git_dir, stderr = self._run_git_command(['rev-parse', '--absolute-git-dir'], cwd=package_dir)
+            if code != 0:
+                raise WardenError(f"Package '{package_name}' is not a git checkout: {stderr}")
+
+            # Ship the content index so importing hosts don't rebuild it
+            self._index_package_content(package)
+            index_file = self._get_content_index().path(package.directory_name, package.installed_ref or '')
+            contents.append((package_data, package_dir, Path(git_dir),
+                             index_file if index_file.is_file() else None))
+
+        write_bundle(Path(output_path), contents)
+        print(f"[SUCCESS] Bundled {len(contents)} package(s) into {output_path}")
+        return package_names
+
+    def import_bundle(self, source: Union[str, Path], force: bool = False) -> List[str]:
+        """Install the packages of an offline bundle without network access.
+
+        Args:
+            source: Bundle created by export_bundle
+            force: Replace packages that are already installed
+
+        Returns:
+            Names of the imported packages
+        """
+        self.config.packages_path.mkdir(parents=True, exist_ok=True)
+        index_path = self.config.packages_path / self.config.PACKAGE_INDEX_DIR
+        staging = Path(tempfile.mkdtemp(prefix='.bundle-', dir=self.config.packages_path))
+        imported = []
+        try:
+            manifest = read_bundle(Path(source), staging)
+
+            for package_name, package_data in manifest.get('packages', {}).items():
+                package = GitHubPackage.from_dict(package_data)
+                package_dir = self.config.packages_path / package.directory_name
+
+                if package_name in self.config.registry['packages'] and package_dir.exists() and not force:
+                    print(f"Warning: Package '{package_name}' is already installed, skipping (use --force to replace)")
+                    continue
+                if not (staging / 'packages' / package.directory_name / '.git').exists():
+                    print(f"Warning: Bundle has no checkout for '{package_name}', skipping")
+                    continue
+
+                if package_dir.is_dir() and not package_dir.is_symlink():
+                    shutil.rmtree(package_dir)  # Checkout from before packages/.repos
+                repo_dir = self.config.packages_path / self.config.REPOS_DIR / package.directory_name
+                install_staged_package(staging, package.directory_name, repo_dir, index_path,
+                                       package.github_url)
+
+                new_data = package.to_dict()
+                new_data['content'] = self._index_package_content(package)
+                self._publish_package(package)
+                self.config.registry['packages'][package_name] = new_data
+                imported.append(package_name)
+                print(f"[IMPORT] {package_name}@{package.ref} ({(package.installed_ref or '')[:8]})")
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        if imported:
+            self.config.save_registry()
+        return imported
+
+    def _fetch_package(self, package: GitHubPackage) -> Dict:
+        """Fetch a package's origin and compare it with the installed commit.
+
+        Downloads objects, so it is only used when the commits themselves are
+        needed (show_package_diff); update checks use _probe_package.
+
+        Returns:
+            Dict with 'state' (error, up-to-date or outdated), 'latest'
+            (remote commit, when outdated), 'commits_behind' and 'error'
+            (git's message, when state is error)
+        """
+        package_dir = self._package_repo(package)
+
+        code, stdout, stderr = self._run_git_command(['fetch', 'origin'], cwd=package_dir)
+        if code != 0:
+            return {'state': 'error', 'error': f"Failed to fetch updates: {stderr}"}
+
+        # Commits on origin/<ref> the installed commit doesn't have, newest first
+        code, new_commits, stderr = self._run_git_command([
+            'rev-list', f'origin/{package.ref}', '--not', package.installed_ref
+        ], cwd=package_dir)
+        if code != 0:
+            return {'state': 'error', 'error': f"Failed to get remote commit: {stderr}"}
+
+        commits = new_commits.split()
+        if not commits:
+            return {'state': 'up-to-date', 'commits_behind': 0}
+        return {'state': 'outdated', 'latest': commits[0], 'commits_behind': len(commits)}
 
-        if not package_dir.exists():
-            raise WardenError(f"Package directory not found: {package_dir}")
+    def _probe_package(self, package: GitHubPackage) -> Dict:
+        """Ask origin which commit a package's ref points to, without fetching.
 
-        print(f"[UPDATE] Updating package {package.name} to {package.ref}...")
+        Returns:
+            Dict with 'remote_ref' (the commit), or 'error' if origin couldn't
+            be reached or doesn't have the ref
+        """
+        package_dir = self._package_repo(package)
 
-        # Fetch latest changes
-        code, stdout, stderr = self._run_git_command(['fetch', 'origin'], cwd=package_dir)
+        # Peeled (^{}) entries give the commit an annotated tag points to
+        code, listing, stderr = self._run_git_command([
+            'ls-remote', 'origin', package.ref, f'{package.ref}^{{}}'
+        ], cwd=package_dir)
         if code != 0:
-            raise WardenError(f"Failed to fetch updates: {stderr}")
+            return {'error': f"Failed to query origin: {stderr}"}
+
+        refs = {}
+        for line in listing.splitlines():
+            commit, _, ref_name = line.partition('\t')
+            refs[ref_name] = commit
+
+        for ref_name in (f'refs/heads/{package.ref}', f'refs/tags/{package.ref}^{{}}', f'refs/tags/{package.ref}'):
+            if ref_name in refs:
+                return {'remote_ref': refs[ref_name]}
+        return {'error': f"Ref '{package.ref}' not found on origin"}
+
+    def _package_ref_is_fresh(self, package_data: Dict, max_age: float) -> bool:
+        """Whether a package's recorded remote ref is younger than max_age seconds."""
+        checked_at = package_data.get('remote_checked_at')
+        if not package_data.get('remote_ref') or not checked_at:
+            return False
+        try:
+            age = datetime.now(timezone.utc) - datetime.fromisoformat(checked_at)
+        except (ValueError, TypeError):
+            return False
+        return age.total_seconds() <= max_age
 
-        # Checkout the target ref
-        code, stdout, stderr = self._run_git_command(['checkout', package.ref], cwd=package_dir)
-        if code != 0:
-            raise WardenError(f"Failed to checkout {package.ref}: {stderr}")
+    def _stale_packages(self, max_age: float, names: Optional[List[str]] = None) -> Dict[str, GitHubPackage]:
+        """Installed packages whose recorded remote ref is older than max_age seconds.
 
-        # Pull if it's a branch
-        if package.ref in ['main', 'master'] or not package.ref.startswith('v'):
-            code, stdout, stderr = self._run_git_command(['pull', 'origin', package.ref], cwd=package_dir)
+        Args:
+            max_age: Age in seconds beyond which a recorded ref is stale
+            names: Only consider these packages (default: all)
+        """
+        packages = {}
+        for name in names if names is not None else list(self.config.registry['packages']):
+            data = self.config.registry['packages'][name]
+            package = GitHubPackage.from_dict(data)
+            if ((self.config.packages_path / package.directory_name).exists()
+                    and not self._package_ref_is_fresh(data, max_age)):
+                packages[name] = package
+        return packages
 
-        # Get the new commit hash
-        code, commit_hash, stderr = self._run_git_command(['rev-parse', 'HEAD'], cwd=package_dir)
-        if code == 0:
-            old_ref = package.installed_ref
-            package.installed_ref = commit_hash
+    def _probe_stale_packages(self, max_age: float, names: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Probe, in parallel, every package whose recorded remote ref is too old.
 
-            if old_ref == commit_hash:
-                print(f"[INFO] Package {package.name} is already up to date")
-                return package
+        Args:
+            max_age: See _stale_packages
+            names: See _stale_packages
 
-        # Rediscover content
-        content = self._discover_package_content(package_dir)
+        Returns:
+            Dict mapping package name to its _probe_package result
+        """
+        packages = self._stale_packages(max_age, names)
 
-        # Update registry
-        package_data = package.to_dict()
-        package_data['content'] = content
-        self.config.registry['packages'][package.name] = package_data
-        self.config.save_registry()
+        def probe(name: str) -> Dict:
+            try:
+                return self._probe_package(packages[name])
+            except Exception as e:
+                return {'error': str(e)}
+
+        return dict(run_by_host(packages, probe, lambda name: None,
+                                max_workers=self.PACKAGE_PROBE_WORKERS))
+
+    def _record_remote_refs(self, probes: Dict[str, Dict]):
+        """Store successfully probed remote refs in the registry."""
+        checked_at = datetime.now(timezone.utc).isoformat()
+        recorded = False
+        for name, probe in probes.items():
+            package_data = self.config.registry['packages'].get(name)
+            if package_data is not None and 'remote_ref' in probe:
+                package_data['remote_ref'] = probe['remote_ref']
+                package_data['remote_checked_at'] = checked_at
+                recorded = True
+        if recorded:
+            self.config.save_registry()
+
+    def _package_states(self, max_age: Optional[float] = None,
+                        names: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Compare every package's installed commit with origin's.
+
+        Remote refs recorded less than max_age seconds ago are reused (the
+        configured package_ref_ttl when None); the rest are probed with
+        git ls-remote, so nothing is downloaded.
 
-        print(f"[SUCCESS] Package {package.name} updated successfully")
-        return package
+        Args:
+            max_age: See check_package_updates
+            names: Only check these packages (default: all)
 
-    def remove_package(self, package_name: str) -> bool:
-        """Remove a GitHub package."""
-        if package_name not in self.config.registry['packages']:
-            return False
+        Returns:
+            Dict mapping package name, in registry order, to a dict with
+            'state' (missing, error, up-to-date or outdated), 'latest'
+            (remote commit, when outdated) and 'error'
+        """
+        if max_age is None:
+            max_age = self.config.config.get('package_ref_ttl', self.config.DEFAULT_PACKAGE_REF_TTL)
+
+        if names is None:
+            names = list(self.config.registry['packages'])
+
+        probes = self._probe_stale_packages(max_age, names)
+        self._record_remote_refs(probes)
+
+        states = {}
+        for name in names:
+            data = self.config.registry['packages'][name]
+            package = GitHubPackage.from_dict(data)
+            if not (self.config.packages_path / package.directory_name).exists():
+                states[name] = {'state': 'missing'}
+            elif 'error' in probes.get(name, {}):
+                states[name] = {'state': 'error', 'error': probes[name]['error']}
+            elif data['remote_ref'] == package.installed_ref:
+                states[name] = {'state': 'up-to-date'}
+            else:
+                states[name] = {'state': 'outdated', 'latest': data['remote_ref']}
+        return states
 
-        package_data = self.config.registry['packages'][package_name]
-        package = GitHubPackage.from_dict(package_data)
-        package_dir = self.config.packages_path / package.directory_name
+    def prefetch_package_refs(self):
+        """Refresh recorded remote refs that have outlived package_ref_ttl.
 
-        # Remove the directory
-        if package_dir.exists():
-            shutil.rmtree(package_dir)
+        Meant to run in a background process (see package_prefetch), so the
+        registry is reloaded before the results are merged into it.
+        """
+        max_age = self.config.config.get('package_ref_ttl', self.config.DEFAULT_PACKAGE_REF_TTL)
+        probes = self._probe_stale_packages(max_age)
+        if probes:
+            self.config.reload_registry()
+            self._record_remote_refs(probes)
 
-        # Remove from registry
-        del self.config.registry['packages'][package_name]
-        self.config.save_registry()
+    def has_stale_package_refs(self) -> bool:
+        """Whether any package's recorded remote ref has outlived package_ref_ttl."""
+        max_age = self.config.config.get('package_ref_ttl', self.config.DEFAULT_PACKAGE_REF_TTL)
+        return bool(self._stale_packages(max_age))
 
-        print(f"[SUCCESS] Package {package.name} removed successfully")
-        return True
+    def check_package_updates(self, max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """Check for updates to installed packages.
 
-    def list_packages(self) -> List[GitHubPackage]:
-        """List all installed packages."""
-        packages = []
-        for package_data in self.config.registry['packages'].values():
-            packages.append(GitHubPackage.from_dict(package_data))
-        return packages
+        commits_behind is None when the new commits haven't been fetched yet.
 
-    def check_package_updates(self) -> Dict[str, Dict]:
-        """Check for updates to installed packages."""
+        Args:
+            max_age: Reuse remote refs recorded less than this many seconds
+                     ago (None = the configured package_ref_ttl, 0 = always
+                     ask origin)
+        """
         updates = {}
 
-        for package_name, package_data in self.config.registry['packages'].items():
-            package = GitHubPackage.from_dict(package_data)
-            package_dir = self.config.packages_path / package.directory_name
-
-            if not package_dir.exists():
+        for package_name, result in self._package_states(max_age).items():
+            if result['state'] != 'outdated':
                 continue
 
-            # Fetch latest changes
-            code, stdout, stderr = self._run_git_command(['fetch', 'origin'], cwd=package_dir)
-            if code != 0:
-                continue
+            package = GitHubPackage.from_dict(self.config.registry['packages'][package_name])
+            package_dir = self._package_repo(package)
 
-            # Get remote commit hash
-            code, remote_hash, stderr = self._run_git_command([
-                'rev-parse', f'origin/{package.ref}'
+            # Only answerable from objects already fetched (e.g. by --diff)
+            code, commit_count, stderr = self._run_git_command([
+                'rev-list', '--count', f'{package.installed_ref}..{result["latest"]}'
             ], cwd=package_dir)
 
-            if code == 0 and remote_hash != package.installed_ref:
-                # Get commit count difference
-                code, commit_count, stderr = self._run_git_command([
-                    'rev-list', '--count', f'{package.installed_ref}..{remote_hash}'
-                ], cwd=package_dir)
-
-                updates[package_name] = {
-                    'current': package.installed_ref[:8],
-                    'latest': remote_hash[:8],
-                    'commits_behind': int(commit_count) if code == 0 else 0
-                }
+            updates[package_name] = {
+                'current': package.installed_ref[:8],
+                'latest': result['latest'][:8],
+                'commits_behind': int(commit_count) if code == 0 else None
+            }
 
         return updates
 
-    def check_project_status(self, project_name: str) -> Dict:
+    @_in_run_scope
+    def check_project_status(self, project_name: str, fast: bool = False) -> Dict:
         """Check if project has outdated rules or commands with three-way comparison.
 
         Checks all targets in the project.
 
         Args:
             project_name: Name of the project
+            fast: Trust installed files whose size and mtime still match the
+                  values recorded when they were written, instead of hashing
+                  them. Files without a record, or whose metadata changed,
+                  are hashed as usual.
         """
         # Find project with case-insensitive matching
         actual_name = self._find_project_case_insensitive(project_name)
         if not actual_name:
             raise ProjectNotFoundError(f"Project '{project_name}' not found")
 
-        project_state = ProjectState.from_dict(self.config.state['projects'][actual_name])
+        project_state = self._get_project_state(actual_name)
         backend = project_state.backend  # Get backend for file operations
 
         status = {
@@ -1933,174 +2871,232 @@ file = "~/.codex/warden.log"
             'conflict_rules': [],
             'conflict_commands': [],
             'missing_sources': [],
-            'missing_installed': []
+            'missing_installed': [],
+            # Index of the items above: item_status[type][target][name] -> category
+            'item_status': {'rule': {}, 'command': {}}
         }
 
-        # Check each target
+        # One task per installed item, in target / rules-then-commands order
+        tasks = []
         for target_name, target_config in project_state.targets.items():
-            # Check rules for this target
-            for rule_info in target_config.get('installed_rules', []):
-                if not rule_info.get('source'):
-                    status['missing_sources'].append({
-                        'name': rule_info['name'],
-                        'type': 'rule',
-                        'target': target_name,
-                        'source': 'unknown (legacy installation)'
-                    })
-                    continue
+            for key, is_command in (('installed_rules', False), ('installed_commands', True)):
+                for item_info in target_config.get(key, []):
+                    tasks.append((target_name, target_config, item_info, is_command))
+
+        # Fast mode: one stat listing per target (a single SSH call for remote)
+        stats = None
+        if fast:
+            stats = {}
+            for target_name, target_config in project_state.targets.items():
+                dest_paths = [
+                    str(self._installed_item_path(project_state, target_name, item['name'], is_command))
+                    for key, is_command in (('installed_rules', False), ('installed_commands', True))
+                    for item in target_config.get(key, [])
+                ]
+                try:
+                    stats.update(backend.stat_files(dest_paths))
+                except (BackendError, NotImplementedError, OSError):
+                    pass  # Hash this target's files as usual
 
-                source_path = Path(rule_info['source'])
-                # Use target-specific extension for rules
-                rule_extension = self.config.get_target_rule_extension(target_name)
-                dest_path = project_state.get_rules_destination_path(self.config, target_name) / f"{rule_info['name']}{rule_extension}"
-
-                if not source_path.exists():
-                    status['missing_sources'].append({
-                        'name': rule_info['name'],
-                        'type': 'rule',
-                        'target': target_name,
-                        'source': str(source_path)
-                    })
-                    continue
+        def check(task):
+            return self._check_item_status(project_state, backend, *task, stats=stats)
 
-                # Check if installed file exists (backend-aware)
-                if not backend.exists(str(dest_path)):
-                    status['missing_installed'].append({
-                        'name': rule_info['name'],
-                        'type': 'rule',
-                        'target': target_name,
-                        'dest': str(dest_path)
-                    })
-                    continue
+        if len(tasks) >= self.ITEM_PARALLEL_THRESHOLD:
+            # map() returns results in task order, so the merged status is
+            # the same as a serial check
+            results = list(self._get_item_executor().map(check, tasks))
+        else:
+            results = [check(task) for task in tasks]
 
-                # Three-way comparison
-                stored_checksum = rule_info['checksum']  # What we think is installed
-                source_checksum = calculate_file_checksum(source_path)  # Current source
-                installed_checksum = backend.checksum(str(dest_path))  # What's actually installed (backend-aware)
-
-                source_changed = source_checksum != stored_checksum
-                user_modified = installed_checksum != stored_checksum
-
-                if source_changed and user_modified:
-                    # Both changed - conflict
-                    status['conflict_rules'].append({
-                        'name': rule_info['name'],
-                        'target': target_name,
-                        'source': str(source_path),
-                        'dest': str(dest_path),
-                        'stored_checksum': stored_checksum,
-                        'source_checksum': source_checksum,
-                        'installed_checksum': installed_checksum
-                    })
-                elif source_changed:
-                    # Only source changed - update available
-                    status['outdated_rules'].append({
-                        'name': rule_info['name'],
-                        'target': target_name,
-                        'source': str(source_path),
-                        'stored_checksum': stored_checksum,
-                        'source_checksum': source_checksum
-                    })
-                elif user_modified:
-                    # Only user modified - local changes
-                    status['user_modified_rules'].append({
-                        'name': rule_info['name'],
-                        'target': target_name,
-                        'dest': str(dest_path),
-                        'stored_checksum': stored_checksum,
-                        'installed_checksum': installed_checksum
-                    })
+        for (target_name, _, item_info, is_command), result in zip(tasks, results):
+            if result is not None:
+                category, entry = result
+                status[category].append(entry)
+                item_type = 'command' if is_command else 'rule'
+                status['item_status'][item_type].setdefault(target_name, {})[item_info['name']] = category
 
-            # Check commands for this target
-            for cmd_info in target_config.get('installed_commands', []):
-                if not cmd_info.get('source'):
-                    status['missing_sources'].append({
-                        'name': cmd_info['name'],
-                        'type': 'command',
-                        'target': target_name,
-                        'source': 'unknown (legacy installation)'
-                    })
-                    continue
+        return status
 
-                source_path = Path(cmd_info['source'])
-                dest_path = project_state.get_commands_destination_path(self.config, target_name) / f"{cmd_info['name']}.md"
+    def _get_item_executor(self) -> ThreadPoolExecutor:
+        """Get the pool for per-item status checks, creating it on first use."""
+        with self._run_lock:
+            if self._item_executor is None:
+                self._item_executor = ThreadPoolExecutor(max_workers=self.ITEM_WORKERS)
+            return self._item_executor
 
-                if not source_path.exists():
-                    status['missing_sources'].append({
-                        'name': cmd_info['name'],
-                        'type': 'command',
-                        'target': target_name,
-                        'source': str(source_path)
-                    })
-                    continue
+    def _check_item_status(self, project_state: ProjectState, backend: FileSystemBackend, target_name: str,
+                           target_config: Dict, item_info: Dict, is_command: bool,
+                           stats: Optional[Dict] = None) -> Optional[Tuple[str, Dict]]:
+        """Check one installed rule or command.
 
-                # Check if installed file exists (backend-aware)
-                if not backend.exists(str(dest_path)):
-                    status['missing_installed'].append({
-                        'name': cmd_info['name'],
-                        'type': 'command',
-                        'target': target_name,
-                        'dest': str(dest_path)
-                    })
-                    continue
+        Args:
+            stats: Optional map of installed path -> (size, mtime) or None if
+                   missing, from backend.stat_files (fast mode)
 
-                # Three-way comparison
-                stored_checksum = cmd_info['checksum']
-
-                # For commands in copy mode, calculate checksum from processed template
-                # to match what was actually installed
-                use_copy = target_config.get('install_type') == 'copy'
-                if use_copy:
-                    content = source_path.read_text()
-                    rules_dir = self.config.get_target_rules_path(target_name)
-                    processed_content = process_command_template(content, target_name, rules_dir)
-                    source_checksum = calculate_content_checksum(processed_content)
-                else:
-                    source_checksum = calculate_file_checksum(source_path)
-
-                installed_checksum = backend.checksum(str(dest_path))  # Backend-aware
-
-                source_changed = source_checksum != stored_checksum
-                user_modified = installed_checksum != stored_checksum
-
-                if source_changed and user_modified:
-                    # Both changed - conflict
-                    status['conflict_commands'].append({
-                        'name': cmd_info['name'],
-                        'target': target_name,
-                        'source': str(source_path),
-                        'dest': str(dest_path),
-                        'stored_checksum': stored_checksum,
-                        'source_checksum': source_checksum,
-                        'installed_checksum': installed_checksum
-                    })
-                elif source_changed:
-                    # Only source changed - update available
-                    status['outdated_commands'].append({
-                        'name': cmd_info['name'],
-                        'target': target_name,
-                        'source': str(source_path),
-                        'stored_checksum': stored_checksum,
-                        'source_checksum': source_checksum
-                    })
-                elif user_modified:
-                    # Only user modified - local changes
-                    status['user_modified_commands'].append({
-                        'name': cmd_info['name'],
-                        'target': target_name,
-                        'dest': str(dest_path),
-                        'stored_checksum': stored_checksum,
-                        'installed_checksum': installed_checksum
-                    })
+        Returns:
+            (status category, entry) for an item that needs attention, or None
+        """
+        item_type = 'command' if is_command else 'rule'
+        suffix = 'commands' if is_command else 'rules'
+
+        if not item_info.get('source'):
+            return 'missing_sources', {
+                'name': item_info['name'],
+                'type': item_type,
+                'target': target_name,
+                'source': 'unknown (legacy installation)'
+            }
 
-        return status
+        source_path = Path(item_info['source'])
+        dest_path = self._installed_item_path(project_state, target_name, item_info['name'], is_command)
+
+        if not source_path.exists():
+            return 'missing_sources', {
+                'name': item_info['name'],
+                'type': item_type,
+                'target': target_name,
+                'source': str(source_path)
+            }
+
+        # Check if installed file exists (backend-aware, or from the fast-mode
+        # stat listing; () means the path wasn't listed)
+        installed_stat = stats.get(str(dest_path), ()) if stats is not None else ()
+        if installed_stat == ():
+            exists = backend.exists(str(dest_path))
+        else:
+            exists = installed_stat is not None
+        if not exists:
+            return 'missing_installed', {
+                'name': item_info['name'],
+                'type': item_type,
+                'target': target_name,
+                'dest': str(dest_path)
+            }
+
+        # Three-way comparison; for copied items the source side is the
+        # rendered content, to match what was actually installed
+        stored_checksum = item_info['checksum']  # What we think is installed
+        recorded_stat = (item_info.get('installed_size'), item_info.get('installed_mtime'))
+        if installed_stat and None not in recorded_stat and tuple(installed_stat) == recorded_stat:
+            installed_checksum = stored_checksum  # Metadata unchanged since we wrote it
+        else:
+            installed_checksum = backend.checksum(str(dest_path))  # What's actually installed (backend-aware)
+        use_copy = target_config.get('install_type') == 'copy'
+        source_checksum, source_changed, user_modified = self._compare_checksums(
+            stored_checksum, installed_checksum, source_path, target_name, is_command, use_copy)
+
+        if source_changed and user_modified:
+            # Both changed - conflict
+            return f'conflict_{suffix}', {
+                'name': item_info['name'],
+                'target': target_name,
+                'source': str(source_path),
+                'dest': str(dest_path),
+                'stored_checksum': stored_checksum,
+                'source_checksum': source_checksum,
+                'installed_checksum': installed_checksum
+            }
+        if source_changed:
+            # Only source changed - update available
+            return f'outdated_{suffix}', {
+                'name': item_info['name'],
+                'target': target_name,
+                'source': str(source_path),
+                'stored_checksum': stored_checksum,
+                'source_checksum': source_checksum
+            }
+        if user_modified:
+            # Only user modified - local changes
+            return f'user_modified_{suffix}', {
+                'name': item_info['name'],
+                'target': target_name,
+                'dest': str(dest_path),
+                'stored_checksum': stored_checksum,
+                'installed_checksum': installed_checksum
+            }
+        return None
+
+    def _get_status_cache(self) -> StatusCache:
+        """Get the persistent status cache, loading it on first use."""
+        with self._run_lock:
+            if self._status_cache is None:
+                self._status_cache = StatusCache(self.config.base_path / self.config.STATUS_CACHE_FILE)
+            return self._status_cache
+
+    def _status_fingerprint(self, project_name: str) -> str:
+        """Fingerprint everything a project's status verdict depends on.
+
+        Covers the project's state entry, the digest of every source, the
+        stat of every installed file (one SSH call for remote projects), the
+        installed_ref of every package it uses and the renderer version.
+        Installed files are never hashed.
+        """
+        project_state = self._get_project_state(project_name)
+        sources = {}
+        dest_paths = []
+        packages = set()
 
-    def check_all_projects_status(self, include_remote: Optional[bool] = None) -> Dict[str, Dict]:
+        for target_name, target_config in project_state.targets.items():
+            for key, is_command in (('installed_rules', False), ('installed_commands', True)):
+                for item in target_config.get(key, []):
+                    source = item.get('source')
+                    if source and source not in sources:
+                        source_path = Path(source)
+                        sources[source] = self._source_checksum(source_path) if source_path.exists() else None
+                    if ':' in item['name']:
+                        packages.add(item['name'].split(':', 1)[0])
+                    dest_paths.append(str(self._installed_item_path(project_state, target_name, item['name'], is_command)))
+
+        installed = project_state.backend.stat_files(dest_paths)
+        refs = {name: self.config.registry.get('packages', {}).get(name, {}).get('installed_ref')
+                for name in sorted(packages)}
+
+        payload = json.dumps([self.config.state['projects'][project_name], sources, installed, refs,
+                              self._get_render_cache().renderer_id], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def check_all_projects_status(self, include_remote: Optional[bool] = None, use_cache: bool = False,
+                                  max_age: Optional[float] = None, fast: bool = False) -> Dict[str, Dict]:
         """Check status of all projects in parallel.
 
         Args:
             include_remote: If True, include remote projects. If False, skip remote projects.
                           If None, use config setting (default: True)
+            use_cache: Reuse the last verdict of projects whose fingerprint is unchanged,
+                       and record fresh verdicts for next time
+            max_age: With use_cache, recheck verdicts older than this many seconds
+                     (0 forces a full check)
+            fast: Compare installed files by size and mtime (see check_project_status)
+
+        Returns:
+            Dict of project name -> status for projects that need attention
+        """
+        return {
+            project_name: status
+            for project_name, status in self.iter_all_projects_status(include_remote, use_cache, max_age, fast)
+            if status is not None
+        }
+
+    def iter_all_projects_status(self, include_remote: Optional[bool] = None, use_cache: bool = False,
+                                 max_age: Optional[float] = None,
+                                 fast: bool = False) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """Check all projects in parallel, yielding results as they complete.
+
+        Yields (project_name, status) for every checked project, in completion
+        order. status is None for a project without issues and {'error': ...}
+        if the check failed. Checks run on the bounded, host-aware pool (see
+        agent_warden.parallel), so memory stays bounded however many
+        projects are tracked.
+
+        Args:
+            include_remote: If True, include remote projects. If False, skip remote projects.
+                          If None, use config setting (default: True)
+            use_cache: Reuse the last verdict of projects whose fingerprint is unchanged,
+                       and record fresh verdicts for next time
+            max_age: With use_cache, recheck verdicts older than this many seconds
+                     (0 forces a full check)
+            fast: Compare installed files by size and mtime (see check_project_status).
+                  Fast verdicts are not stored in the status cache.
         """
         # Determine whether to include remote projects
         if include_remote is None:
@@ -2110,45 +3106,52 @@ file = "~/.codex/warden.log"
         projects_to_check = []
         for project_name in self.config.state['projects']:
             # Check if this is a remote project and should be skipped
-            project_state = ProjectState.from_dict(self.config.state['projects'][project_name])
+            project_state = self._get_project_state(project_name)
             if not include_remote and project_state.is_remote():
                 continue
             projects_to_check.append(project_name)
 
-        # Check projects in parallel
-        all_status = {}
+        cache = self._get_status_cache() if use_cache else None
 
-        def check_single_project(project_name: str) -> Tuple[str, Dict]:
+        def check_single_project(project_name: str) -> Tuple[str, Optional[Dict]]:
             """Check a single project and return (project_name, status)."""
             try:
-                status = self.check_project_status(project_name)
-                if (status['outdated_rules'] or status['outdated_commands'] or
-                    status['missing_sources'] or status['missing_installed'] or
-                    status['conflict_rules'] or status['conflict_commands']):
-                    return (project_name, status)
-                return (project_name, None)
+                fingerprint = None
+                if cache is not None:
+                    try:
+                        fingerprint = self._status_fingerprint(project_name)
+                    except (BackendError, NotImplementedError, OSError, ValueError):
+                        fingerprint = None  # Can't fingerprint: fall back to a full check
+                    if fingerprint is not None:
+                        hit, cached_status = cache.lookup(project_name, fingerprint, max_age)
+                        if hit:
+                            return (project_name, cached_status)
+
+                status = self.check_project_status(project_name, fast=fast)
+                if not (status['outdated_rules'] or status['outdated_commands'] or
+                        status['missing_sources'] or status['missing_installed'] or
+                        status['conflict_rules'] or status['conflict_commands']):
+                    status = None
+                if fingerprint is not None and not fast:
+                    cache.store(project_name, fingerprint, status)
+                return (project_name, status)
             except Exception as e:
                 return (project_name, {'error': str(e)})
 
-        # Use ThreadPoolExecutor for parallel checking
-        # Limit to 10 threads to avoid overwhelming the system
-        max_workers = min(10, len(projects_to_check)) if projects_to_check else 1
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_project = {
-                executor.submit(check_single_project, project_name): project_name
-                for project_name in projects_to_check
-            }
-
-            # Collect results as they complete
-            for future in as_completed(future_to_project):
-                project_name, status = future.result()
-                if status is not None:
-                    all_status[project_name] = status
-
-        return all_status
-
+        # Check projects on the bounded, host-aware pool
+        finished = False
+        with self._run_scope():
+            try:
+                for _, result in run_by_host(projects_to_check, check_single_project, self._project_host):
+                    yield result
+                finished = True
+            finally:
+                if cache is not None:
+                    if finished:
+                        cache.prune(self.config.state['projects'])
+                    cache.save()
+
+    @_in_run_scope
     def show_diff(self, project_name: str, item_name: str, target: Optional[str] = None) -> str:
         """Show diff between installed and current version of a rule or command.
 
@@ -2162,7 +3165,7 @@ file = "~/.codex/warden.log"
         if not actual_name:
             raise ProjectNotFoundError(f"Project '{project_name}' not found")
 
-        project_state = ProjectState.from_dict(self.config.state['projects'][actual_name])
+        project_state = self._get_project_state(actual_name)
 
         # Find the item in rules or commands across all targets
         item_info = None
@@ -2180,9 +3183,7 @@ file = "~/.codex/warden.log"
             for rule in target_config.get('installed_rules', []):
                 if rule['name'] == item_name:
                     item_info = rule
-                    # Use target-specific extension for rules
-                    rule_extension = self.config.get_target_rule_extension(target_name)
-                    dest_path = project_state.get_rules_destination_path(self.config, target_name) / f"{item_name}{rule_extension}"
+                    dest_path = self._installed_item_path(project_state, target_name, item_name, False)
                     break
 
             if item_info:
@@ -2192,7 +3193,7 @@ file = "~/.codex/warden.log"
             for cmd in target_config.get('installed_commands', []):
                 if cmd['name'] == item_name:
                     item_info = cmd
-                    dest_path = project_state.get_commands_destination_path(self.config, target_name) / f"{item_name}.md"
+                    dest_path = self._installed_item_path(project_state, target_name, item_name, True)
                     break
 
             if item_info:
@@ -2217,12 +3218,9 @@ file = "~/.codex/warden.log"
         use_copy = target_config.get('install_type') == 'copy'
         is_command = item_info in target_config.get('installed_commands', [])
 
-        if use_copy and is_command:
-            # Process template to match what was installed
-            content = source_path.read_text()
-            rules_dir = self.config.get_target_rules_path(target_name)
-            processed_content = process_command_template(content, target_name, rules_dir)
-            current_lines = processed_content.splitlines(keepends=True)
+        if self._is_rendered(source_path, target_name, use_copy):
+            # Render (template or HAL conversion) to match what was installed
+            current_lines = self._render_item(source_path, target_name, is_command).splitlines(keepends=True)
         else:
             with open(source_path) as f:
                 current_lines = f.readlines()
@@ -2238,9 +3236,35 @@ file = "~/.codex/warden.log"
 
         return '\n'.join(diff)
 
+    @staticmethod
+    def _status_is_current(project_state: ProjectState, status: Dict) -> bool:
+        """Whether a precomputed status still describes project_state.
+
+        Every outdated or conflicting item must still be installed with the
+        stored checksum the status was computed from; otherwise the project
+        changed since it was scanned and must be checked again.
+        """
+        stored = {}
+        for target_name, target_config in project_state.targets.items():
+            for key, kind in (('installed_rules', 'rules'), ('installed_commands', 'commands')):
+                for item in target_config.get(key, []):
+                    stored[(kind, target_name, item['name'])] = item.get('checksum')
+
+        for kind in ('rules', 'commands'):
+            for category in (f'outdated_{kind}', f'conflict_{kind}'):
+                if category not in status:
+                    return False
+                for entry in status[category]:
+                    key = (kind, entry['target'], entry['name'])
+                    if key not in stored or stored[key] != entry.get('stored_checksum'):
+                        return False
+        return True
+
+    @_in_run_scope
     def update_project_items(self, project_name: str, rule_names: Optional[List[str]] = None,
                             command_names: Optional[List[str]] = None, update_all: bool = False,
-                            force: bool = False, skip_confirm: bool = False, target: Optional[str] = None) -> Dict:
+                            force: bool = False, skip_confirm: bool = False, target: Optional[str] = None,
+                            status: Optional[Dict] = None) -> Dict:
         """Update specific rules/commands or all outdated items in a project.
 
         Args:
@@ -2251,18 +3275,110 @@ file = "~/.codex/warden.log"
             force: Force update even for conflicts without prompting
             skip_confirm: Skip confirmation prompts (auto-answer yes)
             target: Specific target to update (None = all targets)
+            status: Result of an earlier check_project_status for this project.
+                    Reused instead of rescanning as long as the stored checksums
+                    it was computed from are still the ones in state.
         """
         # Find project with case-insensitive matching
         actual_name = self._find_project_case_insensitive(project_name)
         if not actual_name:
             raise ProjectNotFoundError(f"Project '{project_name}' not found")
 
-        project_state = ProjectState.from_dict(self.config.state['projects'][actual_name])
+        project_state = self._get_project_state(actual_name)
+        updated = self._apply_item_updates(actual_name, project_state, rule_names, command_names,
+                                           update_all, force, skip_confirm, target, status)
+
+        # Save updated state
+        if updated['rules'] or updated['commands']:
+            self._store_project_state(actual_name, project_state)
+            self.config.save_state()
+
+        return updated
+
+    def update_item_installations(self, rule_names: Optional[List[str]] = None,
+                                  command_names: Optional[List[str]] = None, dry_run: bool = False,
+                                  force: bool = False, include_remote: Optional[bool] = None) -> Dict:
+        """Update specific rules/commands in every project they are installed in.
+
+        Projects are found through the installation index, so only projects
+        that have one of the items are read.
+
+        Args:
+            rule_names: Rules to update
+            command_names: Commands to update
+            dry_run: If True, only report which projects would be updated
+            force: Overwrite conflicts (otherwise they are skipped)
+            include_remote: If True, include remote projects. If False, skip remote projects.
+                          If None, use config setting (default: True)
+
+        Returns:
+            Dict with 'updated' ((project_name, updated_items) tuples),
+            'skipped_remote' (project names) and 'errors' ((project_name, error) tuples)
+        """
+        if include_remote is None:
+            include_remote = self.config.config.get('update_remote_projects', True)
+
+        # project -> {'rules': [...], 'commands': [...]}, in index order
+        wanted = {}
+        for kind, key, names in (('rule', 'rules', rule_names), ('command', 'commands', command_names)):
+            for item_name in dict.fromkeys(names or []):
+                for install in self.get_item_installations(item_name, kind):
+                    items = wanted.setdefault(install['project'], {'rules': [], 'commands': []})
+                    if item_name not in items[key]:
+                        items[key].append(item_name)
+
+        summary = {'updated': [], 'skipped_remote': [], 'errors': []}
+        with self.config.transaction():
+            for project_name, items in wanted.items():
+                if not include_remote and self._get_project_state(project_name).is_remote():
+                    summary['skipped_remote'].append(project_name)
+                    continue
+                if dry_run:
+                    summary['updated'].append((project_name, dict(items, skipped=[], errors=[])))
+                    continue
+                try:
+                    result = self.update_project_items(project_name, items['rules'], items['commands'],
+                                                       force=force, skip_confirm=True)
+                except (WardenError, BackendError) as e:
+                    summary['errors'].append((project_name, str(e)))
+                    continue
+                summary['updated'].append((project_name, result))
+        return summary
+
+    def _apply_item_updates(self, actual_name: str, project_state: ProjectState,
+                            rule_names: Optional[List[str]], command_names: Optional[List[str]],
+                            update_all: bool, force: bool, skip_confirm: bool, target: Optional[str],
+                            status: Optional[Dict]) -> Dict:
+        """Write updated items into a project and refresh their checksums in project_state.
+
+        Does not store the project back into state; see update_project_items.
+        """
+        updated, changes = self._write_item_updates(actual_name, project_state, rule_names, command_names,
+                                                    update_all, force, skip_confirm, target, status)
+        self._commit_item_updates(project_state, updated, changes)
+        return updated
+
+    def _write_item_updates(self, actual_name: str, project_state: ProjectState,
+                            rule_names: Optional[List[str]], command_names: Optional[List[str]],
+                            update_all: bool, force: bool, skip_confirm: bool, target: Optional[str],
+                            status: Optional[Dict],
+                            messages: Optional[List[str]] = None) -> Tuple[Dict, List[Tuple]]:
+        """Write updated items into a project, leaving project_state alone.
+
+        Safe to run on a worker thread when skip_confirm is set and messages
+        is given (see _report).
+
+        Returns:
+            (updated, changes): the update summary, and the (kind, item name,
+            target, index in installed list, item fields) records that
+            _commit_item_updates applies to project_state
+        """
         backend = project_state.backend  # Get backend for file operations
         updated = {'rules': [], 'commands': [], 'errors': [], 'skipped': []}
 
         # Get project status to identify conflicts
-        status = self.check_project_status(actual_name)
+        if status is None or not self._status_is_current(project_state, status):
+            status = self.check_project_status(actual_name)
 
         # Determine what to update
         items_to_update = {'rules': [], 'commands': []}
@@ -2303,7 +3419,7 @@ file = "~/.codex/warden.log"
             elif not force and skip_confirm:
                 # Skip confirmation but don't force - skip conflicts
                 updated['skipped'].append(rule_name)
-                print(f"   Skipped '{rule_name}' (conflict, use --force to override)")
+                self._report(messages, f"   Skipped '{rule_name}' (conflict, use --force to override)")
                 continue
 
             # Add to items to update
@@ -2323,7 +3439,7 @@ file = "~/.codex/warden.log"
             elif not force and skip_confirm:
                 # Skip confirmation but don't force - skip conflicts
                 updated['skipped'].append(cmd_name)
-                print(f"   Skipped '{cmd_name}' (conflict, use --force to override)")
+                self._report(messages, f"   Skipped '{cmd_name}' (conflict, use --force to override)")
                 continue
 
             # Add to items to update
@@ -2332,128 +3448,81 @@ file = "~/.codex/warden.log"
         # Determine which targets to update
         targets_to_update = [target] if target else list(project_state.targets.keys())
 
-        # Update rules across specified targets
-        for rule_name in items_to_update['rules']:
-            try:
-                # Find the rule info across specified targets
-                found = False
-                for target_name, target_config in project_state.targets.items():
-                    # Skip if not in targets to update
-                    if target_name not in targets_to_update:
-                        continue
-
-                    rule_info = None
-                    rule_index = None
-                    for i, r in enumerate(target_config.get('installed_rules', [])):
-                        if r['name'] == rule_name:
-                            rule_info = r
-                            rule_index = i
-                            found = True
-                            break
-
-                    if not rule_info:
-                        continue
-
-                    # Get source and destination paths
-                    source_path = Path(rule_info['source'])
-                    # Use target-specific extension for rules
-                    rule_extension = self.config.get_target_rule_extension(target_name)
-                    dest_path = project_state.get_rules_destination_path(self.config, target_name) / f"{rule_name}{rule_extension}"
-
-                    if not source_path.exists():
-                        updated['errors'].append(f"Source file not found for '{rule_name}' in target '{target_name}': {source_path}")
-                        continue
-
-                    # Copy the updated file (backend-aware)
-                    backend.copy_file(str(source_path), str(dest_path))
-
-                    # Update checksum
-                    new_checksum = calculate_file_checksum(source_path)
-                    target_config['installed_rules'][rule_index]['checksum'] = new_checksum
-                    target_config['installed_rules'][rule_index]['installed_at'] = datetime.now(timezone.utc).isoformat()
-
-                if found and rule_name not in updated['rules']:
-                    updated['rules'].append(rule_name)
-                elif not found:
-                    updated['errors'].append(f"Rule '{rule_name}' not found in any target")
-
-            except Exception as e:
-                updated['errors'].append(f"Error updating rule '{rule_name}': {e}")
-
-        # Update commands across specified targets
-        for cmd_name in items_to_update['commands']:
-            try:
-                # Find the command info across specified targets
-                found = False
-                for target_name, target_config in project_state.targets.items():
-                    # Skip if not in targets to update
-                    if target_name not in targets_to_update:
-                        continue
-
-                    cmd_info = None
-                    cmd_index = None
-                    for i, c in enumerate(target_config.get('installed_commands', [])):
-                        if c['name'] == cmd_name:
-                            cmd_info = c
-                            cmd_index = i
-                            found = True
-                            break
-
-                    if not cmd_info:
-                        continue
-
-                    # Get source and destination paths
-                    source_path = Path(cmd_info['source'])
-                    dest_path = project_state.get_commands_destination_path(self.config, target_name) / f"{cmd_name}.md"
-
-                    if not source_path.exists():
-                        updated['errors'].append(f"Source file not found for '{cmd_name}' in target '{target_name}': {source_path}")
-                        continue
-
-                    # Check if we need to process template (for commands in copy mode)
-                    use_copy = target_config.get('install_type') == 'copy'
-                    if use_copy:
-                        # Process template and write to temp file, then copy
-                        content = source_path.read_text()
-                        rules_dir = self.config.get_target_rules_path(target_name)
-                        processed_content = process_command_template(content, target_name, rules_dir)
-
-                        # Write to temp file then copy (backend-aware)
-                        import tempfile
-                        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as tmp:
-                            tmp.write(processed_content)
-                            tmp_path = tmp.name
-                        try:
-                            backend.copy_file(tmp_path, str(dest_path))
-                        finally:
-                            Path(tmp_path).unlink()
-
-                        # Calculate checksum from processed content
-                        new_checksum = calculate_content_checksum(processed_content)
-                    else:
-                        # For symlinks, just copy the file (backend-aware)
-                        backend.copy_file(str(source_path), str(dest_path))
-                        new_checksum = calculate_file_checksum(source_path)
-
-                    # Update checksum
-                    target_config['installed_commands'][cmd_index]['checksum'] = new_checksum
-                    target_config['installed_commands'][cmd_index]['installed_at'] = datetime.now(timezone.utc).isoformat()
-
-                if found and cmd_name not in updated['commands']:
-                    updated['commands'].append(cmd_name)
-                elif not found:
-                    updated['errors'].append(f"Command '{cmd_name}' not found in any target")
-
-            except Exception as e:
-                updated['errors'].append(f"Error updating command '{cmd_name}': {e}")
-
-        # Save updated state
-        if updated['rules'] or updated['commands']:
-            self.config.state['projects'][actual_name] = project_state.to_dict()
-            self.config.save_state()
+        # Plan: name -> index maps per target, then every file write for the project
+        indexes = {
+            target_name: {
+                kind: {item['name']: i for i, item in enumerate(target_config.get(f'installed_{kind}', []))}
+                for kind in ('rules', 'commands')
+            }
+            for target_name, target_config in project_state.targets.items()
+            if target_name in targets_to_update
+        }
+        writes = []  # (kind, item name, target, index in installed list, checksum, destination path)
+        pairs = []  # (local file to transfer, destination path)
 
-        return updated
+        for kind, is_command, label in (('rules', False, 'Rule'), ('commands', True, 'Command')):
+            # Outdated lists name an item once per target; plan each name once
+            for item_name in dict.fromkeys(items_to_update[kind]):
+                try:
+                    found = False
+                    for target_name, target_indexes in indexes.items():
+                        index = target_indexes[kind].get(item_name)
+                        if index is None:
+                            continue
+                        found = True
+
+                        target_config = project_state.targets[target_name]
+                        source_path = Path(target_config[f'installed_{kind}'][index]['source'])
+                        dest_path = self._installed_item_path(project_state, target_name, item_name, is_command)
+
+                        if not source_path.exists():
+                            updated['errors'].append(f"Source file not found for '{item_name}' in target '{target_name}': {source_path}")
+                            continue
+
+                        # Copies are rendered for the target (template processing or HAL conversion)
+                        use_copy = target_config.get('install_type') == 'copy'
+                        pairs.append((self._stage_item(source_path, target_name, is_command, dest_path.name, use_copy),
+                                      str(dest_path)))
+                        writes.append((kind, item_name, target_name, index,
+                                       self._expected_checksum(source_path, target_name, is_command, use_copy),
+                                       str(dest_path)))
+
+                    if not found:
+                        updated['errors'].append(f"{label} '{item_name}' not found in any target")
 
+                except Exception as e:
+                    updated['errors'].append(f"Error updating {label.lower()} '{item_name}': {e}")
+
+        # Transfer: one batch for the whole project (backend-aware)
+        failed = self._copy_batch(backend, pairs)
+        if failed:
+            updated['errors'].extend(f"Error writing {dest}: {error}" for dest, error in failed.items())
+            writes = [write for write in writes if write[5] not in failed]
+
+        # New checksums (and file metadata) for the written items
+        installed_at = datetime.now(timezone.utc).isoformat()
+        written = []
+        changes = []
+        for kind, item_name, target_name, index, checksum, dest in writes:
+            fields = {'checksum': checksum, 'installed_at': installed_at}
+            written.append((dest, fields))
+            changes.append((kind, item_name, target_name, index, fields))
+        self._record_installed_stats(backend, written)
+
+        return updated, changes
+
+    @staticmethod
+    def _commit_item_updates(project_state: ProjectState, updated: Dict, changes: List[Tuple]):
+        """Record the changes planned by _write_item_updates in project_state."""
+        for kind, item_name, target_name, index, fields in changes:
+            item = project_state.targets[target_name][f'installed_{kind}'][index]
+            item.pop('installed_size', None)
+            item.pop('installed_mtime', None)
+            item.update(fields)
+            if item_name not in updated[kind]:
+                updated[kind].append(item_name)
+
+    @_in_run_scope
     def install_to_all_projects(self, rule_names: Optional[List[str]] = None,
                                 command_names: Optional[List[str]] = None,
                                 target: Optional[str] = None,
@@ -2500,27 +3569,50 @@ file = "~/.codex/warden.log"
             if response not in ['y', 'yes']:
                 raise WardenError("Installation cancelled by user")
 
-        # Install to each project
-        for project in projects:
+        def install_single_project(project_name: str
+                                   ) -> Tuple[Optional[Tuple[Dict, Dict]], Optional[str], List[str]]:
+            """Push the items to one project; returns ((added items, failed writes), error, messages)."""
+            messages = []
             try:
-                self.add_to_project(
-                    project.name,
-                    rule_names=rule_names,
-                    command_names=command_names,
-                    target=target
-                )
-
+                project_state = self._get_project_state(project_name)
+                targets = self._resolve_add_targets(project_name, project_state, target)
+                return self._install_items_to_project(project_state, targets, rule_names, command_names,
+                                                      messages), None, messages
+            except Exception as e:
+                return None, str(e), messages
+
+        # Each (item, target) is resolved and rendered once for the whole run,
+        # then pushed to projects in parallel on the host-aware pool. This
+        # thread prints each project's messages and records the results; the
+        # state file is written once at the end.
+        project_names = [project.name for project in projects]
+        results = {}
+        with self.config.transaction():
+            for project_name, (pushed, error, messages) in run_by_host(project_names, install_single_project,
+                                                                       self._project_host):
+                for message in messages:
+                    print(message)
+                if error is None:
+                    added, failed = pushed
+                    self._record_added_items(project_name, self._get_project_state(project_name), added)
+                    if failed:
+                        error = str(self._failed_writes_error(failed))
+                results[project_name] = error
+
+        # Report in project order regardless of completion order
+        for project_name in project_names:
+            if results[project_name] is not None:
+                summary['errors'].append((project_name, results[project_name]))
+            else:
                 installed_items = {
                     'rules': rule_names or [],
                     'commands': command_names or []
                 }
-                summary['installed'].append((project.name, installed_items))
-
-            except Exception as e:
-                summary['errors'].append((project.name, str(e)))
+                summary['installed'].append((project_name, installed_items))
 
         return summary
 
+    @_in_run_scope
     def update_all_projects(self, dry_run: bool = False, include_remote: Optional[bool] = None) -> Dict:
         """Update all projects with outdated items, skipping conflicts.
 
@@ -2545,7 +3637,7 @@ file = "~/.codex/warden.log"
         }
 
         # Check all projects - this returns only projects with issues
-        all_status = self.check_all_projects_status()
+        all_status = self.check_all_projects_status(include_remote=include_remote)
 
         # Track which projects have issues
         projects_with_issues = set(all_status.keys())
@@ -2554,16 +3646,17 @@ file = "~/.codex/warden.log"
         for project_name in self.config.state['projects']:
             if project_name not in projects_with_issues:
                 # Check if this is a remote project and should be skipped
-                project_state = ProjectState.from_dict(self.config.state['projects'][project_name])
+                project_state = self._get_project_state(project_name)
                 if not include_remote and project_state.is_remote():
                     summary['skipped_remote'].append(project_name)
                 else:
                     summary['skipped_uptodate'].append(project_name)
 
-        # Process each project with issues
+        # Sort projects with issues into skipped and to-update
+        to_update = []
         for project_name, status in all_status.items():
             # Check if this is a remote project and should be skipped
-            project_state = ProjectState.from_dict(self.config.state['projects'][project_name])
+            project_state = self._get_project_state(project_name)
             if not include_remote and project_state.is_remote():
                 summary['skipped_remote'].append(project_name)
                 continue
@@ -2590,26 +3683,7 @@ file = "~/.codex/warden.log"
                 summary['skipped_uptodate'].append(project_name)
                 continue
 
-            # Update the project (skip conflicts automatically by not forcing)
-            if not dry_run:
-                try:
-                    result = self.update_project_items(
-                        project_name,
-                        update_all=True,
-                        force=False  # Don't force conflicts
-                    )
-
-                    updated_items = {
-                        'rules': result['rules'],
-                        'commands': result['commands'],
-                        'skipped': result.get('skipped', []),
-                        'errors': result.get('errors', [])
-                    }
-                    summary['updated'].append((project_name, updated_items))
-
-                except Exception as e:
-                    summary['errors'].append((project_name, str(e)))
-            else:
+            if dry_run:
                 # Dry run - just record what would be updated
                 would_update = {
                     'rules': [r['name'] for r in status.get('outdated_rules', [])],
@@ -2618,36 +3692,89 @@ file = "~/.codex/warden.log"
                     'errors': []
                 }
                 summary['updated'].append((project_name, would_update))
+            else:
+                to_update.append(project_name)
+
+        def update_single_project(project_name: str
+                                  ) -> Tuple[Optional[Tuple[Dict, List[Tuple]]], Optional[str], List[str]]:
+            """Write one project's updated files; returns ((result, changes), error, messages)."""
+            messages = []
+            try:
+                # Reuse the scan above rather than hashing every file again.
+                # Conflicts found by a rescan are skipped, never prompted for.
+                return self._write_item_updates(
+                    project_name, self._get_project_state(project_name), None, None,
+                    update_all=True, force=False, skip_confirm=True, target=None,
+                    status=all_status[project_name], messages=messages
+                ), None, messages
+            except Exception as e:
+                return None, str(e), messages
+
+        # Update projects on the bounded, host-aware pool. Workers only write
+        # files and return the checksums to record and the messages to print;
+        # this thread prints and applies them, and is the single writer of
+        # state, which the transaction saves once at the end.
+        results = {}
+        with self.config.transaction():
+            for project_name, (written, error, messages) in run_by_host(to_update, update_single_project,
+                                                                        self._project_host):
+                for message in messages:
+                    print(message)
+                if error is not None:
+                    results[project_name] = ('error', error)
+                    continue
+                result, changes = written
+                project_state = self._get_project_state(project_name)
+                self._commit_item_updates(project_state, result, changes)
+                if result['rules'] or result['commands']:
+                    self._store_project_state(project_name, project_state)
+                    self.config.save_state()
+                results[project_name] = ('updated', {
+                    'rules': result['rules'],
+                    'commands': result['commands'],
+                    'skipped': result.get('skipped', []),
+                    'errors': result.get('errors', [])
+                })
+
+        # Report in scan order regardless of completion order
+        for project_name in to_update:
+            kind, value = results[project_name]
+            if kind == 'error':
+                summary['errors'].append((project_name, value))
+            else:
+                summary['updated'].append((project_name, value))
 
         return summary
 
-    def show_package_diff(self, package_name: str, show_files: bool = False) -> str:
-        """Show diff for a package that has updates available."""
+    def show_package_diff(self, package_name: str, show_files: bool = False,
+                          max_age: Optional[float] = None) -> str:
+        """Show diff for a package that has updates available.
+
+        Only fetches when origin's ref (reused within max_age, see
+        check_package_updates) differs from the installed commit.
+        """
         if package_name not in self.config.registry['packages']:
             raise WardenError(f"Package '{package_name}' not found")
 
         package_data = self.config.registry['packages'][package_name]
         package = GitHubPackage.from_dict(package_data)
-        package_dir = self.config.packages_path / package.directory_name
+        package_dir = self._package_repo(package)
 
         if not package_dir.exists():
             raise WardenError(f"Package directory not found: {package_dir}")
 
-        # Fetch latest changes
-        code, stdout, stderr = self._run_git_command(['fetch', 'origin'], cwd=package_dir)
-        if code != 0:
-            raise WardenError(f"Failed to fetch updates: {stderr}")
-
-        # Get remote commit hash
-        code, remote_hash, stderr = self._run_git_command([
-            'rev-parse', f'origin/{package.ref}'
-        ], cwd=package_dir)
+        # Skip the fetch when origin is known not to have moved
+        if self._package_states(max_age, [package_name])[package_name]['state'] == 'up-to-date':
+            return f"Package {package.name} is up to date"
 
-        if code != 0:
-            raise WardenError(f"Failed to get remote commit: {stderr}")
+        result = self._fetch_package(package)
+        if result['state'] == 'error':
+            raise WardenError(result['error'])
 
-        if remote_hash == package.installed_ref:
+        if result['state'] == 'up-to-date':
             return f"Package {package.name} is up to date"
+        remote_hash = result['latest']
+        self._record_remote_refs({package_name: {'remote_ref': remote_hash}})
 
         # Show commit log
         code, commit_log, stderr = self._run_git_command([
@@ -2681,42 +3808,12 @@ file = "~/.codex/warden.log"
 
         return diff_output
 
-    def get_package_status(self) -> Dict[str, str]:
-        """Get status of all packages (up-to-date, outdated, error)."""
-        status = {}
-
-        for package_name in self.config.registry['packages']:
-            try:
-                package_data = self.config.registry['packages'][package_name]
-                package = GitHubPackage.from_dict(package_data)
-                package_dir = self.config.packages_path / package.directory_name
-
-                if not package_dir.exists():
-                    status[package_name] = 'missing'
-                    continue
-
-                # Check if we can fetch (network connectivity)
-                code, stdout, stderr = self._run_git_command(['fetch', 'origin'], cwd=package_dir)
-                if code != 0:
-                    status[package_name] = 'error'
-                    continue
+    def get_package_status(self, max_age: Optional[float] = None) -> Dict[str, str]:
+        """Get status of all packages (up-to-date, outdated, error, missing).
 
-                # Check if up to date
-                code, remote_hash, stderr = self._run_git_command([
-                    'rev-parse', f'origin/{package.ref}'
-                ], cwd=package_dir)
-
-                if code == 0:
-                    if remote_hash == package.installed_ref:
-                        status[package_name] = 'up-to-date'
-                    else:
-                        status[package_name] = 'outdated'
-                else:
-                    status[package_name] = 'error'
-
-            except Exception:
-                status[package_name] = 'error'
-
-        return status
+        Args:
+            max_age: See check_package_updates
+        """
+        return {name: result['state'] for name, result in self._package_states(max_age).items()}
 
 
@@ -0,0 +1,86 @@
+"""
+Shared package mirrors for Agent Warden.
+
+A mirror cache holds one bare repository per package that several warden
+homes (developers, CI agents) on a machine can share. Package checkouts are
+cloned with --reference to the mirror, so they borrow its objects through
+git alternates instead of downloading and storing their own copy.
+
+Checkouts depend on the mirror's objects, so mirrors never prune unreachable
+objects (gc.pruneExpire=never): a force-pushed branch must not take the
+commits an older checkout is on with it.
+"""
+
+import shutil
+import subprocess
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List
+
+from agent_warden.exceptions import WardenError
+
+try:
+    import fcntl
+except ImportError:  # Windows: mirrors aren't locked between processes
+    fcntl = None
+
+
+class PackageMirrors:
+    """Bare per-package repositories in a directory shared between warden homes."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root).expanduser()
+
+    def path(self, package_dir: str) -> Path:
+        """Mirror of a package (may not exist yet)."""
+        return self.root / f"{package_dir}.git"
+
+    def sync(self, package_dir: str, url: str) -> Path:
+        """Create a package's mirror, or fetch new commits into it.
+
+        Returns:
+            The mirror directory
+
+        Raises:
+            WardenError: If the mirror can't be created or fetched
+        """
+        mirror = self.path(package_dir)
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._locked(package_dir):
+            if mirror.is_dir():
+                self._git(['fetch', '--quiet', '--tags', 'origin'], cwd=mirror)
+                return mirror
+
+            # Clone under a private name so an interrupted clone is never used
+            staging = self.root / f".{mirror.name}.{uuid.uuid4().hex}"
+            try:
+                self._git(['clone', '--quiet', '--bare', url, str(staging)], cwd=self.root)
+                self._git(['config', 'remote.origin.fetch', '+refs/heads/*:refs/heads/*'], cwd=staging)
+                self._git(['config', 'gc.pruneExpire', 'never'], cwd=staging)
+                staging.rename(mirror)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+        return mirror
+
+    @contextmanager
+    def _locked(self, package_dir: str) -> Iterator[None]:
+        """Hold a package's mirror lock (shared by every process using the cache)."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.root / f".{package_dir}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _git(args: List[str], cwd: Path):
+        try:
+            result = subprocess.run(['git'] + args, cwd=cwd, capture_output=True, text=True, timeout=300)
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            raise WardenError(f"git {args[0]} failed: {e}") from e
+        if result.returncode != 0:
+            raise WardenError(f"git {args[0]} failed: {result.stderr.strip()}")
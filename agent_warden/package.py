@@ -7,17 +7,32 @@ Handles GitHub package metadata and version information.
 from datetime import datetime, timezone
 from typing import Dict, Optional
 
+# How a package repository is cloned:
+#   full    - complete history and files (as a submodule when possible)
+#   shallow - latest commit only (--depth 1)
+#   sparse  - latest commit, blobs fetched on demand (--filter=blob:none),
+#             and only CONTENT_DIRS checked out
+CLONE_STRATEGIES = ('full', 'shallow', 'sparse')
+
+# Package directories commands are looked up in, in order
+COMMAND_DIRS = ('commands', 'commands-mdc', 'mdc-commands', 'cursor-commands')
+
+# Package directories Agent Warden reads
+CONTENT_DIRS = ('rules',) + COMMAND_DIRS
+
 
 class GitHubPackage:
     """Represents a GitHub package with version information."""
 
     def __init__(self, owner: str, repo: str, ref: str = "main",
-                 installed_ref: Optional[str] = None, installed_at: Optional[str] = None):
+                 installed_ref: Optional[str] = None, installed_at: Optional[str] = None,
+                 clone: str = 'full'):
         self.owner = owner
         self.repo = repo
         self.ref = ref  # Target ref (branch/tag)
         self.installed_ref = installed_ref  # Currently installed ref
         self.installed_at = installed_at or datetime.now(timezone.utc).isoformat()
+        self.clone = clone  # Clone strategy (see CLONE_STRATEGIES)
         self.name = f"{owner}/{repo}"
 
     @property
@@ -37,7 +52,8 @@ class GitHubPackage:
             'repo': self.repo,
             'ref': self.ref,
             'installed_ref': self.installed_ref,
-            'installed_at': self.installed_at
+            'installed_at': self.installed_at,
+            'clone': self.clone
         }
 
     @classmethod
@@ -48,7 +64,8 @@ class GitHubPackage:
             repo=data['repo'],
             ref=data.get('ref', 'main'),
             installed_ref=data.get('installed_ref'),
-            installed_at=data.get('installed_at')
+            installed_at=data.get('installed_at'),
+            clone=data.get('clone', 'full')
         )
 
     @classmethod
@@ -0,0 +1,96 @@
+"""
+Bounded, host-aware parallel execution for Agent Warden.
+
+Fleet-wide operations (status, update) run one task per project. Remote
+projects are grouped by SSH target so no host gets more than a few
+concurrent sessions, while other hosts and local projects keep the
+remaining workers busy.
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+if TYPE_CHECKING:
+    from agent_warden.project import ProjectState
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Total concurrent tasks
+DEFAULT_MAX_WORKERS = 10
+
+# Concurrent tasks per remote host (sshd's MaxStartups throttles beyond ~10)
+DEFAULT_PER_HOST = 4
+
+
+def project_host(project_state: 'ProjectState') -> Optional[str]:
+    """Host key for scheduling: the SSH target of a remote project, None if local."""
+    if project_state.is_remote():
+        return project_state.backend.ssh_target
+    return None
+
+
+def run_by_host(items: Iterable[T], fn: Callable[[T], R], host_of: Callable[[T], Optional[str]],
+                max_workers: int = DEFAULT_MAX_WORKERS,
+                per_host: int = DEFAULT_PER_HOST) -> Iterator[Tuple[T, R]]:
+    """Run fn over items in parallel, yielding (item, result) as tasks complete.
+
+    At most max_workers tasks run at once, and at most per_host of them for
+    any one remote host (host_of returns None for local items, which are
+    only bounded by max_workers). Hosts are served round-robin, so one host
+    with many items can't starve the others, and a task is only submitted
+    once its host has capacity, so no worker sits blocked waiting on a host.
+
+    Exceptions raised by fn propagate when its result is yielded. If the
+    caller stops iterating early, tasks that haven't started are cancelled.
+    """
+    queues: Dict[Optional[str], Deque[T]] = {}
+    for item in items:
+        queues.setdefault(host_of(item), deque()).append(item)
+
+    if not queues:
+        return
+
+    total = sum(len(queue) for queue in queues.values())
+    running: Dict[Optional[str], int] = {}
+    pending: Dict[Future, Tuple[T, Optional[str]]] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total))) as executor:
+        try:
+            while queues or pending:
+                # Fill free workers, one item per host per pass
+                progressed = True
+                while progressed and len(pending) < max_workers:
+                    progressed = False
+                    for host in list(queues):
+                        if len(pending) >= max_workers:
+                            break
+                        if host is not None and running.get(host, 0) >= per_host:
+                            continue
+                        queue = queues[host]
+                        item = queue.popleft()
+                        if not queue:
+                            del queues[host]
+                        pending[executor.submit(fn, item)] = (item, host)
+                        running[host] = running.get(host, 0) + 1
+                        progressed = True
+
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    item, host = pending.pop(future)
+                    running[host] -= 1
+                    yield item, future.result()
+        finally:
+            for future in pending:
+                future.cancel()
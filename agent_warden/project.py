@@ -4,15 +4,51 @@ Project state management for Agent Warden.
 Handles project metadata, targets, and installed items tracking.
 """
 
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from fs_backend import LocalBackend, RemoteBackend, parse_location
+from fs_backend import (
+    FileSystemBackend,
+    LocalBackend,
+    RemoteBackend,
+    is_remote_location,
+    parse_location,
+)
+
+
+def _normalize_installed_item(item, default_timestamp: str) -> Optional[Dict]:
+    """Normalize a legacy string item or an item dict to dict format.
+
+    Dicts are kept as-is (they may carry extra keys) with their sources
+    interned, so thousands of projects sharing the same rules share the
+    same string objects in memory; strings become a record without checksum.
+    """
+    if isinstance(item, str):
+        return {
+            "name": item,
+            "checksum": None,
+            "source": None,
+            "installed_at": default_timestamp
+        }
+    if isinstance(item, dict):
+        for key in ('source', 'source_type'):
+            if isinstance(item.get(key), str):
+                item[key] = sys.intern(item[key])
+        return item
+    return None
 
 
 class ProjectState:
-    """Represents the state of an installed project with support for multiple targets."""
+    """Represents the state of an installed project with support for multiple targets.
+
+    Location parsing, path resolution and backend construction are deferred
+    until first use, so materialising a large state only costs what is read.
+    """
+
+    __slots__ = ('name', 'timestamp', 'targets', 'default_targets',
+                 '_location', '_project_path', '_backend', '_path', '_location_string')
 
     def __init__(self, name: str, path: str, targets: Optional[Dict] = None, timestamp: Optional[str] = None,
                  default_targets: Optional[List[str]] = None):
@@ -27,19 +63,12 @@ class ProjectState:
         """
         self.name = name
 
-        # Parse location to get path and backend
-        self.project_path, self.backend = parse_location(path)
-
-        # For backward compatibility, keep self.path as Path object for local paths
-        if isinstance(self.backend, LocalBackend):
-            self.path = Path(self.project_path).resolve()
-            # For local paths, store the resolved path as location string
-            self.location_string = str(self.path)
-        else:
-            # For remote paths, create a pseudo-Path that won't be used for file operations
-            self.path = Path(self.project_path)
-            # For remote paths, store the original SSH location string
-            self.location_string = path
+        # Original location string; parsed lazily (see _parse_location)
+        self._location = path
+        self._project_path = None
+        self._backend = None
+        self._path = None
+        self._location_string = None
 
         self.timestamp = timestamp or datetime.now(timezone.utc).isoformat()
 
@@ -59,23 +88,64 @@ class ProjectState:
         # Default targets: when adding rules without --target, use these
         self.default_targets = default_targets or []
 
+    def _parse_location(self):
+        """Parse the location string into path and backend on first use."""
+        if self._backend is not None:
+            return
+
+        project_path, backend = parse_location(self._location)
+
+        # For backward compatibility, keep path as Path object for local paths
+        if isinstance(backend, LocalBackend):
+            self._path = Path(project_path).resolve()
+            # For local paths, store the resolved path as location string
+            self._location_string = str(self._path)
+        else:
+            # For remote paths, create a pseudo-Path that won't be used for file operations
+            self._path = Path(project_path)
+            # For remote paths, store the original SSH location string
+            self._location_string = self._location
+
+        self._project_path = project_path
+        self._backend = backend
+
+    @property
+    def project_path(self) -> str:
+        """Project path without host information."""
+        self._parse_location()
+        return self._project_path
+
+    @property
+    def backend(self) -> FileSystemBackend:
+        """Backend used for file operations on this project."""
+        self._parse_location()
+        return self._backend
+
+    @property
+    def path(self) -> Path:
+        """Project path as a Path (resolved for local projects)."""
+        self._parse_location()
+        return self._path
+
+    @property
+    def location_string(self) -> str:
+        """Location string as saved in state (resolved local path or SSH location)."""
+        self._parse_location()
+        return self._location_string
+
     def is_remote(self) -> bool:
         """Check if this project is on a remote machine."""
-        return isinstance(self.backend, RemoteBackend)
+        if self._backend is not None:
+            return isinstance(self._backend, RemoteBackend)
+        return is_remote_location(self._location)
 
     def _normalize_installed_items(self, items: List) -> List[Dict]:
         """Normalize installed items to dict format with checksums."""
         normalized = []
         for item in items:
-            if isinstance(item, str):
-                normalized.append({
-                    "name": item,
-                    "checksum": None,
-                    "source": None,
-                    "installed_at": self.timestamp
-                })
-            elif isinstance(item, dict):
-                normalized.append(item)
+            item_dict = _normalize_installed_item(item, self.timestamp)
+            if item_dict is not None:
+                normalized.append(item_dict)
         return normalized
 
     def add_target(self, target: str, install_type: str, has_rules: bool = True,
@@ -115,6 +185,18 @@ class ProjectState:
             'default_targets': self.default_targets
         }
 
+    def matches_dict(self, data: Dict) -> bool:
+        """Check whether this instance still reflects a state entry.
+
+        Used by the manager's identity map to detect entries that were edited
+        in place after this instance was built from them.
+        """
+        return (data.get('path') == self._location and
+                data.get('name') == self.name and
+                data.get('timestamp', self.timestamp) == self.timestamp and
+                data.get('targets', self.targets) is self.targets and
+                data.get('default_targets', self.default_targets) == self.default_targets)
+
     @classmethod
     def from_dict(cls, data: Dict) -> 'ProjectState':
         """Create ProjectState from dictionary.
@@ -134,19 +216,14 @@ class ProjectState:
         # Old format with single 'target' key - convert to new format
         target_name = data.get('target')
         if target_name:
-            # Normalize installed items
+            timestamp = data.get('timestamp', datetime.now(timezone.utc).isoformat())
+
             def normalize_items(items):
                 normalized = []
                 for item in (items or []):
-                    if isinstance(item, str):
-                        normalized.append({
-                            "name": item,
-                            "checksum": None,
-                            "source": None,
-                            "installed_at": data.get('timestamp', datetime.now(timezone.utc).isoformat())
-                        })
-                    elif isinstance(item, dict):
-                        normalized.append(item)
+                    item_dict = _normalize_installed_item(item, timestamp)
+                    if item_dict is not None:
+                        normalized.append(item_dict)
                 return normalized
 
             targets = {
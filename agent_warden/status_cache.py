@@ -0,0 +1,85 @@
+"""
+Persistent status cache for Agent Warden.
+
+Stores the last status verdict of each project together with a fingerprint
+of everything the verdict depends on, so an unchanged project can be
+reported without re-hashing its installed files.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+class StatusCache:
+    """Per-project cache of check_project_status results keyed by fingerprint."""
+
+    VERSION = 2
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                if data.get('version') == self.VERSION:
+                    self._entries = data.get('projects', {})
+            except (OSError, json.JSONDecodeError, AttributeError):
+                self._entries = {}
+
+    def lookup(self, project_name: str, fingerprint: str,
+               max_age: Optional[float] = None) -> Tuple[bool, Optional[Dict]]:
+        """Look up a cached verdict.
+
+        Args:
+            project_name: Project name
+            fingerprint: Fingerprint of the project's current inputs
+            max_age: Maximum age in seconds of a usable entry (None = unbounded)
+
+        Returns:
+            Tuple of (hit, status); status is None for a project without issues
+        """
+        with self._lock:
+            entry = self._entries.get(project_name)
+        if not entry or entry.get('fingerprint') != fingerprint:
+            return False, None
+        if max_age is not None and time.time() - entry.get('checked_at', 0) > max_age:
+            return False, None
+        return True, entry.get('status')
+
+    def store(self, project_name: str, fingerprint: str, status: Optional[Dict]):
+        """Record a freshly computed verdict."""
+        with self._lock:
+            self._entries[project_name] = {
+                'fingerprint': fingerprint,
+                'checked_at': time.time(),
+                'status': status,
+            }
+            self._dirty = True
+
+    def prune(self, project_names):
+        """Drop entries for projects that are no longer tracked."""
+        keep = set(project_names)
+        with self._lock:
+            for name in [n for n in self._entries if n not in keep]:
+                del self._entries[name]
+                self._dirty = True
+
+    def save(self):
+        """Write the cache to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'version': self.VERSION, 'projects': self._entries}
+            self._dirty = False
+        try:
+            with open(self.path, 'w') as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"Warning: Could not save status cache: {e}")
@@ -0,0 +1,165 @@
+"""
+Content-addressed package store for Agent Warden.
+
+Keeps any number of versions of a package side by side. Each version is a
+tree exported from one commit and never modified, under versions/<package>/<commit>/,
+whose files are hard links into objects/, where every file is stored once
+under its git blob id. A file that is identical in two versions (or two
+packages) therefore takes up space only once.
+"""
+
+import os
+import shutil
+import subprocess
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from agent_warden.exceptions import WardenError
+
+
+class PackageStore:
+    """Per-commit exports of package repositories, deduplicated by blob id."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.objects_path = self.root / 'objects'
+        self.versions_path = self.root / 'versions'
+
+    def version_path(self, package_dir: str, commit: str) -> Path:
+        """Directory holding one version of a package (may not exist yet)."""
+        return self.versions_path / package_dir / commit
+
+    def versions(self, package_dir: str) -> List[str]:
+        """Commits of a package that are in the store."""
+        package_versions = self.versions_path / package_dir
+        if not package_versions.is_dir():
+            return []
+        return sorted(entry.name for entry in package_versions.iterdir() if not entry.name.startswith('.'))
+
+    def export(self, repo_dir: Path, package_dir: str, commit: str, paths: Iterable[str]) -> Path:
+        """Add the given paths of a commit to the store, unless already there.
+
+        Args:
+            repo_dir: Git checkout the commit is (or can be lazily fetched) in
+            package_dir: Package directory name (owner-repo)
+            commit: Full commit hash
+            paths: Top-level directories to export
+
+        Returns:
+            The version directory
+        """
+        version_dir = self.version_path(package_dir, commit)
+        if version_dir.is_dir():
+            return version_dir
+
+        entries = self._list_blobs(repo_dir, commit, paths)
+        self._store_objects(repo_dir, {blob for blob, _ in entries})
+
+        # Build under a private name, then rename into place so readers never
+        # see a partial version and concurrent exports don't collide
+        staging = version_dir.parent / f".{commit}.{uuid.uuid4().hex}"
+        try:
+            for blob, rel_path in entries:
+                dest = staging / rel_path
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(self._object_path(blob), dest)
+                except OSError:
+                    # No hard links here (e.g. some network filesystems)
+                    shutil.copyfile(self._object_path(blob), dest)
+            staging.mkdir(parents=True, exist_ok=True)
+            try:
+                staging.rename(version_dir)
+            except OSError:
+                if not version_dir.is_dir():
+                    raise
+                # Another process exported the same commit first
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        return version_dir
+
+    def remove_package(self, package_dir: str) -> int:
+        """Drop every version of a package and the objects only it used.
+
+        Returns:
+            Number of objects freed
+        """
+        shutil.rmtree(self.versions_path / package_dir, ignore_errors=True)
+        return self.prune()
+
+    def prune(self) -> int:
+        """Delete objects no version links to any more.
+
+        Returns:
+            Number of objects deleted
+        """
+        removed = 0
+        if not self.objects_path.is_dir():
+            return removed
+        for obj in self.objects_path.glob('*/*'):
+            if obj.name.startswith('.'):
+                continue  # Being written
+            try:
+                if obj.stat().st_nlink == 1:
+                    obj.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def _object_path(self, blob: str) -> Path:
+        return self.objects_path / blob[:2] / blob[2:]
+
+    @staticmethod
+    def _git(repo_dir: Path, args: List[str], input_data: Optional[bytes] = None) -> bytes:
+        try:
+            result = subprocess.run(['git'] + args, cwd=repo_dir, input=input_data,
+                                    capture_output=True, timeout=300)
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            raise WardenError(f"git {args[0]} failed: {e}") from e
+        if result.returncode != 0:
+            raise WardenError(f"git {args[0]} failed: {result.stderr.decode(errors='replace').strip()}")
+        return result.stdout
+
+    def _list_blobs(self, repo_dir: Path, commit: str, paths: Iterable[str]) -> List[Tuple[str, str]]:
+        """(blob id, path) of every regular file under paths in commit."""
+        listing = self._git(repo_dir, ['ls-tree', '-r', '-z', commit, '--'] + list(paths))
+        entries = []
+        for record in listing.split(b'\0'):
+            if not record:
+                continue
+            meta, _, rel_path = record.partition(b'\t')
+            mode, obj_type, blob = meta.decode().split()
+            # Skip symlinks (120000) and submodules (commit entries)
+            if obj_type != 'blob' or mode == '120000':
+                continue
+            entries.append((blob, os.fsdecode(rel_path)))
+        return entries
+
+    def _store_objects(self, repo_dir: Path, blobs: Iterable[str]):
+        """Write blobs that aren't in objects/ yet, read with one cat-file process."""
+        missing = sorted(blob for blob in blobs if not self._object_path(blob).exists())
+        if not missing:
+            return
+
+        output = self._git(repo_dir, ['cat-file', '--batch'],
+                           input_data=''.join(f"{blob}\n" for blob in missing).encode())
+        contents: Dict[str, bytes] = {}
+        pos = 0
+        for blob in missing:
+            header_end = output.index(b'\n', pos)
+            header = output[pos:header_end].decode().split()
+            if len(header) != 3:
+                raise WardenError(f"Object {blob} not found in {repo_dir}")
+            size = int(header[2])
+            contents[blob] = output[header_end + 1:header_end + 1 + size]
+            pos = header_end + 1 + size + 1
+
+        for blob, data in contents.items():
+            obj = self._object_path(blob)
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            tmp = obj.parent / f".{obj.name}.{uuid.uuid4().hex}"
+            tmp.write_bytes(data)
+            os.replace(tmp, obj)
@@ -6,9 +6,12 @@ timestamp formatting, and other common operations.
 """
 
 import hashlib
+import json
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Dict, Hashable, Tuple
 
 import yaml
 
@@ -34,6 +37,105 @@ def calculate_content_checksum(content: str) -> str:
     return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
 
+class DigestTable:
+    """Single-flight memo of digests, shared by all workers of one run.
+
+    The first caller for a key computes the value; concurrent callers for the
+    same key wait for that computation instead of repeating it. Failures are
+    not cached, so a later call retries.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Future] = {}
+
+    def get(self, key: Hashable, compute: Callable[[], str]) -> str:
+        """Return the digest for key, computing it at most once."""
+        with self._lock:
+            future = self._entries.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._entries[key] = future
+
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as e:
+                with self._lock:
+                    self._entries.pop(key, None)
+                future.set_exception(e)
+
+        return future.result()
+
+    def file_checksum(self, file_path: Path) -> str:
+        """SHA256 of a file, hashed once per table."""
+        return self.get(('file', str(file_path)), lambda: calculate_file_checksum(file_path))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RenderedDigestCache:
+    """Persistent map from render inputs to the digest of the rendered output.
+
+    Keys are (kind, target, template inputs, source sha) tuples; the renderer
+    id is mixed into every key so that entries written by a different version
+    of the converters are never reused. Lookups are single-flight within a
+    process, and new entries are written back by save().
+    """
+
+    MAX_ENTRIES = 10000
+
+    def __init__(self, path: Path, renderer_id: str):
+        self.path = Path(path)
+        self.renderer_id = renderer_id
+        self._lock = threading.Lock()
+        self._pending = DigestTable()
+        self._digests: Dict[str, str] = {}
+        self._dirty = False
+
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                if data.get('renderer') == renderer_id:
+                    self._digests = dict(data.get('digests', {}))
+            except (OSError, json.JSONDecodeError, AttributeError):
+                self._digests = {}
+
+    def get(self, key: Tuple[str, ...], compute: Callable[[], str]) -> str:
+        """Return the rendered digest for key, computing and recording it if unknown."""
+        flat = '\x00'.join(key)
+        with self._lock:
+            digest = self._digests.get(flat)
+        if digest is not None:
+            return digest
+
+        digest = self._pending.get(flat, compute)
+        with self._lock:
+            if flat not in self._digests:
+                self._digests[flat] = digest
+                self._dirty = True
+        return digest
+
+    def save(self):
+        """Write new entries to disk, keeping the most recent MAX_ENTRIES."""
+        with self._lock:
+            if not self._dirty:
+                return
+            if len(self._digests) > self.MAX_ENTRIES:
+                keep = list(self._digests.items())[-self.MAX_ENTRIES:]
+                self._digests = dict(keep)
+            data = {'renderer': self.renderer_id, 'digests': self._digests}
+            self._dirty = False
+        try:
+            with open(self.path, 'w') as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"Warning: Could not save render cache: {e}")
+
+
 def parse_frontmatter(content: str) -> tuple[dict, str]:
     """Parse YAML frontmatter from markdown content.
 
@@ -14,7 +14,7 @@ import shutil
 import subprocess
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 class BackendError(Exception):
@@ -103,6 +103,13 @@ class FileSystemBackend(ABC):
         """Create a symlink. May raise NotImplementedError."""
         raise NotImplementedError(f"{self.__class__.__name__} does not support symlinks")
 
+    def stat_files(self, paths: List[str]) -> Dict[str, Optional[Tuple[int, int]]]:
+        """Get (size, mtime) for several files at once. May raise NotImplementedError.
+
+        Symlinks are followed. Missing files map to None.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support stat_files")
+
     @abstractmethod
     def get_location_string(self) -> str:
         """Get string representation of this location."""
@@ -189,7 +196,9 @@ class LocalBackend(FileSystemBackend):
 
     def create_symlink(self, source: str, dest: str):
         """Create a symlink from source to dest."""
-        src_path = self._resolve_path(source)
+        # Absolute sources are linked as given, not resolved, so links through
+        # a symlink (e.g. a package directory) follow it when it is re-pointed
+        src_path = Path(source) if Path(source).is_absolute() else self._resolve_path(source)
         dest_path = self._resolve_path(dest)
 
         # Ensure destination directory exists
@@ -201,6 +210,17 @@ class LocalBackend(FileSystemBackend):
 
         dest_path.symlink_to(src_path)
 
+    def stat_files(self, paths: List[str]) -> Dict[str, Optional[Tuple[int, int]]]:
+        """Get (size, mtime_ns) for several files. Missing files map to None."""
+        stats = {}
+        for path in paths:
+            try:
+                st = os.stat(self._resolve_path(path))
+                stats[path] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                stats[path] = None
+        return stats
+
     def get_location_string(self) -> str:
         """Get string representation of this location."""
         return str(self.base_path) if self.base_path else "local"
@@ -444,6 +464,31 @@ class RemoteBackend(FileSystemBackend):
                     f"{self.transfer_tool} not found. Please install it."
                 ) from None
 
+    def stat_files(self, paths: List[str]) -> Dict[str, Optional[Tuple[int, int]]]:
+        """Get (size, mtime) for several remote files in a single SSH call.
+
+        Prints one line per path, in order: GNU stat first, then BSD stat
+        (macOS), and '-' for missing files. Remote mtimes have one-second
+        resolution.
+        """
+        if not paths:
+            return {}
+
+        quoted = ' '.join(self._quote_remote_path(self._resolve_remote_path(p)) for p in paths)
+        command = (f"for f in {quoted}; do "
+                   f"stat -L -c '%s %Y' \"$f\" 2>/dev/null || stat -L -f '%z %m' \"$f\" 2>/dev/null || echo -; "
+                   f"done")
+        code, stdout, stderr = self._run_ssh_command(command, check=False)
+        lines = stdout.splitlines()
+        if code != 0 or len(lines) != len(paths):
+            raise RemoteOperationError(f"Cannot stat files on {self.ssh_target}: {stderr}")
+
+        stats = {}
+        for path, line in zip(paths, lines):
+            fields = line.split()
+            stats[path] = (int(fields[0]), int(fields[1])) if len(fields) == 2 else None
+        return stats
+
     def supports_symlinks(self) -> bool:
         """Remote backend does not support symlinks."""
         return False
@@ -455,6 +500,9 @@ class RemoteBackend(FileSystemBackend):
         return self.ssh_target
 
 
+_SSH_LOCATION_PATTERN = re.compile(r'^(?:([^@]+)@)?([^:]+):(.+)$')
+
+
 def parse_location(location: str) -> Tuple[str, FileSystemBackend]:
     """Parse location string and return (path, backend).
 
@@ -473,8 +521,7 @@ def parse_location(location: str) -> Tuple[str, FileSystemBackend]:
     """
     # Regex to match SSH format: [user@]host:path
     # Must have colon, and host part cannot be a Windows drive letter
-    ssh_pattern = r'^(?:([^@]+)@)?([^:]+):(.+)$'
-    match = re.match(ssh_pattern, location)
+    match = _SSH_LOCATION_PATTERN.match(location)
 
     if match and not _is_windows_path(location):
         # Remote SSH location
@@ -485,7 +532,14 @@ def parse_location(location: str) -> Tuple[str, FileSystemBackend]:
         return location, LocalBackend()
 
 
+def is_remote_location(location: str) -> bool:
+    """Check if a location string refers to a remote SSH location.
+
+    Same rules as parse_location, without constructing a backend.
+    """
+    return bool(_SSH_LOCATION_PATTERN.match(location)) and not _is_windows_path(location)
+
+
 def _is_windows_path(path: str) -> bool:
     """Check if path looks like a Windows path (e.g., C:/...)."""
     return bool(re.match(r'^[A-Za-z]:', path))
-
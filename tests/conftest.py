@@ -1,8 +1,10 @@
 """Pytest configuration and fixtures for Agent Warden tests."""
 
+import subprocess
 import tempfile
 from pathlib import Path
 from typing import Generator
+from unittest.mock import PropertyMock, patch
 
 import pytest
 
@@ -195,3 +197,44 @@ def sample_project_dir(temp_dir: Path) -> Path:
     project_dir = temp_dir / "test_project"
     project_dir.mkdir()
     return project_dir
+
+
+@pytest.fixture
+def package_origin(temp_dir: Path, monkeypatch):
+    """A bare package repo with two commits, tagged v1 and v2, served over file://.
+
+    Yields (work tree, git runner for the work tree, bare repo path); packages
+    installed while the fixture is active clone from the bare repo.
+    """
+    for var in ('GIT_AUTHOR_NAME', 'GIT_COMMITTER_NAME'):
+        monkeypatch.setenv(var, 'Test')
+    for var in ('GIT_AUTHOR_EMAIL', 'GIT_COMMITTER_EMAIL'):
+        monkeypatch.setenv(var, 'test@example.com')
+
+    work = temp_dir / "origin-work"
+    (work / "rules").mkdir(parents=True)
+    (work / "commands").mkdir()
+    (work / "docs").mkdir()
+
+    def git(*args, cwd=work):
+        subprocess.run(['git'] + list(args), cwd=cwd, check=True, capture_output=True)
+
+    git('init', '-q', '-b', 'main')
+    (work / "rules" / "style.md").write_text("# Style v1\n")
+    (work / "commands" / "review.md").write_text("# Review\n")
+    (work / "docs" / "big.md").write_text("x" * 10000)
+    git('add', '-A')
+    git('commit', '-q', '-m', 'first')
+    git('tag', 'v1')
+    (work / "rules" / "style.md").write_text("# Style v2\n")
+    git('commit', '-q', '-am', 'second')
+    git('tag', 'v2')
+
+    bare = temp_dir / "origin.git"
+    git('clone', '-q', '--bare', str(work), str(bare), cwd=temp_dir)
+    git('config', 'uploadpack.allowFilter', 'true', cwd=bare)
+
+    # file:// so git honours --depth and --filter for a local remote
+    with patch.object(GitHubPackage, 'github_url', new_callable=PropertyMock,
+                      return_value=bare.as_uri()):
+        yield work, git, bare
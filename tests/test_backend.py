@@ -214,6 +214,17 @@ class TestLocalBackend:
         assert dest.read_text() == "test content"
 
 
+    def test_stat_files(self, tmp_path):
+        """Test stat_files reports size and mtime, and None for missing files."""
+        backend = LocalBackend(str(tmp_path))
+        (tmp_path / "a.txt").write_text("hello")
+
+        stats = backend.stat_files(["a.txt", "missing.txt"])
+
+        assert stats["a.txt"][0] == 5
+        assert stats["missing.txt"] is None
+
+
 class TestRemoteBackend:
     """Tests for RemoteBackend."""
 
@@ -408,6 +419,17 @@ class TestRemoteBackend:
 
         assert checksum == expected_checksum
 
+    @patch('subprocess.run')
+    def test_stat_files_single_call(self, mock_run):
+        """Test that remote stat_files uses one SSH call for all paths."""
+        mock_run.return_value = Mock(returncode=0, stdout="12 1700000000\n-\n", stderr="")
+
+        backend = RemoteBackend(host="server.com", path="/remote")
+        stats = backend.stat_files(["a.md", "b.md"])
+
+        assert stats == {"a.md": (12, 1700000000), "b.md": None}
+        assert mock_run.call_count == 1
+
     def test_supports_symlinks(self):
         """Test that remote backend does not support symlinks."""
         backend = RemoteBackend(host="server.com")
@@ -8,6 +8,7 @@ Targets uncovered lines:
 - Lines 3001-3003: no command handling
 """
 
+import json
 import os
 from unittest.mock import MagicMock, patch
 
@@ -26,7 +27,7 @@ class TestMainCommandRouting:
         mock_updater.return_value = mock_updater_instance
 
         mock_manager_instance = MagicMock()
-        mock_manager_instance.check_all_projects_status.return_value = {}
+        mock_manager_instance.iter_all_projects_status.return_value = iter([])
         mock_manager_instance.config.config.get.return_value = True
         mock_manager.return_value = mock_manager_instance
 
@@ -34,8 +35,32 @@ class TestMainCommandRouting:
             result = main()
             # Should run status command successfully
             assert result is None or result == 0
-            # Verify check_all_projects_status was called
-            mock_manager_instance.check_all_projects_status.assert_called_once()
+            # Verify iter_all_projects_status was called
+            mock_manager_instance.iter_all_projects_status.assert_called_once()
+
+    @patch('warden.WardenManager')
+    @patch('warden.AutoUpdater')
+    def test_status_ndjson_format(self, mock_updater, mock_manager, capsys):
+        """Test that --format ndjson prints one JSON object per project."""
+        mock_updater_instance = MagicMock()
+        mock_updater_instance.should_check_for_updates.return_value = False
+        mock_updater.return_value = mock_updater_instance
+
+        mock_manager_instance = MagicMock()
+        mock_manager_instance.iter_all_projects_status.return_value = iter([
+            ('clean-project', None),
+            ('broken-project', {'error': 'Connection refused'}),
+        ])
+        mock_manager.return_value = mock_manager_instance
+
+        with patch('sys.argv', ['warden', '--format', 'ndjson']):
+            assert main() == 0
+
+        lines = capsys.readouterr().out.splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [(r['project'], r['state']) for r in records] == [
+            ('clean-project', 'clean'), ('broken-project', 'error')
+        ]
 
     @patch('warden.WardenManager')
     @patch('warden.AutoUpdater')
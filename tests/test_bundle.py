@@ -0,0 +1,194 @@
+"""Tests for offline package bundles."""
+
+import io
+import json
+import shutil
+import tarfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from warden import WardenError, WardenManager
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git not installed")
+
+NETWORK_COMMANDS = {'clone', 'fetch', 'pull', 'ls-remote', 'submodule'}
+
+
+@pytest.fixture
+def offline_manager(temp_dir: Path) -> WardenManager:
+    """A second Agent Warden home, standing in for a host without GitHub access."""
+    home = temp_dir / "offline"
+    (home / "rules").mkdir(parents=True)
+    (home / "rules" / "mdc.md").write_text("# Rule format\n")
+    return WardenManager(base_path=home)
+
+
+@pytest.fixture
+def bundle(manager: WardenManager, temp_dir: Path, package_origin) -> Path:
+    manager.install_package("team/rules@main")
+    output = temp_dir / "packages.tar.gz"
+    assert manager.export_bundle(output) == ["team/rules"]
+    return output
+
+
+def _git_commands(manager: WardenManager):
+    """Patch the manager's git runner to record the git subcommands it runs."""
+    commands = []
+    run = manager._run_git_command
+
+    def recording_run(args, cwd=None):
+        commands.append(args[0])
+        return run(args, cwd=cwd)
+
+    return commands, patch.object(manager, '_run_git_command', side_effect=recording_run)
+
+
+class TestBundles:
+    """Test exporting and importing package bundles."""
+
+    def test_round_trip_without_network(self, manager: WardenManager, offline_manager: WardenManager, bundle: Path):
+        """Test that an imported package is installed at the exported commit without contacting a remote."""
+        exported = manager.config.registry['packages']['team/rules']
+
+        commands, patcher = _git_commands(offline_manager)
+        with patcher, patch.object(Path, 'rglob', side_effect=AssertionError("package tree walked")):
+            assert offline_manager.import_bundle(bundle) == ["team/rules"]
+        assert not NETWORK_COMMANDS & set(commands)
+
+        imported = offline_manager.config.registry['packages']['team/rules']
+        assert imported['installed_ref'] == exported['installed_ref']
+        assert imported['content'] == {'rules': ['style'], 'commands': ['review']}
+        assert 'remote_ref' not in imported
+
+        package_dir = offline_manager.config.packages_path / "team-rules"
+        assert (package_dir / "rules" / "style.md").read_text() == "# Style v2\n"
+        code, head, _ = offline_manager._run_git_command(
+            ['rev-parse', 'HEAD'], cwd=offline_manager.config.packages_path / ".repos" / "team-rules")
+        assert head == exported['installed_ref']
+
+        # The registry was written, and no staging directories are left behind
+        offline_manager.config.reload_registry()
+        assert "team/rules" in offline_manager.config.registry['packages']
+        assert [p.name for p in offline_manager.config.packages_path.iterdir()
+                if p.name.startswith('.bundle-')] == []
+
+    def test_installed_packages_need_force(self, offline_manager: WardenManager, bundle: Path):
+        """Test that importing over an installed package requires --force."""
+        offline_manager.import_bundle(bundle)
+        marker = offline_manager.config.packages_path / ".repos" / "team-rules" / "local.txt"
+        marker.write_text("local change")
+
+        assert offline_manager.import_bundle(bundle) == []
+        assert marker.exists()
+
+        assert offline_manager.import_bundle(bundle, force=True) == ["team/rules"]
+        assert not marker.exists()
+
+    def test_unsafe_members_are_skipped(self, offline_manager: WardenManager, temp_dir: Path, bundle: Path):
+        """Test that members escaping the packages directory are not extracted."""
+        evil = temp_dir / "evil.tar.gz"
+        with tarfile.open(bundle, 'r:gz') as src, tarfile.open(evil, 'w:gz') as dst:
+            for member in src.getmembers():
+                dst.addfile(member, src.extractfile(member) if member.isfile() else None)
+            for name in ("packages/team-rules/../../escaped.txt", "/tmp/absolute.txt", "elsewhere/file.txt"):
+                info = tarfile.TarInfo(name)
+                info.size = 3
+                dst.addfile(info, io.BytesIO(b"bad"))
+
+        assert offline_manager.import_bundle(evil) == ["team/rules"]
+        assert not (offline_manager.config.packages_path.parent / "escaped.txt").exists()
+        assert not (offline_manager.config.packages_path / "elsewhere").exists()
+
+    def test_hooks_and_host_settings_stay_behind(self, manager: WardenManager, temp_dir: Path, package_origin):
+        """Test that exported git dirs carry no hooks and only portable config."""
+        manager.install_package("team/rules@main")
+        repo_dir = manager.config.packages_path / ".repos" / "team-rules"
+        (repo_dir / ".git" / "hooks" / "post-checkout").write_text("#!/bin/sh\necho hi\n")
+        manager._run_git_command(['config', 'core.sshCommand', 'ssh -i ~/.ssh/deploy'], cwd=repo_dir)
+
+        output = temp_dir / "packages.tar.gz"
+        manager.export_bundle(output)
+        with tarfile.open(output, 'r:gz') as tar:
+            names = tar.getnames()
+            config = tar.extractfile("packages/team-rules/.git/config").read().decode()
+
+        assert not [name for name in names if name.startswith("packages/team-rules/.git/hooks")]
+        assert "sshCommand" not in config
+        assert "url" not in config
+
+    def test_hostile_git_dir_is_neutralised(self, offline_manager: WardenManager, temp_dir: Path,
+                                            bundle: Path, package_origin):
+        """Test that hooks, commondir and config settings in a crafted bundle never reach the checkout."""
+        marker = temp_dir / "pwned"
+        evil_config = f"[core]\n\tfsmonitor = touch {marker}\n[remote \"origin\"]\n\turl = ext::sh\n".encode()
+        extra = {
+            "packages/team-rules/.git/hooks/post-checkout": b"#!/bin/sh\ntouch " + str(marker).encode() + b"\n",
+            "packages/team-rules/.git/commondir": b"../../elsewhere/.git\n",
+        }
+
+        evil = temp_dir / "evil.tar.gz"
+        with tarfile.open(bundle, 'r:gz') as src, tarfile.open(evil, 'w:gz') as dst:
+            for member in src.getmembers():
+                data = src.extractfile(member) if member.isfile() else None
+                if member.name == "packages/team-rules/.git/config":
+                    member.size = len(evil_config)
+                    data = io.BytesIO(evil_config)
+                dst.addfile(member, data)
+            for name, data in extra.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mode = 0o755
+                dst.addfile(info, io.BytesIO(data))
+
+        assert offline_manager.import_bundle(evil) == ["team/rules"]
+
+        repo_dir = offline_manager.config.packages_path / ".repos" / "team-rules"
+        assert not (repo_dir / ".git" / "hooks" / "post-checkout").exists()
+        assert not (repo_dir / ".git" / "commondir").exists()
+        config = (repo_dir / ".git" / "config").read_text()
+        assert "fsmonitor" not in config and "ext::" not in config
+        _, url, _ = offline_manager._run_git_command(['config', 'remote.origin.url'], cwd=repo_dir)
+        assert url == package_origin[2].as_uri()
+
+        offline_manager._run_git_command(['status'], cwd=repo_dir)
+        offline_manager._run_git_command(['checkout', '-q', 'HEAD~0'], cwd=repo_dir)
+        assert not marker.exists()
+
+    @pytest.mark.parametrize('clone', ['full', 'shallow', 'sparse'])
+    def test_imported_checkout_can_update(self, manager: WardenManager, offline_manager: WardenManager,
+                                          temp_dir: Path, package_origin, clone: str):
+        """Test that the rebuilt git config keeps every clone strategy updatable."""
+        work, git, bare = package_origin
+        manager.install_package("team/rules", clone=clone)
+        output = temp_dir / "packages.tar.gz"
+        manager.export_bundle(output)
+        offline_manager.import_bundle(output)
+
+        (work / "rules" / "style.md").write_text("# Style v3\n")
+        git('commit', '-q', '-am', 'third')
+        git('push', '-q', str(bare), 'main')
+        offline_manager.update_package("team/rules")
+
+        package_dir = offline_manager.config.packages_path / "team-rules"
+        assert (package_dir / "rules" / "style.md").read_text() == "# Style v3\n"
+        repo_dir = offline_manager.config.packages_path / ".repos" / "team-rules"
+        assert (repo_dir / "docs").exists() == (clone != 'sparse')
+
+    def test_not_a_bundle(self, offline_manager: WardenManager, temp_dir: Path):
+        """Test that an archive without a manifest is rejected."""
+        archive = temp_dir / "other.tar.gz"
+        with tarfile.open(archive, 'w:gz') as tar:
+            data = json.dumps({}).encode()
+            info = tarfile.TarInfo("other.json")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+        with pytest.raises(WardenError, match="not an Agent Warden bundle"):
+            offline_manager.import_bundle(archive)
+
+    def test_export_unknown_package(self, manager: WardenManager, temp_dir: Path):
+        """Test that exporting a package that isn't installed fails."""
+        with pytest.raises(WardenError, match="not found"):
+            manager.export_bundle(temp_dir / "out.tar.gz", ["no/such"])
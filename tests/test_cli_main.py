@@ -53,6 +53,27 @@ class TestCLIStatus:
 
         assert result is None or result == 0
 
+    def test_status_specific_project_fast_skips_hashing(self, manager, sample_project_dir):
+        """Test that 'warden <project-name> --fast' trusts unchanged files instead of hashing them."""
+        from fs_backend import LocalBackend
+
+        project = manager.install_project(
+            sample_project_dir,
+            'augment',
+            use_copy=True,
+            rule_names=['test-rule']
+        )
+
+        for argv, expected_hashes in ((['warden', project.name], 1), (['warden', project.name, '--fast'], 0)):
+            with patch('sys.argv', argv), \
+                    patch('warden.WardenManager', return_value=manager), \
+                    patch.object(LocalBackend, 'checksum', autospec=True,
+                                 side_effect=LocalBackend.checksum) as checksum:
+                result = main()
+
+            assert result is None or result == 0
+            assert checksum.call_count == expected_hashes
+
     def test_warden_without_args_shows_status(self, manager, sample_project_dir, capsys):
         """Test that 'warden' without arguments shows status for all projects."""
         # Create a project
@@ -1,7 +1,10 @@
 """Tests for WardenConfig class."""
 
+import json
 from pathlib import Path
 
+import pytest
+
 from warden import WardenConfig
 
 
@@ -120,3 +123,131 @@ class TestWardenConfig:
         assert target_config['rules_path'] == '.newtarget/rules/'
         assert target_config['commands_path'] == '.newtarget/commands/'
         assert target_config['supports_commands'] is True
+
+    def test_transaction_coalesces_saves(self, config: WardenConfig):
+        """Test that saves inside a transaction are written once on exit."""
+        with config.transaction():
+            with config.transaction():
+                config.state['projects']['p'] = {'name': 'p', 'path': '/tmp/p'}
+                config.save_state()
+            config.save_state()
+            assert not config.state_path.exists()
+
+        assert 'p' in json.loads(config.state_path.read_text())['projects']
+
+    def test_transaction_without_changes_writes_nothing(self, config: WardenConfig):
+        """Test that a transaction with no save requests touches no files."""
+        with config.transaction():
+            pass
+
+        assert not config.state_path.exists()
+        assert not config.registry_path.exists()
+
+    def test_transaction_flushes_on_error(self, config: WardenConfig):
+        """Test that pending saves are still written if the block raises."""
+        with pytest.raises(ValueError):
+            with config.transaction():
+                config.registry['packages']['x'] = {}
+                config.save_registry()
+                raise ValueError("boom")
+
+        assert 'x' in json.loads(config.registry_path.read_text())['packages']
+
+
+class TestStateJournal:
+    """Test cases for journal mode (state_journal)."""
+
+    def _journal_config(self, temp_dir: Path) -> WardenConfig:
+        config = WardenConfig(temp_dir)
+        config.config['state_journal'] = True
+        return config
+
+    def _put(self, config: WardenConfig, name: str, **extra):
+        config.state['projects'][name] = {'name': name, 'path': f'/srv/{name}', **extra}
+        config.mark_project_changed(name)
+
+    def test_changes_are_appended_and_replayed(self, temp_dir: Path):
+        """Test that tracked changes go to the journal and survive a reload."""
+        config = self._journal_config(temp_dir)
+        self._put(config, 'a')
+        config.save_state()
+        self._put(config, 'b')
+        config.save_state()
+        del config.state['projects']['a']
+        config.mark_project_changed('a')
+        config.save_state()
+
+        assert not config.state_path.exists()
+        assert len(config.journal_path.read_text().splitlines()) == 3
+
+        reloaded = WardenConfig(temp_dir)
+        assert list(reloaded.state['projects']) == ['b']
+
+    def test_truncated_last_record_is_ignored(self, temp_dir: Path):
+        """Test that a partially written record does not break loading."""
+        config = self._journal_config(temp_dir)
+        self._put(config, 'a')
+        config.save_state()
+        with open(config.journal_path, 'a') as f:
+            f.write('{"op": "put", "project": "b", "da')
+
+        reloaded = WardenConfig(temp_dir)
+        assert list(reloaded.state['projects']) == ['a']
+
+    def test_top_level_keys_are_journaled(self, temp_dir: Path):
+        """Test that top-level state such as last_update_check survives a journaled save."""
+        config = self._journal_config(temp_dir)
+        self._put(config, 'a')
+        config.save_state()
+        config.state['last_update_check'] = '2026-01-01T00:00:00'
+        self._put(config, 'b')
+        config.save_state()
+
+        assert not config.state_path.exists()
+        reloaded = WardenConfig(temp_dir)
+        assert reloaded.state['last_update_check'] == '2026-01-01T00:00:00'
+        assert sorted(reloaded.state['projects']) == ['a', 'b']
+
+        config.state['last_update_check'] = '2026-02-01T00:00:00'
+        config.save_state()
+        del config.state['last_update_check']
+        config.save_state()
+
+        assert not config.state_path.exists()
+        assert 'last_update_check' not in WardenConfig(temp_dir).state
+
+    def test_untracked_save_writes_snapshot(self, temp_dir: Path):
+        """Test that saving without tracked changes folds the journal into a snapshot."""
+        config = self._journal_config(temp_dir)
+        self._put(config, 'a')
+        config.save_state()
+
+        config.state['projects']['a']['path'] = '/srv/elsewhere'
+        config.save_state()
+
+        assert not config.journal_path.exists()
+        assert json.loads(config.state_path.read_text())['projects']['a']['path'] == '/srv/elsewhere'
+
+    def test_journal_is_compacted_past_threshold(self, temp_dir: Path):
+        """Test that the journal is folded into the snapshot once it grows too large."""
+        config = self._journal_config(temp_dir)
+        config.JOURNAL_COMPACT_BYTES = 512
+        for i in range(20):
+            self._put(config, f'p{i}', padding='x' * 64)
+            config.save_state()
+
+        assert config.state_path.exists()
+        reloaded = WardenConfig(temp_dir)
+        assert len(reloaded.state['projects']) == 20
+
+    def test_manager_mutations_are_journaled(self, manager, sample_project_dir: Path):
+        """Test that manager writes go through the journal when enabled."""
+        manager.config.config['state_journal'] = True
+        old_name = manager.install_project(sample_project_dir, 'augment', rule_names=['test-rule']).name
+        manager.rename_project(old_name, 'renamed')
+
+        records = [json.loads(line) for line in manager.config.journal_path.read_text().splitlines()]
+        assert {'op': 'del', 'project': old_name} in records
+
+        reloaded = WardenConfig(manager.config.base_path)
+        assert list(reloaded.state['projects']) == ['renamed']
@@ -0,0 +1,109 @@
+"""Tests for the per-commit package content index."""
+
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from agent_warden.content_index import PackageContentIndex
+from warden import WardenManager
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git not installed")
+
+
+def _head(repo: Path) -> str:
+    return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=repo, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def _commit_changes(work: Path, git):
+    """Modify, add and delete content in the origin work tree and commit."""
+    (work / "rules" / "style.md").write_text(
+        "---\ndescription: House style\nglobs: ['**/*.py']\nalwaysApply: true\n---\n# Style v3\n")
+    (work / "rules" / "mdc.md").write_text("# Rule format\n")
+    (work / "commands" / "ship.md").write_text(
+        "---\ndescription: Ship a release\nargument-hint: <version>\ntags: [release]\n---\nShip it.\n")
+    (work / "commands" / "review.md").unlink()
+    git('add', '-A')
+    git('commit', '-q', '-m', 'third')
+
+
+class TestPackageContentIndex:
+    """Test building indexes from git objects."""
+
+    def test_full_build(self, temp_dir: Path, package_origin):
+        """Test that an index records every rule and command of a commit."""
+        work, _, _ = package_origin
+        index = PackageContentIndex(temp_dir / "index").build(work, 'team-rules', _head(work))
+
+        assert sorted(index['items']) == ['commands/review.md', 'rules/style.md']
+        style = index['items']['rules/style.md']
+        assert style['size'] == len("# Style v2\n")
+        assert len(style['digest']) == 40
+        assert PackageContentIndex.content(index) == {'rules': ['style'], 'commands': ['review']}
+
+    def test_incremental_build_reads_only_changed_files(self, temp_dir: Path, package_origin):
+        """Test that a new commit's index is derived from the old one plus a diff."""
+        work, git, _ = package_origin
+        content_index = PackageContentIndex(temp_dir / "index")
+        old = _head(work)
+        content_index.build(work, 'team-rules', old)
+
+        _commit_changes(work, git)
+        new = _head(work)
+        with patch.object(content_index, '_read_items', wraps=content_index._read_items) as read_items:
+            index = content_index.build(work, 'team-rules', new, base_commit=old)
+
+        assert sorted(read_items.call_args.args[2]) == ['commands/ship.md', 'rules/mdc.md', 'rules/style.md']
+        assert index['items']['rules/style.md']['description'] == "House style"
+        assert index['items']['rules/style.md']['always_apply'] is True
+        assert index['items']['commands/ship.md']['argument_hint'] == "<version>"
+        assert PackageContentIndex.content(index) == {'rules': ['style'], 'commands': ['ship']}
+
+        # Same result as indexing the commit from scratch
+        fresh = PackageContentIndex(temp_dir / "fresh").build(work, 'team-rules', new)
+        assert fresh['items'] == index['items']
+
+    def test_index_persists(self, temp_dir: Path, package_origin):
+        """Test that a built index is loaded from disk by a new instance."""
+        work, _, _ = package_origin
+        PackageContentIndex(temp_dir / "index").build(work, 'team-rules', _head(work))
+
+        reloaded = PackageContentIndex(temp_dir / "index").load('team-rules', _head(work))
+        assert 'rules/style.md' in reloaded['items']
+
+
+class TestManagerUsesIndex:
+    """Test that package discovery, search and info read the index."""
+
+    def test_update_search_and_info_without_walking(self, manager: WardenManager, package_origin):
+        """Test that update, search and command info never scan the package tree."""
+        work, git, bare = package_origin
+        manager.install_package("team/rules@main")
+        _commit_changes(work, git)
+        git('push', '-q', str(bare), 'main')
+
+        packages_path = manager.config.packages_path
+        rglob = Path.rglob
+
+        def guarded_rglob(path, pattern):
+            assert packages_path not in [path, *path.parents], f"package tree walked: {path}"
+            return rglob(path, pattern)
+
+        with patch.object(Path, 'rglob', guarded_rglob):
+            manager.update_package("team/rules")
+            assert manager.config.registry['packages']['team/rules']['content'] == {
+                'rules': ['style'], 'commands': ['ship']
+            }
+
+            # Matches the description, not the name
+            assert manager.search_packages("release")['commands'] == ['team/rules:ship']
+
+            info = manager.get_command_info("team/rules:ship", include_content=False)
+            assert info['description'] == "Ship a release"
+            assert info['argument_hint'] == "<version>"
+            assert info['tags'] == ['release']
+
+        assert manager.get_command_info("team/rules:ship")['content'] == "Ship it."
@@ -1,8 +1,11 @@
 """Tests for install to all projects functionality."""
 
+import threading
+from unittest.mock import patch
 
 import pytest
 
+from agent_warden.hal import convert_rule_format
 from warden import WardenError, WardenManager
 
 
@@ -165,6 +168,20 @@ class TestInstallToAllProjects:
         assert len(summary['installed']) == 3
         assert len(summary['errors']) == 0
 
+    def test_install_to_all_projects_prints_on_calling_thread(self, manager, multiple_projects):
+        """Test that per-project messages are printed by the calling thread, not by workers."""
+        printed = []
+
+        def record(*args, **kwargs):
+            printed.append((threading.current_thread(), ' '.join(map(str, args))))
+
+        with patch('builtins.print', side_effect=record):
+            manager.install_to_all_projects(rule_names=['rule1'], skip_confirm=True)
+
+        skipped = [thread for thread, text in printed if 'already installed' in text]
+        assert len(skipped) == 3
+        assert all(thread is threading.current_thread() for thread in skipped)
+
     def test_install_to_all_projects_partial_failure(self, manager, tmp_path):
         """Test that installation continues even if one project fails."""
         # Create two valid projects
@@ -240,3 +257,40 @@ class TestInstallToAllProjects:
             assert 'rule2' in items['rules']
             assert 'rule3' in items['rules']
 
+
+    def test_install_to_all_projects_writes_state_once(self, manager, multiple_projects):
+        """Test that the state file is written once for the whole rollout."""
+        with patch.object(manager.config, '_write_state', wraps=manager.config._write_state) as write:
+            manager.install_to_all_projects(rule_names=['rule2'], skip_confirm=True)
+
+        assert write.call_count == 1
+        reloaded = WardenManager(manager.config.base_path)
+        for project in multiple_projects:
+            rules = reloaded.config.state['projects'][project.name]['targets']['augment']['installed_rules']
+            assert 'rule2' in [r['name'] for r in rules]
+
+    def test_install_to_all_projects_renders_each_item_once(self, manager, tmp_path):
+        """Test that a rule is rendered once per target, not once per project."""
+        for i in range(4):
+            project_path = tmp_path / f"cursor{i}"
+            project_path.mkdir()
+            manager.install_project(project_path, target='cursor', use_copy=True, rule_names=['rule1'])
+
+        with patch('agent_warden.manager.convert_rule_format',
+                   wraps=convert_rule_format) as convert:
+            summary = manager.install_to_all_projects(rule_names=['rule2'], skip_confirm=True)
+
+        assert len(summary['installed']) == 4
+        assert convert.call_count == 1
+        for i in range(4):
+            installed = tmp_path / f"cursor{i}" / '.cursor' / 'rules' / 'rule2.mdc'
+            assert installed.exists() and not installed.is_symlink()
+        assert manager._stage_dir is None
+
+    def test_install_to_all_projects_missing_item_writes_nothing(self, manager, multiple_projects):
+        """Test that an unknown item fails a project before any file is written."""
+        summary = manager.install_to_all_projects(rule_names=['rule2', 'no-such-rule'], skip_confirm=True)
+
+        assert len(summary['errors']) == len(multiple_projects)
+        for project in multiple_projects:
+            assert not (project.path / '.augment' / 'rules' / 'rule2.md').exists()
@@ -0,0 +1,116 @@
+"""Tests for the reverse installation index."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from agent_warden.index import InstallationIndex
+from agent_warden.manager import WardenManager
+
+
+class TestInstallationIndex:
+    """Test the rule/command -> installations index."""
+
+    def test_lookup_after_install(self, manager, sample_project_dir: Path):
+        """Test that installed rules and commands can be looked up by name."""
+        project = manager.install_project(
+            sample_project_dir, 'augment', rule_names=['test-rule'],
+            install_commands=True, command_names=['test-command']
+        )
+
+        rules = manager.get_item_installations('test-rule', 'rule')
+        commands = manager.get_item_installations('test-command', 'command')
+
+        assert [(i['project'], i['target']) for i in rules] == [(project.name, 'augment')]
+        assert rules[0]['full_path'] == str(project.path / '.augment' / 'rules' / 'test-rule.md')
+        assert commands[0]['full_path'] == str(project.path / '.augment' / 'commands' / 'test-command.md')
+        assert manager.get_item_installations('rule1', 'rule') == []
+
+    def test_index_follows_add_remove_and_rename(self, manager, sample_project_dir: Path):
+        """Test that the index is kept current by project mutations."""
+        project = manager.install_project(sample_project_dir, 'augment', rule_names=['test-rule'])
+        manager.get_rule_installations()  # load the index
+
+        manager.add_to_project(project.name, rule_names=['rule1'])
+        assert len(manager.get_item_installations('rule1')) == 1
+
+        manager.remove_from_project(project.name, rule_names=['test-rule'], skip_confirm=True)
+        assert manager.get_item_installations('test-rule') == []
+
+        manager.rename_project(project.name, 'renamed')
+        assert [i['project'] for i in manager.get_item_installations('rule1')] == ['renamed']
+
+        manager.untrack_project('renamed', skip_confirm=True)
+        assert manager.get_item_installations('rule1') == []
+
+    def test_index_is_persisted_and_resynced(self, manager, sample_project_dir: Path):
+        """Test that a new manager reuses the index file and notices state edits."""
+        project = manager.install_project(sample_project_dir, 'augment', rule_names=['test-rule'])
+        manager.get_rule_installations()
+
+        index_path = manager.config.base_path / manager.config.INDEX_FILE
+        assert project.name in json.loads(index_path.read_text())['projects']
+
+        # Edit the state file behind the index's back
+        manager.config.state['projects'][project.name]['path'] = 'user@server.com:/srv/app'
+        manager.config.save_state()
+
+        fresh = WardenManager(manager.config.base_path)
+        installs = fresh.get_item_installations('test-rule')
+        assert len(installs) == 1
+        assert installs[0]['is_remote'] is True
+
+    def test_corrupt_index_is_rebuilt(self, manager, sample_project_dir: Path):
+        """Test that an unreadable index file is rebuilt from state."""
+        manager.install_project(sample_project_dir, 'augment', rule_names=['test-rule'])
+        (manager.config.base_path / manager.config.INDEX_FILE).write_text("{not json")
+
+        fresh = WardenManager(manager.config.base_path)
+        assert len(fresh.get_item_installations('test-rule')) == 1
+
+    def test_index_is_saved_with_state(self, manager, sample_project_dir: Path):
+        """Test that changes made after loading reach the index file, so the next manager needn't reindex."""
+        project = manager.install_project(sample_project_dir, 'augment', rule_names=['test-rule'])
+        manager.get_rule_installations()  # load the index
+
+        manager.add_to_project(project.name, rule_names=['rule1'])
+        manager.remove_from_project(project.name, rule_names=['test-rule'], skip_confirm=True)
+
+        with patch.object(InstallationIndex, 'update_project', autospec=True) as reindex:
+            fresh = WardenManager(manager.config.base_path)
+            installs = fresh.get_item_installations('rule1')
+
+        assert reindex.call_count == 0
+        assert [i['project'] for i in installs] == [project.name]
+        assert fresh.get_item_installations('test-rule') == []
+
+    def test_lookups_do_not_resync(self, manager, sample_project_dir: Path):
+        """Test that the index is synced with state once per manager, not per lookup."""
+        manager.install_project(sample_project_dir, 'augment', rule_names=['test-rule'])
+
+        with patch.object(InstallationIndex, 'sync', autospec=True, return_value=False) as sync:
+            fresh = WardenManager(manager.config.base_path)
+            fresh.get_item_installations('test-rule')
+            fresh.get_item_installations('rule1')
+            fresh.get_rule_installations()
+
+        assert sync.call_count == 1
+
+    def test_update_item_installations(self, manager, temp_dir: Path):
+        """Test that a changed rule is pushed to the projects that have it, and only those are read."""
+        projects = []
+        for name, rules in (('one', ['test-rule']), ('two', ['test-rule', 'rule1']), ('other', ['rule1'])):
+            project_dir = temp_dir / name
+            project_dir.mkdir()
+            projects.append(manager.install_project(project_dir, 'augment', use_copy=True, rule_names=rules))
+
+        (manager.config.rules_dir / 'test-rule.md').write_text("# Test Rule\n\nChanged.\n")
+
+        with patch.object(manager, 'check_project_status', wraps=manager.check_project_status) as check:
+            summary = manager.update_item_installations(rule_names=['test-rule'])
+
+        assert [name for name, _ in summary['updated']] == ['one', 'two']
+        assert all(items['rules'] == ['test-rule'] for _, items in summary['updated'])
+        assert {call.args[0] for call in check.call_args_list} <= {'one', 'two'}
+        for project in projects[:2]:
+            assert "Changed." in (project.path / '.augment' / 'rules' / 'test-rule.md').read_text()
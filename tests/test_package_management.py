@@ -1,5 +1,7 @@
 """Tests for GitHub package management functionality."""
 
+import shutil
+import subprocess
 from pathlib import Path
 from unittest.mock import patch
 
@@ -52,7 +54,7 @@ class TestPackageManagement:
         mock_git.assert_any_call([
             'submodule', 'add', '-b', 'v1.0.0',
             'https://github.com/testuser/testrepo.git',
-            str(package_dir)
+            str(manager.config.packages_path / ".repos" / "testuser-testrepo")
         ], cwd=manager.config.base_path)
 
     @patch('warden.WardenManager._run_git_command')
@@ -183,8 +185,7 @@ class TestPackageManagement:
         package_dir.mkdir(parents=True)
 
         mock_git.side_effect = [
-            (0, "", ""),  # fetch
-            (0, "def456", ""),  # rev-parse origin/main
+            (0, "def456\trefs/heads/main", ""),  # ls-remote origin main main^{}
             (0, "5", ""),  # rev-list --count
         ]
 
@@ -194,3 +195,254 @@ class TestPackageManagement:
         assert updates["testuser/testrepo"]["current"] == "abc123"[:8]
         assert updates["testuser/testrepo"]["latest"] == "def456"[:8]
         assert updates["testuser/testrepo"]["commits_behind"] == 5
+        assert mock_git.call_args_list[0].args[0][0] == 'ls-remote'
+        assert manager.config.registry['packages']['testuser/testrepo']['remote_ref'] == "def456"
+
+    def _add_packages(self, manager: WardenManager, names, ref='main'):
+        for name in names:
+            owner, repo = name.split('/')
+            manager.config.registry['packages'][name] = {
+                'owner': owner, 'repo': repo, 'ref': ref,
+                'installed_ref': 'abc123', 'installed_at': '2024-01-01T00:00:00'
+            }
+            (manager.config.packages_path / f"{owner}-{repo}").mkdir(parents=True)
+
+    def test_get_package_status_probes_in_parallel(self, manager: WardenManager):
+        """Test that remotes are queried concurrently and reported in registry order."""
+        import shutil
+        import threading
+
+        names = ['team/alpha', 'team/beta', 'team/gamma', 'team/delta', 'team/gone']
+        self._add_packages(manager, names)
+        shutil.rmtree(manager.config.packages_path / 'team-gone')
+
+        # Every probe waits for the other three, so this only passes if they overlap
+        barrier = threading.Barrier(4, timeout=5)
+
+        def git(args, cwd=None):
+            assert args[0] == 'ls-remote'
+            barrier.wait()
+            if cwd.name == 'team-gamma':
+                return (128, "", "network down")
+            return (0, f"{'def456' if cwd.name == 'team-alpha' else 'abc123'}\trefs/heads/main", "")
+
+        with patch.object(manager, '_run_git_command', side_effect=git):
+            status = manager.get_package_status()
+
+        assert list(status) == names
+        assert status == {
+            'team/alpha': 'outdated',
+            'team/beta': 'up-to-date',
+            'team/gamma': 'error',
+            'team/delta': 'up-to-date',
+            'team/gone': 'missing',
+        }
+
+    def test_remote_refs_reused_within_ttl(self, manager: WardenManager):
+        """Test that a recently probed ref is reused until it expires or max_age=0."""
+        self._add_packages(manager, ['team/alpha'])
+
+        with patch.object(manager, '_run_git_command', return_value=(0, "def456\trefs/heads/main", "")) as git:
+            assert manager.get_package_status() == {'team/alpha': 'outdated'}
+            assert manager.get_package_status() == {'team/alpha': 'outdated'}
+            assert git.call_count == 1
+
+            manager.get_package_status(max_age=0)
+            assert git.call_count == 2
+
+        # Persisted, so a new process reuses it too
+        reloaded = WardenManager(base_path=manager.config.base_path)
+        with patch.object(reloaded, '_run_git_command') as git:
+            assert reloaded.get_package_status() == {'team/alpha': 'outdated'}
+            git.assert_not_called()
+
+    def test_probe_prefers_peeled_tag_commit(self, manager: WardenManager):
+        """Test that an annotated tag resolves to the commit it points to."""
+        self._add_packages(manager, ['team/alpha'], ref='v1.0.0')
+        listing = "0410d1\trefs/tags/v1.0.0\nabc123\trefs/tags/v1.0.0^{}"
+
+        with patch.object(manager, '_run_git_command', return_value=(0, listing, "")):
+            assert manager.get_package_status() == {'team/alpha': 'up-to-date'}
+
+    def test_check_package_updates_unfetched_commits(self, manager: WardenManager):
+        """Test that commits_behind is unknown until the new commits are fetched."""
+        self._add_packages(manager, ['team/alpha'])
+
+        with patch.object(manager, '_run_git_command', side_effect=[
+            (0, "def456\trefs/heads/main", ""),  # ls-remote
+            (128, "", "fatal: bad revision"),  # rev-list --count
+        ]):
+            updates = manager.check_package_updates()
+
+        assert updates['team/alpha']['commits_behind'] is None
+
+    def test_show_package_diff_skips_fetch_when_up_to_date(self, manager: WardenManager):
+        """Test that --diff doesn't download anything when origin hasn't moved."""
+        self._add_packages(manager, ['team/alpha'])
+
+        with patch.object(manager, '_run_git_command', return_value=(0, "abc123\trefs/heads/main", "")) as git:
+            assert manager.show_package_diff('team/alpha') == "Package team/alpha is up to date"
+
+        assert [call.args[0][0] for call in git.call_args_list] == ['ls-remote']
+
+    def test_prefetch_merges_into_current_registry(self, manager: WardenManager):
+        """Test that a background prefetch doesn't drop packages added meanwhile."""
+        self._add_packages(manager, ['team/alpha'])
+        manager.config.save_registry()
+
+        # Another process adds a package after this one loaded the registry
+        other = WardenManager(base_path=manager.config.base_path)
+        self._add_packages(other, ['team/beta'])
+        other.config.save_registry()
+
+        with patch.object(manager, '_run_git_command', return_value=(0, "def456\trefs/heads/main", "")):
+            manager.prefetch_package_refs()
+
+        registry = WardenManager(base_path=manager.config.base_path).config.registry['packages']
+        assert set(registry) == {'team/alpha', 'team/beta'}
+        assert registry['team/alpha']['remote_ref'] == "def456"
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason="git not installed")
+class TestPackageCloneStrategies:
+    """Test shallow and sparse clones against a local bare repository."""
+
+    def _git_out(self, cwd: Path, *args) -> str:
+        return subprocess.run(['git'] + list(args), cwd=cwd, check=True,
+                              capture_output=True, text=True).stdout.strip()
+
+    def test_shallow_clone(self, manager: WardenManager, package_origin):
+        """Test that a shallow clone has only the latest commit."""
+        package = manager.install_package("team/rules", clone='shallow')
+        package_dir = manager.config.packages_path / "team-rules"
+        repo_dir = manager.config.packages_path / ".repos" / "team-rules"
+
+        assert self._git_out(repo_dir, 'rev-list', '--count', 'HEAD') == "1"
+        assert (package_dir / "rules" / "style.md").read_text() == "# Style v2\n"
+        assert manager.config.registry['packages']['team/rules']['clone'] == 'shallow'
+        assert package.installed_ref == self._git_out(repo_dir, 'rev-parse', 'HEAD')
+
+    def test_sparse_clone_checks_out_content_dirs_only(self, manager: WardenManager, package_origin):
+        """Test that a sparse clone skips directories Agent Warden doesn't read."""
+        manager.install_package("team/rules", clone='sparse')
+        package_dir = manager.config.packages_path / "team-rules"
+
+        assert (package_dir / "rules" / "style.md").exists()
+        assert (package_dir / "commands" / "review.md").exists()
+        assert not (package_dir / "docs").exists()
+        assert not (manager.config.packages_path / ".repos" / "team-rules" / "docs").exists()
+        assert manager.config.registry['packages']['team/rules']['content'] == {
+            'rules': ['style'], 'commands': ['review']
+        }
+
+    def test_sparse_update_fetches_new_tip(self, manager: WardenManager, package_origin):
+        """Test that updating a sparse package moves to origin's new commit."""
+        work, git, bare = package_origin
+        manager.install_package("team/rules", clone='sparse')
+        package_dir = manager.config.packages_path / "team-rules"
+
+        (work / "rules" / "style.md").write_text("# Style v3\n")
+        (work / "rules" / "new.md").write_text("# New\n")
+        git('add', '-A')
+        git('commit', '-q', '-m', 'third')
+        git('push', '-q', str(bare), 'main')
+
+        package = manager.update_package("team/rules")
+
+        assert (package_dir / "rules" / "style.md").read_text() == "# Style v3\n"
+        assert not (package_dir / "docs").exists()
+        assert package.installed_ref == self._git_out(work, 'rev-parse', 'HEAD')
+        assert sorted(manager.config.registry['packages']['team/rules']['content']['rules']) == ['new', 'style']
+
+    def test_unknown_clone_strategy(self, manager: WardenManager):
+        """Test that an unknown strategy is rejected before cloning."""
+        with pytest.raises(WardenError, match="Unknown clone strategy"):
+            manager.install_package("team/rules", clone='mirror')
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason="git not installed")
+class TestMultiplePackages:
+    """Test installing and updating several packages at once."""
+
+    def test_install_packages_writes_registry_once(self, manager: WardenManager, package_origin, capsys):
+        """Test that packages are installed together, with failures collected and one registry write."""
+        with patch.object(manager.config, '_write_registry', wraps=manager.config._write_registry) as write:
+            summary = manager.install_packages(["team/rules", "team/other@v1", "not-a-spec"])
+
+        assert write.call_count == 1
+        assert sorted(summary['installed']) == ["team/other@v1", "team/rules"]
+        assert [spec for spec, _ in summary['errors']] == ["not-a-spec"]
+        assert set(manager.config.registry['packages']) == {"team/rules", "team/other"}
+        assert (manager.config.packages_path / "team-other" / "rules" / "style.md").read_text() == "# Style v1\n"
+
+        out = capsys.readouterr().out
+        assert "[3/3]" in out
+        assert "not-a-spec: failed:" in out
+
+    def test_install_packages_bounded_concurrency(self, manager: WardenManager):
+        """Test that at most PACKAGE_WORKERS installs run at once."""
+        import threading
+        import time
+
+        lock = threading.Lock()
+        running, peak = [0], [0]
+
+        def install(spec, clone=None):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        specs = [f"team/pkg{i}" for i in range(manager.PACKAGE_WORKERS * 2)]
+        with patch.object(manager, 'install_package', side_effect=install):
+            summary = manager.install_packages(specs)
+
+        assert sorted(summary['installed']) == sorted(specs)
+        assert 1 < peak[0] <= manager.PACKAGE_WORKERS
+
+    def test_install_packages_conflicting_specs(self, manager: WardenManager):
+        """Test that two specs for one package are reported instead of cloned into one checkout at once."""
+        with patch.object(manager, 'install_package') as install:
+            summary = manager.install_packages(["team/rules", "team/other", "team/rules@v1", "team/other"])
+
+        install.assert_called_once_with("team/other", clone=None)
+        assert summary['installed'] == ["team/other"]
+        assert [spec for spec, _ in summary['errors']] == ["team/rules", "team/rules@v1"]
+        assert all("Conflicting specs for package team/rules" in error for _, error in summary['errors'])
+
+    def test_update_all_packages(self, manager: WardenManager, package_origin):
+        """Test that every installed package is updated, and up-to-date ones are reported as such."""
+        import threading
+
+        work, git, bare = package_origin
+        manager.install_packages(["team/rules", "team/other"])
+        manager.update_package("team/other", "v1")
+
+        with patch.object(manager.config, '_write_registry', wraps=manager.config._write_registry) as write:
+            summary = manager.update_packages()
+
+        assert write.call_count == 0
+        assert summary == {'updated': [], 'unchanged': ["team/other", "team/rules"], 'errors': []}
+
+        (work / "rules" / "style.md").write_text("# Style v3\n")
+        git('commit', '-q', '-am', 'third')
+        git('push', '-q', str(bare), 'main')
+        report = manager._report_package_impact
+        reported = []
+
+        def record_report(package_name, content):
+            reported.append((package_name, threading.current_thread() is threading.main_thread()))
+            report(package_name, content)
+
+        with patch.object(manager.config, '_write_registry', wraps=manager.config._write_registry) as write, \
+                patch.object(manager, '_report_package_impact', side_effect=record_report):
+            summary = manager.update_packages(["team/rules", "no/such"])
+
+        assert write.call_count == 1
+        # Impact is reported from the installation index on the calling thread only
+        assert reported == [("team/rules", True)]
+        assert summary['updated'] == ["team/rules"]
+        assert [name for name, _ in summary['errors']] == ["no/such"]
+        assert (manager.config.packages_path / "team-rules" / "rules" / "style.md").read_text() == "# Style v3\n"
@@ -0,0 +1,112 @@
+"""Tests for the shared package cache (per-package mirrors used as alternates)."""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from warden import WardenManager
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git not installed")
+
+
+def _git_out(cwd: Path, *args) -> str:
+    return subprocess.run(['git'] + list(args), cwd=cwd, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def _own_objects(package_dir: Path) -> int:
+    """Objects stored in a checkout itself rather than borrowed."""
+    counts = dict(line.split(': ') for line in _git_out(package_dir, 'count-objects', '-v').splitlines())
+    return int(counts['count']) + int(counts['in-pack'])
+
+
+def _home(path: Path, cache: Path) -> WardenManager:
+    (path / "rules").mkdir(parents=True)
+    (path / "rules" / "mdc.md").write_text("# Rule format\n")
+    home = WardenManager(base_path=path)
+    home.config.config['package_cache'] = str(cache)
+    return home
+
+
+@pytest.fixture
+def cache(temp_dir: Path) -> Path:
+    return temp_dir / "package-cache"
+
+
+@pytest.fixture
+def homes(manager: WardenManager, temp_dir: Path, cache: Path, package_origin):
+    """Two warden homes sharing one package cache."""
+    manager.config.config['package_cache'] = str(cache)
+    return manager, _home(temp_dir / "ci-home", cache)
+
+
+class TestPackageMirrors:
+    """Test installing and updating packages through a shared cache."""
+
+    @pytest.mark.parametrize('clone', ['full', 'shallow', 'sparse'])
+    def test_homes_share_objects(self, homes, cache: Path, clone: str):
+        """Test that checkouts in both homes borrow every object from one mirror."""
+        for home in homes:
+            home.install_package("team/rules", clone=clone)
+            repo_dir = home.config.packages_path / ".repos" / "team-rules"
+
+            assert (home.config.packages_path / "team-rules" / "rules" / "style.md").read_text() == "# Style v2\n"
+            alternates = (repo_dir / ".git" / "objects" / "info" / "alternates").read_text()
+            assert Path(alternates.strip()).resolve() == (cache / "team-rules.git" / "objects").resolve()
+            assert _own_objects(repo_dir) == 0
+
+        assert [p.name for p in cache.iterdir() if not p.name.startswith('.')] == ["team-rules.git"]
+
+    def test_update_goes_through_mirror(self, homes, cache: Path, package_origin):
+        """Test that an update fetches into the mirror, leaving the checkout nothing to download."""
+        work, git, bare = package_origin
+        home, other = homes
+        home.install_package("team/rules")
+        other.install_package("team/rules")
+
+        (work / "rules" / "style.md").write_text("# Style v3\n")
+        git('commit', '-q', '-am', 'third')
+        git('push', '-q', str(bare), 'main')
+        home.update_package("team/rules")
+
+        repo_dir = home.config.packages_path / ".repos" / "team-rules"
+        head = _git_out(repo_dir, 'rev-parse', 'HEAD')
+        assert (home.config.packages_path / "team-rules" / "rules" / "style.md").read_text() == "# Style v3\n"
+        assert _git_out(cache / "team-rules.git", 'rev-parse', 'main') == head
+        assert _own_objects(repo_dir) == 0
+
+        # The other home's checkout is untouched until it updates itself
+        assert (other.config.packages_path / "team-rules" / "rules" / "style.md").read_text() == "# Style v2\n"
+
+    def test_unusable_cache_falls_back_to_plain_clone(self, manager: WardenManager, temp_dir: Path,
+                                                      package_origin, capsys):
+        """Test that a package is still installed when its mirror can't be created."""
+        not_a_dir = temp_dir / "cache-file"
+        not_a_dir.write_text("")
+        manager.config.config['package_cache'] = str(not_a_dir)
+
+        manager.install_package("team/rules")
+
+        repo_dir = manager.config.packages_path / ".repos" / "team-rules"
+        assert (repo_dir / "rules" / "style.md").exists()
+        assert not (repo_dir / ".git" / "objects" / "info" / "alternates").exists()
+        assert "Could not use package cache" in capsys.readouterr().out
+
+    def test_bundle_of_borrowing_checkout_stands_alone(self, homes, temp_dir: Path, cache: Path):
+        """Test that a bundle carries the objects a checkout borrows from the cache."""
+        home, _ = homes
+        home.install_package("team/rules")
+        bundle = temp_dir / "packages.tar.gz"
+        home.export_bundle(bundle)
+        shutil.rmtree(cache)
+
+        offline = _home(temp_dir / "offline-home", temp_dir / "unused-cache")
+        offline.config.config['package_cache'] = None
+        assert offline.import_bundle(bundle) == ["team/rules"]
+
+        repo_dir = offline.config.packages_path / ".repos" / "team-rules"
+        assert not (repo_dir / ".git" / "objects" / "info" / "alternates").exists()
+        assert _git_out(repo_dir, 'show', 'HEAD:rules/style.md') == "# Style v2"
+        _git_out(repo_dir, 'fsck', '--no-dangling')
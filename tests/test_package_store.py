@@ -0,0 +1,190 @@
+"""Tests for the content-addressed package store and version pinning."""
+
+import shutil
+import stat
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from agent_warden.store import PackageStore
+from warden import WardenError, WardenManager
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git not installed")
+
+
+def _rev_parse(repo: Path, ref: str) -> str:
+    return subprocess.run(['git', 'rev-parse', f'{ref}^{{commit}}'], cwd=repo, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+class TestPackageStore:
+    """Test exporting commits into the store."""
+
+    def test_versions_share_identical_files(self, temp_dir: Path, package_origin):
+        """Test that two versions coexist and unchanged files are stored once."""
+        work, _, _ = package_origin
+        store = PackageStore(temp_dir / "store")
+        v1, v2 = _rev_parse(work, 'v1'), _rev_parse(work, 'v2')
+
+        dir1 = store.export(work, 'team-rules', v1, ['rules', 'commands'])
+        dir2 = store.export(work, 'team-rules', v2, ['rules', 'commands'])
+
+        assert (dir1 / "rules" / "style.md").read_text() == "# Style v1\n"
+        assert (dir2 / "rules" / "style.md").read_text() == "# Style v2\n"
+        assert not (dir1 / "docs").exists()
+        assert store.versions('team-rules') == sorted([v1, v2])
+
+        # review.md didn't change between the versions
+        assert (dir1 / "commands" / "review.md").samefile(dir2 / "commands" / "review.md")
+        assert not (dir1 / "rules" / "style.md").samefile(dir2 / "rules" / "style.md")
+
+    def test_export_is_idempotent(self, temp_dir: Path, package_origin):
+        """Test that exporting a stored commit again reuses it."""
+        work, _, _ = package_origin
+        store = PackageStore(temp_dir / "store")
+        commit = _rev_parse(work, 'v1')
+
+        first = store.export(work, 'team-rules', commit, ['rules'])
+        second = store.export(work, 'team-rules', commit, ['rules'])
+
+        assert first == second
+        assert [p.name for p in first.parent.iterdir()] == [commit]
+
+    def test_remove_package_prunes_unshared_objects(self, temp_dir: Path, package_origin):
+        """Test that removing a package frees objects no other package links to."""
+        work, _, _ = package_origin
+        store = PackageStore(temp_dir / "store")
+        store.export(work, 'team-rules', _rev_parse(work, 'v1'), ['rules', 'commands'])
+        store.export(work, 'other-rules', _rev_parse(work, 'v2'), ['rules', 'commands'])
+
+        # style v1 is only used by team-rules; review.md is shared
+        assert store.remove_package('team-rules') == 1
+        assert store.versions('team-rules') == []
+        assert len(list(store.objects_path.glob('*/*'))) == 2
+
+
+class TestPinning:
+    """Test installing pinned package versions into projects."""
+
+    @pytest.fixture
+    def project(self, manager: WardenManager, sample_project_dir: Path, package_origin):
+        manager.install_package("team/rules@main")
+        return manager.install_project(sample_project_dir, target='cursor',
+                                       rule_names=['team/rules:style'], use_copy=True)
+
+    def _installed(self, sample_project_dir: Path) -> str:
+        return (sample_project_dir / '.cursor' / 'rules' / 'style.mdc').read_text()
+
+    def test_pin_and_unpin(self, manager: WardenManager, project, sample_project_dir: Path):
+        """Test that pinning re-points items and unpinning follows the checkout again."""
+        assert "Style v2" in self._installed(sample_project_dir)
+
+        assert manager.pin_package(project.name, "team/rules@v1") == {'cursor': ['team/rules@v1:style']}
+        assert "Style v1" in self._installed(sample_project_dir)
+        rules = manager._get_project_state(project.name).targets['cursor']['installed_rules']
+        assert [rule['name'] for rule in rules] == ['team/rules@v1:style']
+        assert '/.store/' in rules[0]['source']
+
+        assert manager.pin_package(project.name, "team/rules") == {'cursor': ['team/rules:style']}
+        assert "Style v2" in self._installed(sample_project_dir)
+
+    def test_pinned_item_ignores_package_updates(self, manager: WardenManager, project, package_origin):
+        """Test that updating the package doesn't make a pinned item outdated."""
+        work, git, bare = package_origin
+        manager.pin_package(project.name, "team/rules@v2")
+
+        (work / "rules" / "style.md").write_text("# Style v3\n")
+        git('commit', '-q', '-am', 'third')
+        git('push', '-q', str(bare), 'main')
+        manager.update_package("team/rules")
+
+        assert manager.check_project_status(project.name)['outdated_rules'] == []
+        manager.pin_package(project.name, "team/rules")
+        assert manager.check_project_status(project.name)['outdated_rules'] == []
+
+    def test_pin_unknown_ref(self, manager: WardenManager, project):
+        """Test that a ref the package doesn't have is reported."""
+        with pytest.raises(WardenError, match="Unknown ref"):
+            manager.pin_package(project.name, "team/rules@no-such-ref")
+
+
+class TestAtomicUpdates:
+    """Test that packages are served from the store and swapped in on update."""
+
+    def _publish_commit(self, work: Path, git, bare: Path):
+        (work / "rules" / "style.md").write_text("# Style v3\n")
+        git('commit', '-q', '-am', 'third')
+        git('push', '-q', str(bare), 'main')
+
+    def test_update_swaps_published_version(self, manager: WardenManager, package_origin):
+        """Test that an update re-points packages/<pkg> and leaves the old tree intact."""
+        work, git, bare = package_origin
+        package = manager.install_package("team/rules@main")
+        package_dir = manager.config.packages_path / "team-rules"
+        store = manager._get_package_store()
+
+        assert package_dir.is_symlink()
+        assert package_dir.resolve() == store.version_path('team-rules', package.installed_ref).resolve()
+        old_tree = package_dir.resolve()
+
+        self._publish_commit(work, git, bare)
+        package = manager.update_package("team/rules")
+
+        assert package_dir.resolve() == store.version_path('team-rules', package.installed_ref).resolve()
+        assert (package_dir / "rules" / "style.md").read_text() == "# Style v3\n"
+        # A reader that resolved the old tree keeps a complete copy of it
+        assert (old_tree / "rules" / "style.md").read_text() == "# Style v2\n"
+        assert [p.name for p in manager.config.packages_path.iterdir() if p.name.startswith('.team-rules.')] == []
+
+    def test_failed_update_keeps_serving_old_version(self, manager: WardenManager, package_origin):
+        """Test that a failing update doesn't touch the published tree or the registry."""
+        package = manager.install_package("team/rules@main")
+        package_dir = manager.config.packages_path / "team-rules"
+        before = package_dir.resolve()
+
+        with pytest.raises(WardenError, match="Failed to checkout"):
+            manager.update_package("team/rules", ref="no-such-branch")
+
+        assert package_dir.resolve() == before
+        assert (package_dir / "rules" / "style.md").read_text() == "# Style v2\n"
+        assert manager.config.registry['packages']['team/rules']['installed_ref'] == package.installed_ref
+
+    def test_update_adopts_checkout_in_packages_dir(self, manager: WardenManager, package_origin):
+        """Test that a package installed before packages/.repos is moved there on update."""
+        work, git, bare = package_origin
+        manager.install_package("team/rules@main")
+        package_dir = manager.config.packages_path / "team-rules"
+        repo_dir = manager.config.packages_path / ".repos" / "team-rules"
+        package_dir.unlink()
+        repo_dir.rename(package_dir)
+
+        self._publish_commit(work, git, bare)
+        manager.update_package("team/rules")
+
+        assert package_dir.is_symlink()
+        assert (repo_dir / ".git").is_dir()
+        assert (package_dir / "rules" / "style.md").read_text() == "# Style v3\n"
+
+    def test_copied_items_are_writable(self, manager: WardenManager, sample_project_dir: Path, package_origin):
+        """Test that copying an item out of the store gives a file the user can edit."""
+        manager.install_package("team/rules@main")
+        copied = sample_project_dir / "style.md"
+        manager._copy_file(manager.config.packages_path / "team-rules" / "rules" / "style.md", copied)
+
+        assert copied.read_text() == "# Style v2\n"
+        assert copied.stat().st_mode & stat.S_IWUSR
+
+    def test_symlinked_items_follow_published_version(self, manager: WardenManager, sample_project_dir: Path,
+                                               package_origin):
+        """Test that symlinked items see a package update without being re-installed."""
+        work, git, bare = package_origin
+        manager.install_package("team/rules@main")
+        manager.install_project(sample_project_dir, target='cursor', rule_names=['team/rules:style'])
+
+        self._publish_commit(work, git, bare)
+        manager.update_package("team/rules")
+
+        linked = sample_project_dir / '.cursor' / 'rules' / 'style.mdc'
+        assert linked.is_symlink()
+        assert "Style v3" in linked.read_text()
@@ -0,0 +1,75 @@
+"""Tests for the host-aware parallel runner."""
+
+import threading
+import time
+
+import pytest
+
+from agent_warden.parallel import run_by_host
+
+
+class TestRunByHost:
+    """Test bounded, host-aware scheduling."""
+
+    def test_yields_every_result(self):
+        """Test that each item is run once and paired with its result."""
+        items = list(range(25))
+        results = dict(run_by_host(items, lambda i: i * i, lambda i: f"host{i % 3}"))
+        assert results == {i: i * i for i in items}
+
+    def test_empty(self):
+        """Test that no items yields nothing."""
+        assert list(run_by_host([], lambda i: i, lambda i: None)) == []
+
+    def test_per_host_limit(self):
+        """Test that no host ever has more than per_host tasks running."""
+        lock = threading.Lock()
+        running = {}
+        peak = {}
+
+        def task(item):
+            host = item[0]
+            with lock:
+                running[host] = running.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), running[host])
+            time.sleep(0.01)
+            with lock:
+                running[host] -= 1
+            return item
+
+        items = [('busy', i) for i in range(12)] + [('quiet', i) for i in range(3)]
+        list(run_by_host(items, task, lambda item: item[0], max_workers=8, per_host=2))
+
+        assert peak == {'busy': 2, 'quiet': 2}
+
+    def test_local_items_only_bounded_by_workers(self):
+        """Test that items without a host can use every worker."""
+        barrier = threading.Barrier(4, timeout=5)
+
+        # Deadlocks (and times out) unless all four run at once
+        results = list(run_by_host(range(4), lambda i: barrier.wait(), lambda i: None,
+                                   max_workers=4, per_host=1))
+        assert len(results) == 4
+
+    def test_exception_propagates(self):
+        """Test that a failing task raises from the iterator."""
+        def task(item):
+            raise ValueError(f"bad {item}")
+
+        with pytest.raises(ValueError, match="bad 1"):
+            list(run_by_host([1], task, lambda i: None))
+
+    def test_early_stop_cancels_queued_tasks(self):
+        """Test that abandoning the iterator doesn't run remaining items."""
+        started = []
+
+        def task(item):
+            started.append(item)
+            time.sleep(0.01)
+            return item
+
+        results = run_by_host(range(50), task, lambda i: 'host', max_workers=2, per_host=2)
+        next(results)
+        results.close()
+
+        assert len(started) < 50
@@ -1,8 +1,12 @@
 """Tests for ProjectState class."""
 
+import tracemalloc
 from datetime import datetime
 from pathlib import Path
 
+import pytest
+
+from fs_backend import LocalBackend, parse_location
 from warden import ProjectState, WardenConfig
 
 
@@ -116,3 +120,101 @@ class TestProjectState:
         state.timestamp = datetime.now().isoformat()
 
         assert state.timestamp != original_timestamp
+
+    def test_remote_location_is_parsed_lazily(self):
+        """Test that remote projects don't build a backend until it is used."""
+        state = ProjectState("remote", "user@server.com:/var/www/app")
+
+        assert state.is_remote()
+        assert state._backend is None
+
+        assert state.location_string == "user@server.com:/var/www/app"
+        assert state.backend is not None
+
+    def test_slots_prevent_instance_dict(self, temp_dir: Path):
+        """Test that ProjectState is slotted."""
+        state = ProjectState("test_project", str(temp_dir))
+
+        assert not hasattr(state, '__dict__')
+
+
+class TestProjectIdentityMap:
+    """Test that the manager materialises each project once."""
+
+    def test_same_instance_returned(self, manager, sample_project_dir: Path):
+        """Test repeated lookups return the same ProjectState."""
+        project = manager.install_project(sample_project_dir, 'augment', rule_names=['test-rule'])
+
+        first = manager._get_project_state(project.name)
+        second = manager._get_project_state(project.name)
+
+        assert first is second
+        assert manager.list_projects()[0] is first
+
+    def test_replaced_entry_is_rebuilt(self, manager, sample_project_dir: Path):
+        """Test that an entry edited in place is not served stale."""
+        project = manager.install_project(sample_project_dir, 'augment', rule_names=['test-rule'])
+        first = manager._get_project_state(project.name)
+
+        manager.config.state['projects'][project.name]['path'] = 'user@server.com:/srv/app'
+
+        rebuilt = manager._get_project_state(project.name)
+        assert rebuilt is not first
+        assert rebuilt.is_remote()
+
+
+@pytest.mark.slow
+class TestProjectStateMemory:
+    """Memory benchmark for materialising a large state."""
+
+    PROJECT_COUNT = 5000
+
+    def _make_state(self):
+        return {
+            f"project-{i}": {
+                'name': f"project-{i}",
+                'path': f"/srv/projects/project-{i}" if i % 2 else f"dev@host{i % 20}:/srv/project-{i}",
+                'timestamp': '2025-01-01T00:00:00+00:00',
+                'targets': {'augment': {'install_type': 'copy', 'has_rules': True, 'has_commands': False,
+                                        'installed_rules': [], 'installed_commands': []}},
+                'default_targets': []
+            }
+            for i in range(self.PROJECT_COUNT)
+        }
+
+    def _traced(self, build):
+        tracemalloc.start()
+        try:
+            kept = build()
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert len(kept) == self.PROJECT_COUNT
+        return current
+
+    def test_lazy_materialisation_uses_less_memory(self):
+        """Test that materialising the state costs under half of the eager, dict-backed baseline."""
+        state = self._make_state()
+
+        new_bytes = self._traced(lambda: [ProjectState.from_dict(data) for data in state.values()])
+        baseline_bytes = self._traced(lambda: [_BaselineProjectState(data) for data in state.values()])
+
+        assert new_bytes * 2 < baseline_bytes
+
+
+class _BaselineProjectState:
+    """ProjectState as it was before slots and lazy parsing: an instance
+    __dict__ and a location parsed and backend built up front."""
+
+    def __init__(self, data):
+        self.name = data['name']
+        self.project_path, self.backend = parse_location(data['path'])
+        if isinstance(self.backend, LocalBackend):
+            self.path = Path(self.project_path).resolve()
+            self.location_string = str(self.path)
+        else:
+            self.path = Path(self.project_path)
+            self.location_string = data['path']
+        self.timestamp = data['timestamp']
+        self.targets = data['targets']
+        self.default_targets = data['default_targets']
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Integration tests for remote SSH functionality."""
 
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
@@ -257,3 +258,35 @@ class TestRemoteLocationParsing:
         rsync_calls = [c for c in mock_run.call_args_list if c[0][0][0] == 'rsync']
         assert len(rsync_calls) > 0
 
+    @patch('subprocess.run')
+    @patch('shutil.which')
+    def test_add_to_remote_project_is_batched(self, mock_which, mock_run, tmp_path):
+        """Test that add_to_project pushes every new item in one batch."""
+        mock_which.return_value = '/usr/bin/rsync'
+        mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
+
+        warden_dir = tmp_path / "warden"
+        (warden_dir / "rules").mkdir(parents=True)
+        (warden_dir / "commands").mkdir()
+        for name in ('rule1', 'rule2', 'rule3'):
+            (warden_dir / "rules" / f"{name}.md").write_text(f"---\ndescription: {name}\n---\n# {name}")
+        (warden_dir / "commands" / "cmd1.md").write_text("---\ndescription: Command 1\n---\n# Command 1")
+
+        manager = WardenManager(base_path=warden_dir)
+        project = manager.install_project("user@server.com:/var/www/project", target='cursor', rule_names=['rule1'])
+        mock_run.reset_mock()
+
+        manager.add_to_project(project.name, rule_names=['rule1', 'rule2', 'rule3'], command_names=['cmd1'])
+
+        commands = [c[0][0] for c in mock_run.call_args_list]
+        ssh_calls = [cmd for cmd in commands if cmd[0] == 'ssh']
+        rsync_calls = [cmd for cmd in commands if cmd[0] == 'rsync']
+
+        # One mkdir for both directories, one transfer per directory and one
+        # stat listing to record what was written
+        assert len(ssh_calls) == 2
+        assert 'mkdir -p' in ssh_calls[0][-1] and 'stat -L' in ssh_calls[1][-1]
+        assert len(rsync_calls) == 2
+        rule_sources = next(cmd for cmd in rsync_calls if cmd[-1].endswith('/rules/'))[3:-1]
+        assert sorted(Path(src).name for src in rule_sources) == ['rule2.mdc', 'rule3.mdc']
+
@@ -1,9 +1,11 @@
 """Tests for project status and diff commands."""
 
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from agent_warden.utils import calculate_file_checksum
 from warden import ProjectNotFoundError, WardenError, WardenManager
 
 
@@ -98,6 +100,190 @@ class TestProjectStatus:
 
         assert isinstance(all_status, dict)
 
+    def test_check_all_projects_status_hashes_shared_source_once(self, manager: WardenManager, tmp_path: Path):
+        """Test that a rule shared by many projects is hashed once per run."""
+        for i in range(5):
+            project_dir = tmp_path / f"project{i}"
+            project_dir.mkdir()
+            manager.install_project(project_dir, target='cursor', rule_names=['test-rule'])
+
+        with patch('agent_warden.utils.calculate_file_checksum',
+                   wraps=calculate_file_checksum) as checksum:
+            manager.check_all_projects_status()
+
+        source = manager.config.rules_dir / 'test-rule.md'
+        assert [c.args[0] for c in checksum.call_args_list].count(source) == 1
+        assert manager._digests is None
+
+    def test_check_project_status_per_item_tasks_match_serial(self, manager: WardenManager, tmp_path: Path):
+        """Test that large projects checked item by item merge results in serial order."""
+        rule_names = []
+        for i in range(40):
+            name = f"bulk-rule-{i:02d}"
+            (manager.config.rules_dir / f"{name}.md").write_text(f"# Bulk rule {i}\n")
+            rule_names.append(name)
+
+        project_dir = tmp_path / "monorepo"
+        project_dir.mkdir()
+        project = manager.install_project(project_dir, target='augment', rule_names=rule_names, use_copy=True)
+
+        rules_dir = project_dir / '.augment' / 'rules'
+        for name in rule_names[::3]:
+            (rules_dir / f"{name}.md").write_text("# local edit\n")
+        for name in rule_names[1::5]:
+            (manager.config.rules_dir / f"{name}.md").write_text("# upstream edit\n")
+        (rules_dir / f"{rule_names[2]}.md").unlink()
+
+        parallel = manager.check_project_status(project.name)
+        manager.ITEM_PARALLEL_THRESHOLD = len(rule_names) + 1
+        serial = manager.check_project_status(project.name)
+
+        assert parallel == serial
+        assert parallel['conflict_rules'] and parallel['user_modified_rules'] and parallel['missing_installed']
+        assert manager._item_executor is None
+
+    def test_iter_all_projects_status_yields_every_project(self, manager: WardenManager, tmp_path: Path):
+        """Test that the streaming variant yields clean and drifted projects."""
+        names = []
+        for i in range(3):
+            project_dir = tmp_path / f"stream{i}"
+            project_dir.mkdir()
+            names.append(manager.install_project(project_dir, target='augment',
+                                                 rule_names=['test-rule'], use_copy=True).name)
+        (tmp_path / "stream0" / '.augment' / 'rules' / 'test-rule.md').unlink()
+
+        results = dict(manager.iter_all_projects_status())
+
+        assert sorted(results) == sorted(names)
+        assert results[names[0]]['missing_installed']
+        assert results[names[1]] is None
+        assert manager.check_all_projects_status().keys() == {names[0]}
+
+    def test_iter_all_projects_status_stops_early(self, manager: WardenManager, tmp_path: Path):
+        """Test that abandoning the stream closes the run scope."""
+        for i in range(3):
+            project_dir = tmp_path / f"early{i}"
+            project_dir.mkdir()
+            manager.install_project(project_dir, target='augment', rule_names=['test-rule'])
+
+        results = manager.iter_all_projects_status()
+        next(results)
+        results.close()
+
+        assert manager._digests is None
+
+
+class TestFastStatus:
+    """Test metadata-only drift detection (warden status --fast)."""
+
+    def _install(self, manager: WardenManager, tmp_path: Path):
+        project_dir = tmp_path / "fast-project"
+        project_dir.mkdir()
+        project = manager.install_project(project_dir, target='augment', rule_names=['test-rule', 'rule1'],
+                                          use_copy=True)
+        return project, project_dir / '.augment' / 'rules'
+
+    def test_install_records_size_and_mtime(self, manager: WardenManager, tmp_path: Path):
+        """Test that installs record the written file's size and mtime."""
+        project, rules_dir = self._install(manager, tmp_path)
+
+        item = project.targets['augment']['installed_rules'][0]
+        stat = (rules_dir / 'test-rule.md').stat()
+        assert (item['installed_size'], item['installed_mtime']) == (stat.st_size, stat.st_mtime_ns)
+
+    def test_unchanged_files_are_not_hashed(self, manager: WardenManager, tmp_path: Path):
+        """Test that fast mode trusts files whose metadata is unchanged."""
+        project, _ = self._install(manager, tmp_path)
+        backend = manager._get_project_state(project.name).backend
+
+        with patch.object(type(backend), 'checksum', autospec=True) as checksum:
+            status = manager.check_project_status(project.name, fast=True)
+
+        checksum.assert_not_called()
+        assert status['item_status'] == {'rule': {}, 'command': {}}
+
+    def test_changed_metadata_falls_back_to_hashing(self, manager: WardenManager, tmp_path: Path):
+        """Test that an edited file is hashed and reported as modified."""
+        project, rules_dir = self._install(manager, tmp_path)
+        (rules_dir / 'rule1.md').write_text("# local edit\n")
+        (rules_dir / 'test-rule.md').unlink()
+        backend = manager._get_project_state(project.name).backend
+
+        with patch.object(type(backend), 'checksum', autospec=True,
+                          side_effect=type(backend).checksum) as checksum:
+            status = manager.check_project_status(project.name, fast=True)
+
+        assert checksum.call_count == 1
+        assert [r['name'] for r in status['user_modified_rules']] == ['rule1']
+        assert [r['name'] for r in status['missing_installed']] == ['test-rule']
+
+    def test_items_without_metadata_are_hashed(self, manager: WardenManager, tmp_path: Path):
+        """Test that items installed before metadata was recorded are still verified."""
+        project, _ = self._install(manager, tmp_path)
+        for item in manager.config.state['projects'][project.name]['targets']['augment']['installed_rules']:
+            del item['installed_size'], item['installed_mtime']
+        backend = manager._get_project_state(project.name).backend
+
+        with patch.object(type(backend), 'checksum', autospec=True,
+                          side_effect=type(backend).checksum) as checksum:
+            manager.check_project_status(project.name, fast=True)
+
+        assert checksum.call_count == 2
+
+
+class TestStatusCache:
+    """Test the persistent fingerprinted status cache."""
+
+    def _install(self, manager: WardenManager, tmp_path: Path):
+        project_dir = tmp_path / "cached-project"
+        project_dir.mkdir()
+        manager.install_project(project_dir, target='augment', rule_names=['test-rule'], use_copy=True)
+        return project_dir / '.augment' / 'rules' / 'test-rule.md'
+
+    def test_unchanged_project_is_served_from_cache(self, manager: WardenManager, tmp_path: Path):
+        """Test that a second run does not recheck an unchanged project."""
+        self._install(manager, tmp_path)
+        assert manager.check_all_projects_status(use_cache=True) == {}
+
+        fresh = WardenManager(manager.config.base_path)
+        with patch.object(fresh, 'check_project_status', wraps=fresh.check_project_status) as check:
+            assert fresh.check_all_projects_status(use_cache=True) == {}
+        check.assert_not_called()
+        assert (manager.config.base_path / manager.config.STATUS_CACHE_FILE).exists()
+
+    def test_modified_installed_file_invalidates_entry(self, manager: WardenManager, tmp_path: Path):
+        """Test that editing an installed file is noticed through its stat."""
+        installed = self._install(manager, tmp_path)
+        manager.check_all_projects_status(use_cache=True)
+
+        installed.write_text(installed.read_text() + "\n# local edit")
+
+        fresh = WardenManager(manager.config.base_path)
+        with patch.object(fresh, 'check_project_status', wraps=fresh.check_project_status) as check:
+            fresh.check_all_projects_status(use_cache=True)
+        assert check.call_count == 1
+
+    def test_changed_source_invalidates_entry(self, manager: WardenManager, tmp_path: Path):
+        """Test that a changed source makes the project outdated again."""
+        self._install(manager, tmp_path)
+        manager.check_all_projects_status(use_cache=True)
+
+        source = manager.config.rules_dir / 'test-rule.md'
+        source.write_text(source.read_text() + "\n# upstream change")
+
+        fresh = WardenManager(manager.config.base_path)
+        status = next(iter(fresh.check_all_projects_status(use_cache=True).values()))
+        assert [r['name'] for r in status['outdated_rules']] == ['test-rule']
+
+    def test_max_age_zero_forces_recheck(self, manager: WardenManager, tmp_path: Path):
+        """Test that max_age=0 (--refresh) ignores cached verdicts."""
+        self._install(manager, tmp_path)
+        manager.check_all_projects_status(use_cache=True)
+
+        with patch.object(manager, 'check_project_status', wraps=manager.check_project_status) as check:
+            manager.check_all_projects_status(use_cache=True, max_age=0)
+        assert check.call_count == 1
+
 
 class TestProjectDiff:
     """Test cases for project diff functionality."""
@@ -230,6 +416,22 @@ class TestGetItemStatus:
         result = get_item_status('test-rule', 'rule', status)
         assert "[MODIFIED]" in result
 
+    def test_get_item_status_is_per_target(self, manager: WardenManager, tmp_path: Path):
+        """Test that the status index keeps targets apart for same-named items."""
+        from agent_warden.formatting import get_item_status
+
+        project_dir = tmp_path / "two-targets"
+        project_dir.mkdir()
+        project = manager.install_project(project_dir, target='augment', rule_names=['test-rule'], use_copy=True)
+        manager.install_project(project_dir, target='cursor', rule_names=['test-rule'], use_copy=True)
+        (project_dir / '.cursor' / 'rules' / 'test-rule.mdc').write_text("# local edit\n")
+
+        status = manager.check_project_status(project.name)
+
+        assert status['item_status']['rule'] == {'cursor': {'test-rule': 'user_modified_rules'}}
+        assert "[MODIFIED]" in get_item_status('test-rule', 'rule', status, 'cursor')
+        assert "[UP TO DATE]" in get_item_status('test-rule', 'rule', status, 'augment')
+
     def test_get_item_status_conflict(self):
         """Test item status when in conflict."""
         from agent_warden.formatting import get_item_status
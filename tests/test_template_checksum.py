@@ -1,6 +1,7 @@
 """Tests for command template checksum handling."""
 
 from pathlib import Path
+from unittest.mock import patch
 
 from warden import WardenManager
 
@@ -193,3 +194,52 @@ class TestTemplateChecksumHandling:
             # Restore original
             source_file.write_text(original_content)
 
+
+
+class TestRenderedRuleChecksums:
+    """Test that HAL-converted rule copies are compared against rendered output."""
+
+    def test_converted_rule_copy_is_up_to_date(self, manager: WardenManager, tmp_path: Path):
+        """Test that a cursor rule copy is not reported as outdated right after install."""
+        project_dir = tmp_path / "cursor-project"
+        project_dir.mkdir()
+
+        project = manager.install_project(project_dir, target='cursor', rule_names=['test-rule'], use_copy=True)
+
+        installed = (project_dir / '.cursor' / 'rules' / 'test-rule.mdc').read_text()
+        assert installed != (manager.config.rules_dir / 'test-rule.md').read_text()
+
+        status = manager.check_project_status(project.name)
+        assert status['outdated_rules'] == []
+        assert status['user_modified_rules'] == []
+        assert manager.show_diff(project.name, 'test-rule') == ''
+
+    def test_update_writes_converted_rule(self, manager: WardenManager, tmp_path: Path):
+        """Test that updating a copied cursor rule keeps it converted and up to date."""
+        project_dir = tmp_path / "cursor-project"
+        project_dir.mkdir()
+        project = manager.install_project(project_dir, target='cursor', rule_names=['test-rule'], use_copy=True)
+
+        rule_file = manager.config.rules_dir / 'test-rule.md'
+        rule_file.write_text(rule_file.read_text() + "\nMore guidance.\n")
+        assert [r['name'] for r in manager.check_project_status(project.name)['outdated_rules']] == ['test-rule']
+
+        manager.update_project_items(project.name, rule_names=['test-rule'])
+
+        status = manager.check_project_status(project.name)
+        assert status['outdated_rules'] == [] and status['user_modified_rules'] == []
+        assert 'More guidance.' in (project_dir / '.cursor' / 'rules' / 'test-rule.mdc').read_text()
+
+    def test_rendered_digests_persist_between_runs(self, manager: WardenManager, tmp_path: Path):
+        """Test that a new manager reuses rendered digests instead of re-rendering."""
+        project_dir = tmp_path / "cursor-project"
+        project_dir.mkdir()
+        project = manager.install_project(project_dir, target='cursor', rule_names=['test-rule'], use_copy=True)
+        assert (manager.config.base_path / manager.config.RENDER_CACHE_FILE).exists()
+
+        fresh = WardenManager(manager.config.base_path)
+        with patch('agent_warden.manager.convert_rule_format') as convert:
+            status = fresh.check_project_status(project.name)
+
+        convert.assert_not_called()
+        assert status['outdated_rules'] == []
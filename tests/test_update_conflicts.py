@@ -1,10 +1,12 @@
 """Tests for project update and conflict resolution."""
 
+from contextlib import contextmanager
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from warden import ProjectNotFoundError, WardenManager
+from warden import ProjectNotFoundError, WardenError, WardenManager
 
 
 class TestProjectUpdate:
@@ -113,6 +115,33 @@ class TestUpdateAllProjects:
         assert 'updated' in summary
         assert 'skipped_uptodate' in summary
 
+    def test_update_all_projects_workers_leave_state_alone(self, manager: WardenManager, tmp_path: Path):
+        """Test that new checksums are recorded by the calling thread, not the update workers."""
+        import threading
+
+        project_dir = tmp_path / "test-project"
+        project_dir.mkdir()
+        project = manager.install_project(project_dir, target='augment', use_copy=True, rule_names=['test-rule'])
+        state_item = manager.config.state['projects'][project.name]['targets']['augment']['installed_rules'][0]
+        old_checksum = state_item['checksum']
+        (manager.config.rules_dir / 'test-rule.md').write_text("# Test Rule\n\nChanged.\n")
+
+        write = manager._write_item_updates
+        seen = []
+
+        def worker_write(*args, **kwargs):
+            result = write(*args, **kwargs)
+            seen.append((threading.current_thread() is threading.main_thread(), state_item['checksum']))
+            return result
+
+        with patch.object(manager, '_write_item_updates', side_effect=worker_write):
+            summary = manager.update_all_projects()
+
+        assert [name for name, _ in summary['updated']] == [project.name]
+        assert seen == [(False, old_checksum)]
+        stored = manager.config.state['projects'][project.name]['targets']['augment']['installed_rules'][0]
+        assert stored['checksum'] != old_checksum
+
     def test_update_all_projects_exclude_remote(self, manager: WardenManager, tmp_path: Path):
         """Test update-all excluding remote projects."""
         # Install a local project
@@ -278,3 +307,143 @@ class TestUpdateProjectItems:
 
         assert isinstance(result, dict)
 
+    def _outdated_project(self, manager: WardenManager, tmp_path: Path):
+        project_dir = tmp_path / "outdated-project"
+        project_dir.mkdir()
+        project = manager.install_project(project_dir, target='augment', rule_names=['test-rule'], use_copy=True)
+        source = manager.config.rules_dir / 'test-rule.md'
+        source.write_text(source.read_text() + "\n# upstream change")
+        return project, project_dir / '.augment' / 'rules' / 'test-rule.md'
+
+    def test_update_project_items_reuses_precomputed_status(self, manager: WardenManager, tmp_path: Path):
+        """Test that a fresh precomputed status is used instead of a rescan."""
+        project, installed = self._outdated_project(manager, tmp_path)
+        status = manager.check_project_status(project.name)
+
+        with patch.object(manager, 'check_project_status') as check:
+            result = manager.update_project_items(project.name, update_all=True, status=status)
+
+        check.assert_not_called()
+        assert result['rules'] == ['test-rule']
+        assert "upstream change" in installed.read_text()
+
+    def test_update_project_items_rescans_stale_status(self, manager: WardenManager, tmp_path: Path):
+        """Test that a status whose stored checksums no longer match is recomputed."""
+        project, _ = self._outdated_project(manager, tmp_path)
+        status = manager.check_project_status(project.name)
+
+        # Someone else updates the project after the scan
+        manager.update_project_items(project.name, update_all=True)
+
+        with patch.object(manager, 'check_project_status', wraps=manager.check_project_status) as check:
+            result = manager.update_project_items(project.name, update_all=True, status=status)
+
+        check.assert_called_once()
+        assert result['rules'] == []
+
+    def test_update_all_projects_scans_once(self, manager: WardenManager, tmp_path: Path):
+        """Test that update_all_projects does not rescan projects it updates."""
+        self._outdated_project(manager, tmp_path)
+
+        with patch.object(manager, 'check_project_status', wraps=manager.check_project_status) as check:
+            summary = manager.update_all_projects()
+
+        assert check.call_count == 1
+        assert summary['updated'][0][1]['rules'] == ['test-rule']
+
+    def test_update_all_projects_in_parallel_writes_state_once(self, manager: WardenManager, tmp_path: Path):
+        """Test that a fleet update updates every project and saves state once."""
+        names = []
+        for i in range(6):
+            project_dir = tmp_path / f"fleet{i}"
+            project_dir.mkdir()
+            names.append(manager.install_project(project_dir, target='augment', rule_names=['test-rule'],
+                                                 use_copy=True).name)
+        source = manager.config.rules_dir / 'test-rule.md'
+        source.write_text(source.read_text() + "\n# upstream change")
+
+        with patch.object(manager.config, '_write_state', wraps=manager.config._write_state) as write:
+            summary = manager.update_all_projects()
+
+        assert write.call_count == 1
+        assert sorted(name for name, _ in summary['updated']) == sorted(names)
+        assert manager.check_all_projects_status() == {}
+
+    def test_update_project_items_writes_in_one_batch(self, manager: WardenManager, tmp_path: Path):
+        """Test that all outdated items across targets are written in one batch call."""
+        project_dir = tmp_path / "batched-project"
+        project_dir.mkdir()
+        project = manager.install_project(project_dir, target='augment', rule_names=['test-rule', 'rule1'],
+                                          use_copy=True)
+        manager.install_project(project_dir, target='cursor', rule_names=['test-rule', 'rule1'], use_copy=True)
+        for name in ('test-rule', 'rule1'):
+            source = manager.config.rules_dir / f"{name}.md"
+            source.write_text(source.read_text() + "\n# upstream change")
+
+        backend = manager._get_project_state(project.name).backend
+        with patch.object(type(backend), 'copy_files_batch', autospec=True,
+                          side_effect=type(backend).copy_files_batch) as batch:
+            result = manager.update_project_items(project.name, update_all=True)
+
+        assert batch.call_count == 1
+        assert len(batch.call_args[0][1]) == 4
+        assert sorted(result['rules']) == ['rule1', 'test-rule']
+        assert "upstream change" in (project_dir / '.cursor' / 'rules' / 'rule1.mdc').read_text()
+        assert manager.check_project_status(project.name)['outdated_rules'] == []
+
+    @staticmethod
+    @contextmanager
+    def _copies_failing_at(manager: WardenManager, project_name: str, broken: str):
+        """Make copies to broken fail; a batch copies files in order until it gets there."""
+        backend_type = type(manager._get_project_state(project_name).backend)
+        copy_file = backend_type.copy_file
+
+        def copy_or_fail(backend, source, dest):
+            if dest == broken:
+                raise OSError("disk full")
+            copy_file(backend, source, dest)
+
+        def batch_failing_part_way(backend, pairs, create_dirs=True):
+            for source, dest in pairs:
+                copy_or_fail(backend, source, dest)
+
+        with patch.object(backend_type, 'copy_files_batch', autospec=True, side_effect=batch_failing_part_way), \
+                patch.object(backend_type, 'copy_file', autospec=True, side_effect=copy_or_fail):
+            yield
+
+    def test_update_project_items_batch_failing_part_way(self, manager: WardenManager, tmp_path: Path):
+        """Test that files a failed batch already wrote are recorded, and only the rest reported."""
+        project_dir = tmp_path / "partial-project"
+        project_dir.mkdir()
+        project = manager.install_project(project_dir, target='augment', rule_names=['test-rule', 'rule1'],
+                                          use_copy=True)
+        for name in ('test-rule', 'rule1'):
+            source = manager.config.rules_dir / f"{name}.md"
+            source.write_text(source.read_text() + "\n# upstream change")
+
+        broken = str(project_dir / '.augment' / 'rules' / 'rule1.md')
+        with self._copies_failing_at(manager, project.name, broken):
+            result = manager.update_project_items(project.name, update_all=True)
+
+        assert result['rules'] == ['test-rule']
+        assert len(result['errors']) == 1 and "disk full" in result['errors'][0]
+
+        status = manager.check_project_status(project.name)
+        assert [r['name'] for r in status['outdated_rules']] == ['rule1']
+        assert status['user_modified_rules'] == [] and status['conflict_rules'] == []
+
+    def test_add_to_project_records_files_written_before_failure(self, manager: WardenManager, tmp_path: Path):
+        """Test that add_to_project records the items a failed batch wrote, then reports the rest."""
+        project_dir = tmp_path / "partial-add"
+        project_dir.mkdir()
+        project = manager.install_project(project_dir, target='augment', rule_names=['test'], use_copy=True)
+
+        broken = str(project_dir / '.augment' / 'rules' / 'rule1.md')
+        with self._copies_failing_at(manager, project.name, broken), \
+                pytest.raises(WardenError, match="disk full"):
+            manager.add_to_project(project.name, rule_names=['test-rule', 'rule1'])
+
+        installed = manager.config.state['projects'][project.name]['targets']['augment']['installed_rules']
+        assert sorted(item['name'] for item in installed) == ['test', 'test-rule']
+        status = manager.check_project_status(project.name)
+        assert status['user_modified_rules'] == [] and status['conflict_rules'] == []
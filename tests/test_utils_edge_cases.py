@@ -1,8 +1,12 @@
 """Tests for utility function edge cases."""
 
+import threading
+import time
+
 import pytest
 
 from agent_warden.utils import (
+    DigestTable,
     get_file_info,
     parse_frontmatter,
     strip_frontmatter,
@@ -208,3 +212,38 @@ class TestGetFileInfo:
         with pytest.raises(IsADirectoryError):
             get_file_info(str(test_dir))
 
+
+
+class TestDigestTable:
+    """Test the single-flight digest table."""
+
+    def test_concurrent_requests_compute_once(self):
+        """Test that concurrent callers for one key share a single computation."""
+        table = DigestTable()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return "digest"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(table.get('k', compute))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == ["digest"] * 8
+        assert len(calls) == 1
+
+    def test_failures_are_not_cached(self, tmp_path):
+        """Test that a failed computation is retried on the next call."""
+        table = DigestTable()
+        missing = tmp_path / "later.md"
+
+        with pytest.raises(FileNotFoundError):
+            table.file_checksum(missing)
+
+        missing.write_text("now it exists")
+        assert len(table.file_checksum(missing)) == 64
@@ -28,8 +28,10 @@ from agent_warden.formatting import (
     colored_status,
     format_project_detailed,
     format_project_info,
+    format_status_ndjson,
 )
 from agent_warden.manager import WardenManager
+from agent_warden.package import CLONE_STRATEGIES
 from agent_warden.project import ProjectState
 
 
@@ -231,6 +233,36 @@ class AutoUpdater:
         self.config.save_state()
 
 
+def print_package_summary(summary: Dict, done_key: str):
+    """Print the outcome of install_packages / update_packages."""
+    done = summary[done_key]
+    if not done and not summary['errors'] and not summary.get('unchanged'):
+        print(colored_status('INFO', "No packages installed"))
+        return
+    print()
+    if done:
+        print(colored_status('SUCCESS', f"{len(done)} package(s) {done_key}: {', '.join(done)}"))
+    if summary.get('unchanged'):
+        print(colored_status('INFO', f"{len(summary['unchanged'])} package(s) already up to date"))
+    for name, error in summary['errors']:
+        print(colored_status('ERROR', f"{name}: {error}"))
+
+
+def start_package_prefetch():
+    """Refresh remote package refs in a detached background process."""
+    try:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), '--prefetch-packages'],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError:
+        # Best effort; the next foreground check probes instead
+        pass
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create the command-line argument parser."""
     parser = argparse.ArgumentParser(
@@ -292,7 +324,9 @@ Examples:
   # Package management
   %(prog)s add-package user/repo
   %(prog)s add-package user/repo@v1.0.0
+  %(prog)s add-package user/repo other/repo@v2.0.0
   %(prog)s update-package user/repo
+  %(prog)s update-package --all
   %(prog)s list-packages
   %(prog)s search api
 
@@ -306,10 +340,24 @@ Examples:
     parser.add_argument('--yes', '-y', action='store_true',
                        help='Skip all confirmation prompts and use default answers')
 
+    # Status cache flags (apply to the default status command)
+    parser.add_argument('--refresh', action='store_true',
+                       help='Status: ignore cached results and check every project')
+    parser.add_argument('--max-age', type=float, metavar='SECONDS',
+                       help='Status: recheck cached results older than SECONDS')
+    parser.add_argument('--fast', action='store_true',
+                       help='Status: detect changes by size and mtime instead of hashing installed files')
+    parser.add_argument('--format', choices=['text', 'ndjson'], default='text',
+                       help='Status: output format (ndjson prints one JSON object per project)')
+
     # Hidden argument for status project interception
     parser.add_argument('--status-project', dest='status_project',
                        help=argparse.SUPPRESS)
 
+    # Hidden argument for the background package ref refresh
+    parser.add_argument('--prefetch-packages', action='store_true',
+                       help=argparse.SUPPRESS)
+
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
     # Install command
@@ -348,8 +396,10 @@ Examples:
     project_update_parser.add_argument('--target', metavar='TARGET',
                                        choices=['cursor', 'augment', 'claude', 'windsurf', 'codex'],
                                        help='Update only a specific target (default: all targets)')
-    project_update_parser.add_argument('--rules', nargs='*', metavar='RULE', help='Update specific rules')
-    project_update_parser.add_argument('--commands', nargs='*', metavar='COMMAND', help='Update specific commands')
+    project_update_parser.add_argument('--rules', nargs='*', metavar='RULE',
+                                       help='Update specific rules (in every project that has them if no project is given)')
+    project_update_parser.add_argument('--commands', nargs='*', metavar='COMMAND',
+                                       help='Update specific commands (in every project that has them if no project is given)')
     project_update_parser.add_argument('--dry-run', action='store_true', help='Show what would be updated without making changes')
     project_update_parser.add_argument('--force', action='store_true', help='Force update conflicts without prompting')
 
@@ -387,6 +437,13 @@ Examples:
                                          choices=['cursor', 'augment', 'claude', 'windsurf', 'codex'],
                                          help='Default targets to use when adding rules/commands')
 
+    # Project pin command
+    project_pin_parser = project_subparsers.add_parser('pin', help="Pin a project's items from a package to one version")
+    project_pin_parser.add_argument('project_name', help='Name of the project')
+    project_pin_parser.add_argument('package_spec',
+                                    help='owner/repo@ref to pin to a branch, tag or commit; owner/repo to unpin')
+    project_pin_parser.add_argument('--target', help='Only re-point items in this target')
+
     # List commands
     list_commands_parser = subparsers.add_parser('list-commands', help='List all available commands')
     list_commands_parser.add_argument('--info', '-i', metavar='COMMAND',
@@ -414,17 +471,37 @@ Examples:
     config_parser.add_argument('--auto-update', metavar='BOOL',
                               choices=['true', 'false', 'yes', 'no', 'on', 'off'],
                               help='Enable/disable automatic updates of Agent Warden')
+    config_parser.add_argument('--state-journal', metavar='BOOL',
+                              choices=['true', 'false', 'yes', 'no', 'on', 'off'],
+                              help='Enable/disable append-only journaling of state changes')
+    config_parser.add_argument('--package-ref-ttl', metavar='SECONDS', type=float,
+                              help='Reuse remote package refs checked within SECONDS')
+    config_parser.add_argument('--package-prefetch', metavar='BOOL',
+                              choices=['true', 'false', 'yes', 'no', 'on', 'off'],
+                              help='Enable/disable refreshing remote package refs in the background')
+    config_parser.add_argument('--package-clone', metavar='STRATEGY',
+                              choices=CLONE_STRATEGIES,
+                              help=f"Set the default clone strategy for new packages ({', '.join(CLONE_STRATEGIES)})")
+    config_parser.add_argument('--package-cache', metavar='DIR',
+                              help='Share package objects with other warden homes through mirrors in DIR '
+                                   "('none' to stop)")
     config_parser.add_argument('--show', action='store_true',
                               help='Show current configuration')
 
     # Package management commands
     add_package_parser = subparsers.add_parser('add-package', help='Add a GitHub package')
-    add_package_parser.add_argument('package_spec', help='Package specification (owner/repo[@ref])')
-    add_package_parser.add_argument('--ref', help='Specific branch, tag, or commit to install')
+    add_package_parser.add_argument('package_specs', nargs='+', metavar='package_spec',
+                                   help='Package specification (owner/repo[@ref]); several are installed concurrently')
+    add_package_parser.add_argument('--ref', help='Specific branch, tag, or commit to install (one package only)')
+    add_package_parser.add_argument('--clone', choices=CLONE_STRATEGIES,
+                                   help='Clone full history, only the latest commit (shallow), '
+                                        'or only its rules/ and commands/ (sparse)')
 
     update_package_parser = subparsers.add_parser('update-package', help='Update a GitHub package')
-    update_package_parser.add_argument('package_name', help='Name of the package to update (owner/repo)')
-    update_package_parser.add_argument('--ref', help='Update to specific branch, tag, or commit')
+    update_package_parser.add_argument('package_names', nargs='*', metavar='package_name',
+                                      help='Name of the package to update (owner/repo); several are updated concurrently')
+    update_package_parser.add_argument('--all', action='store_true', help='Update every installed package')
+    update_package_parser.add_argument('--ref', help='Update to specific branch, tag, or commit (one package only)')
 
     remove_package_parser = subparsers.add_parser('remove-package', help='Remove a GitHub package')
     remove_package_parser.add_argument('package_name', help='Name of the package to remove (owner/repo)')
@@ -432,12 +509,29 @@ Examples:
     list_packages_parser = subparsers.add_parser('list-packages', help='List all installed packages')
     list_packages_parser.add_argument('--status', action='store_true',
                                      help='Show update status for each package')
+    list_packages_parser.add_argument('--refresh', action='store_true',
+                                     help='Ask each remote instead of reusing recently checked refs')
 
     check_updates_parser = subparsers.add_parser('check-updates', help='Check for package updates')
     check_updates_parser.add_argument('--diff', metavar='PACKAGE',
                                      help='Show diff for a specific package')
     check_updates_parser.add_argument('--files', action='store_true',
                                      help='Show changed files in diff')
+    check_updates_parser.add_argument('--refresh', action='store_true',
+                                     help='Ask each remote instead of reusing recently checked refs')
+
+    bundle_parser = subparsers.add_parser('bundle', help='Move packages to hosts without GitHub access')
+    bundle_subparsers = bundle_parser.add_subparsers(dest='bundle_command', help='Bundle commands')
+
+    bundle_export_parser = bundle_subparsers.add_parser('export', help='Write packages to a bundle')
+    bundle_export_parser.add_argument('output', help='Bundle file to create (.tar.gz)')
+    bundle_export_parser.add_argument('packages', nargs='*', metavar='PACKAGE',
+                                      help='Packages to include (owner/repo; default: all)')
+
+    bundle_import_parser = bundle_subparsers.add_parser('import', help='Install the packages of a bundle')
+    bundle_import_parser.add_argument('bundle', help='Bundle file')
+    bundle_import_parser.add_argument('--force', action='store_true',
+                                      help='Replace packages that are already installed')
 
     search_parser = subparsers.add_parser('search', help='Search for rules and commands')
     search_parser.add_argument('query', help='Search query')
@@ -466,7 +560,7 @@ def main():
     import sys
     if len(sys.argv) >= 3 and sys.argv[1] == 'project':
         # Check if the second argument is not a known subcommand
-        known_subcommands = ['list', 'show', 'update', 'sever', 'remove', 'untrack', 'rename', 'configure']
+        known_subcommands = ['list', 'show', 'update', 'sever', 'remove', 'untrack', 'rename', 'configure', 'pin']
         if sys.argv[2] not in known_subcommands and not sys.argv[2].startswith('-'):
             # Only insert 'show' if there's no known subcommand following
             # (e.g., 'project myproject' -> 'project show myproject')
@@ -475,17 +569,15 @@ def main():
                 # Insert 'show' before the project name
                 sys.argv.insert(2, 'show')
 
-    # Intercept 'warden <project_name>' to show status for that project
-    # Check if there's exactly one argument and it's not a known command
-    if len(sys.argv) == 2 and not sys.argv[1].startswith('-'):
+    # Intercept 'warden <project_name> [status options]' to show status for that project
+    # Check if the first argument is not an option or a known command
+    if len(sys.argv) >= 2 and not sys.argv[1].startswith('-'):
         known_commands = ['install', 'project', 'list-commands', 'global-install', 'config',
                          'add-package', 'update-package', 'remove-package', 'list-packages',
-                         'check-updates', 'search', 'diff', 'rules']
+                         'check-updates', 'bundle', 'search', 'diff', 'rules']
         if sys.argv[1] not in known_commands:
-            # Assume it's a project name for status check
-            project_name_arg = sys.argv[1]
-            sys.argv[1] = '--status-project'
-            sys.argv.append(project_name_arg)
+            # Assume it's a project name for status check (e.g. 'warden myproject --fast')
+            sys.argv[1:2] = ['--status-project', sys.argv[1]]
 
     args = parser.parse_args()
 
@@ -505,13 +597,20 @@ def main():
 
     try:
         # Check for WARDEN_HOME environment variable for testing/development
+        # In ndjson mode stdout carries only JSON; notices go to stderr
+        notice_file = sys.stderr if args.format == 'ndjson' else sys.stdout
+
         warden_home = os.environ.get('WARDEN_HOME')
         if warden_home:
-            print(f"[INFO] Using WARDEN_HOME: {warden_home}")
+            print(f"[INFO] Using WARDEN_HOME: {warden_home}", file=notice_file)
             manager = WardenManager(base_path=warden_home)
         else:
             manager = WardenManager()
 
+        if args.prefetch_packages:
+            manager.prefetch_package_refs()
+            return 0
+
         # Check for updates (once per day, if enabled)
         auto_updater = AutoUpdater(manager.config)
         if auto_updater.should_check_for_updates():
@@ -520,9 +619,10 @@ def main():
 
             if update_info:
                 commits = update_info['commits_behind']
-                print(f"[INFO] Agent Warden update available ({commits} commit{'s' if commits != 1 else ''} behind)")
-                print("[INFO] Update will be applied after command completes")
-                print()
+                print(f"[INFO] Agent Warden update available ({commits} commit{'s' if commits != 1 else ''} behind)",
+                      file=notice_file)
+                print("[INFO] Update will be applied after command completes", file=notice_file)
+                print(file=notice_file)
 
         if args.command == 'project':
             # Handle project subcommands
@@ -564,7 +664,14 @@ def main():
                         if dry_run:
                             print("[DRY RUN] Showing what would be updated:\n")
 
-                        summary = manager.update_all_projects(dry_run=dry_run)
+                        if args.rules or args.commands:
+                            # Only the projects these items are installed in
+                            summary = manager.update_item_installations(
+                                args.rules, args.commands, dry_run=dry_run, force=args.force)
+                            summary.setdefault('skipped_conflicts', [])
+                            summary.setdefault('skipped_uptodate', [])
+                        else:
+                            summary = manager.update_all_projects(dry_run=dry_run)
 
                         # Display results
                         if summary['updated']:
@@ -607,7 +714,11 @@ def main():
                                 print(f"  • {project_name}: {error}")
 
                         if not summary['updated'] and not summary['skipped_conflicts'] and not summary['errors']:
-                            print("[INFO] All projects are up to date")
+                            if args.rules or args.commands:
+                                if not summary['skipped_remote']:
+                                    print("[INFO] No project has these items installed")
+                            else:
+                                print("[INFO] All projects are up to date")
 
                     else:
                         # Update specific project
@@ -621,7 +732,7 @@ def main():
 
                         if dry_run:
                             # Dry run for specific project
-                            status = manager.check_project_status(args.project_name)
+                            status = manager.check_project_status(args.project_name, fast=args.fast)
                             print(f"[DRY RUN] Would update project '{args.project_name}':\n")
                             if target:
                                 print(f"  Target: {target}")
@@ -756,6 +867,21 @@ def main():
                     print(f"[ERROR] {e}")
                     return 1
 
+            elif args.project_command == 'pin':
+                try:
+                    repointed = manager.pin_package(args.project_name, args.package_spec, args.target)
+                except (ProjectNotFoundError, WardenError) as e:
+                    print(f"[ERROR] {e}")
+                    return 1
+                package_name, _, ref = args.package_spec.partition('@')
+                if not repointed:
+                    print(f"[INFO] No items from '{package_name}' to re-point")
+                else:
+                    where = f"version {ref}" if ref else "the package checkout"
+                    print(f"[SUCCESS] Items from '{package_name}' now follow {where}")
+                    for target_name, names in repointed.items():
+                        print(f"   {target_name}: {', '.join(names)}")
+
         elif args.command == 'install':
             rule_names = args.rules if hasattr(args, 'rules') and args.rules is not None else None
             command_names = args.commands if args.commands else None
@@ -873,7 +999,7 @@ def main():
                     print(f"Available commands ({len(commands)}):\n")
                     for command in commands:
                         try:
-                            info = manager.get_command_info(command)
+                            info = manager.get_command_info(command, include_content=False)
                             print(f"[LIST] {command}")
                             print(f"   {info['description']}")
                             if info['tags']:
@@ -944,8 +1070,15 @@ def main():
                 return 1
 
         elif args.command == 'add-package':
+            if len(args.package_specs) > 1:
+                if args.ref:
+                    print(colored_status('ERROR', "--ref needs a single package; use owner/repo@ref for several"))
+                    return 1
+                summary = manager.install_packages(args.package_specs, clone=args.clone)
+                print_package_summary(summary, 'installed')
+                return 1 if summary['errors'] else 0
             try:
-                package = manager.install_package(args.package_spec, args.ref)
+                package = manager.install_package(args.package_specs[0], args.ref, clone=args.clone)
                 print(colored_status('CELEBRATE', f"Package '{package.name}' is ready to use!"))
                 print(f"   Use package commands with: {package.name}:command-name")
             except WardenError as e:
@@ -953,8 +1086,19 @@ def main():
                 return 1
 
         elif args.command == 'update-package':
+            if args.all == bool(args.package_names):
+                print(colored_status('ERROR', "Specify packages to update or --all, not both"
+                                     if args.all else "Specify packages to update or --all"))
+                return 1
+            if args.all or len(args.package_names) > 1:
+                if args.ref:
+                    print(colored_status('ERROR', "--ref needs a single package"))
+                    return 1
+                summary = manager.update_packages(None if args.all else args.package_names)
+                print_package_summary(summary, 'updated')
+                return 1 if summary['errors'] else 0
             try:
-                package = manager.update_package(args.package_name, args.ref)
+                package = manager.update_package(args.package_names[0], args.ref)
                 print(colored_status('CELEBRATE', f"Package '{package.name}' updated successfully!"))
             except WardenError as e:
                 print(colored_status('ERROR', str(e)))
@@ -967,6 +1111,23 @@ def main():
                 print(colored_status('ERROR', f"Package '{args.package_name}' not found"))
                 return 1
 
+        elif args.command == 'bundle':
+            if not args.bundle_command:
+                parser.parse_args(['bundle', '--help'])
+                return 1
+            try:
+                if args.bundle_command == 'export':
+                    manager.export_bundle(args.output, args.packages)
+                else:
+                    imported = manager.import_bundle(args.bundle, force=args.force)
+                    if imported:
+                        print(colored_status('CELEBRATE', f"Imported {len(imported)} package(s)"))
+                    else:
+                        print(colored_status('INFO', "No packages imported"))
+            except WardenError as e:
+                print(colored_status('ERROR', str(e)))
+                return 1
+
         elif args.command == 'list-packages':
             packages = manager.list_packages()
             if not packages:
@@ -976,7 +1137,7 @@ def main():
                 print(f"[PACKAGE] Installed packages ({len(packages)}):\n")
 
                 if args.status:
-                    status_map = manager.get_package_status()
+                    status_map = manager.get_package_status(max_age=0 if args.refresh else None)
 
                 for package in packages:
                     status_icon = colored_status('PACKAGE')
@@ -1012,14 +1173,15 @@ def main():
         elif args.command == 'check-updates':
             if args.diff:
                 try:
-                    diff_output = manager.show_package_diff(args.diff, args.files)
+                    diff_output = manager.show_package_diff(args.diff, args.files,
+                                                            max_age=0 if args.refresh else None)
                     print(diff_output)
                 except WardenError as e:
                     print(f"[ERROR] {e}")
                     return 1
             else:
                 print("[SEARCH] Checking for updates...")
-                updates = manager.check_package_updates()
+                updates = manager.check_package_updates(max_age=0 if args.refresh else None)
 
                 if not updates:
                     print("[SUCCESS] All packages are up to date!")
@@ -1030,7 +1192,10 @@ def main():
                         print(f"[UPDATE] {package_name}")
                         print(f"   Current: {update_info['current']}")
                         print(f"   Latest:  {update_info['latest']}")
-                        print(f"   Behind:  {commits} commit{'s' if commits != 1 else ''}")
+                        if commits is None:
+                            print("   Behind:  unknown (not fetched yet)")
+                        else:
+                            print(f"   Behind:  {commits} commit{'s' if commits != 1 else ''}")
                         print(f"   Update:  warden update-package {package_name}")
                         print()
 
@@ -1073,39 +1238,9 @@ def main():
                         print(f"   {tip}")
 
         elif args.command == 'rules':
-            # Get all available rules
-            all_rules = manager._get_available_rules()
-
-            # Get all projects to see where rules are installed
-            projects = manager.list_projects()
-
-            # Build a map of rule -> list of (project, target, path, is_remote)
-            rule_installations = {}
-            for rule in all_rules:
-                rule_installations[rule] = []
-
-            for project in projects:
-                for target_name, target_config in project.targets.items():
-                    installed_rules = target_config.get('installed_rules', [])
-                    for rule_info in installed_rules:
-                        rule_name = rule_info['name'] if isinstance(rule_info, dict) else rule_info
-
-                        # Add to installations map
-                        if rule_name not in rule_installations:
-                            rule_installations[rule_name] = []
-
-                        # Get the full path
-                        rules_path = project.get_rules_destination_path(manager.config, target_name)
-                        # Use target-specific extension for rules
-                        rule_extension = manager.config.get_target_rule_extension(target_name)
-
-                        rule_installations[rule_name].append({
-                            'project': project.name,
-                            'path': str(project.path),
-                            'target': target_name,
-                            'full_path': str(rules_path / f"{rule_name}{rule_extension}"),
-                            'is_remote': project.is_remote()
-                        })
+            # Map of rule -> list of (project, target, path, is_remote), served
+            # from the persistent reverse index instead of walking every project
+            rule_installations = manager.get_rule_installations()
 
             # Apply fuzzy matching filter if query provided
             if args.query:
@@ -1188,7 +1323,11 @@ def main():
             if args.project_name:
                 # Check specific project
                 try:
-                    status = manager.check_project_status(args.project_name)
+                    status = manager.check_project_status(args.project_name, fast=args.fast)
+
+                    if args.format == 'ndjson':
+                        print(format_status_ndjson(args.project_name, status))
+                        return 0
 
                     # Check if everything is clean
                     has_issues = any([
@@ -1263,45 +1402,55 @@ def main():
                     print(f"[ERROR] {e}")
                     return 1
             else:
-                # Check all projects
-                all_status = manager.check_all_projects_status()
+                # Check all projects, reusing verdicts of unchanged projects,
+                # and print each result as soon as it is available
+                max_age = 0 if args.refresh else args.max_age
+                results = manager.iter_all_projects_status(use_cache=True, max_age=max_age, fast=args.fast)
+
+                if args.format == 'ndjson':
+                    for project_name, status in results:
+                        print(format_status_ndjson(project_name, status), flush=True)
+                    return 0
 
                 # Check if remote projects are being skipped
                 include_remote = manager.config.config.get('update_remote_projects', True)
                 if not include_remote:
                     # Count remote projects
-                    remote_count = sum(1 for p in manager.config.state['projects'].values()
-                                     if ProjectState.from_dict(p).is_remote())
+                    remote_count = sum(1 for p in manager.list_projects() if p.is_remote())
                     if remote_count > 0:
                         print(f"[INFO] Skipping {remote_count} remote project(s) (remote updates disabled)")
                         print("      → Enable with: warden config --update-remote true\n")
 
-                if not all_status:
+                found = 0
+                for project_name, status in results:
+                    if status is None:
+                        continue
+                    found += 1
+
+                    if 'error' in status:
+                        print(colored_status('ERROR', f"{project_name}: {status['error']}"), flush=True)
+                        continue
+
+                    outdated_count = len(status.get('outdated_rules', [])) + len(status.get('outdated_commands', []))
+                    modified_count = len(status.get('user_modified_rules', [])) + len(status.get('user_modified_commands', []))
+                    conflict_count = len(status.get('conflict_rules', [])) + len(status.get('conflict_commands', []))
+                    missing_count = len(status.get('missing_sources', []))
+
+                    print(colored_status('UPDATE', f"{project_name}:"))
+                    if outdated_count > 0:
+                        print(f"   {outdated_count} outdated item(s)")
+                    if modified_count > 0:
+                        print(f"   {modified_count} user modified item(s)")
+                    if conflict_count > 0:
+                        print(f"   {conflict_count} conflict(s)")
+                    if missing_count > 0:
+                        print(f"   {missing_count} missing source(s)")
+                    print(flush=True)
+
+                if not found:
                     print(colored_status('SUCCESS', 'All projects are up to date'))
                 else:
-                    print(colored_status('INFO', f"Found {len(all_status)} project(s) with updates:\n"))
-
-                    for project_name, status in all_status.items():
-                        if 'error' in status:
-                            print(colored_status('ERROR', f"{project_name}: {status['error']}"))
-                            continue
-
-                        outdated_count = len(status.get('outdated_rules', [])) + len(status.get('outdated_commands', []))
-                        modified_count = len(status.get('user_modified_rules', [])) + len(status.get('user_modified_commands', []))
-                        conflict_count = len(status.get('conflict_rules', [])) + len(status.get('conflict_commands', []))
-                        missing_count = len(status.get('missing_sources', []))
-
-                        print(colored_status('UPDATE', f"{project_name}:"))
-                        if outdated_count > 0:
-                            print(f"   {outdated_count} outdated item(s)")
-                        if modified_count > 0:
-                            print(f"   {modified_count} user modified item(s)")
-                        if conflict_count > 0:
-                            print(f"   {conflict_count} conflict(s)")
-                        if missing_count > 0:
-                            print(f"   {missing_count} missing source(s)")
-                        print()
-
+                    print(colored_status('INFO', f"Found {found} project(s) with updates"))
                     print(colored_status('TIP', "Use 'warden <project>' for details"))
 
         elif args.command == 'diff':
@@ -1351,12 +1500,73 @@ def main():
                     print("[INFO] You can manually update using: git pull --rebase")
                 else:
                     print("[INFO] Agent Warden will check for updates once per day and apply them after commands complete")
+            elif args.state_journal:
+                # Set state_journal setting
+                value_map = {
+                    'true': True, 'yes': True, 'on': True,
+                    'false': False, 'no': False, 'off': False
+                }
+                new_value = value_map[args.state_journal.lower()]
+                manager.config.config['state_journal'] = new_value
+                manager.config.save_config()
+                if not new_value:
+                    # Fold any journaled changes back into the snapshot
+                    manager.config.compact_state()
+                status = "enabled" if new_value else "disabled"
+                print(f"[SUCCESS] State journal {status}")
+                if new_value:
+                    print(f"[INFO] Changes are appended to {manager.config.JOURNAL_FILE} and compacted into the state file periodically")
+            elif args.package_ref_ttl is not None:
+                # Set package_ref_ttl setting
+                if args.package_ref_ttl < 0:
+                    print("[ERROR] --package-ref-ttl must not be negative")
+                    return 1
+                manager.config.config['package_ref_ttl'] = args.package_ref_ttl
+                manager.config.save_config()
+                print(f"[SUCCESS] Remote package refs are reused for {args.package_ref_ttl:g} seconds")
+            elif args.package_prefetch:
+                # Set package_prefetch setting
+                value_map = {
+                    'true': True, 'yes': True, 'on': True,
+                    'false': False, 'no': False, 'off': False
+                }
+                new_value = value_map[args.package_prefetch.lower()]
+                manager.config.config['package_prefetch'] = new_value
+                manager.config.save_config()
+                status = "enabled" if new_value else "disabled"
+                print(f"[SUCCESS] Background package prefetch {status}")
+                if new_value:
+                    print("[INFO] Expired remote package refs are refreshed in the background after each command")
+            elif args.package_clone:
+                # Set package_clone setting
+                manager.config.config['package_clone'] = args.package_clone
+                manager.config.save_config()
+                print(f"[SUCCESS] New packages will use the '{args.package_clone}' clone strategy")
+                if args.package_clone != 'full':
+                    print("[INFO] Existing packages keep their strategy until re-added")
+            elif args.package_cache:
+                # Set package_cache setting
+                if args.package_cache.lower() == 'none':
+                    manager.config.config['package_cache'] = None
+                    manager.config.save_config()
+                    print("[SUCCESS] Package cache disabled")
+                else:
+                    cache_dir = Path(args.package_cache).expanduser().resolve()
+                    manager.config.config['package_cache'] = str(cache_dir)
+                    manager.config.save_config()
+                    print(f"[SUCCESS] Packages are cloned through mirrors in {cache_dir}")
+                    print("[INFO] Point other warden homes at the same directory to share objects")
             elif args.show:
                 # Show current configuration
                 print("Agent Warden Configuration:")
                 print(f"   Default Target: {manager.config.config['default_target']}")
                 print(f"   Update Remote Projects: {manager.config.config.get('update_remote_projects', True)}")
                 print(f"   Auto Update: {manager.config.config.get('auto_update', True)}")
+                print(f"   State Journal: {manager.config.config.get('state_journal', False)}")
+                print(f"   Package Ref TTL: {manager.config.config.get('package_ref_ttl', WardenConfig.DEFAULT_PACKAGE_REF_TTL):g}s")
+                print(f"   Package Prefetch: {manager.config.config.get('package_prefetch', False)}")
+                print(f"   Package Clone: {manager.config.config.get('package_clone', 'full')}")
+                print(f"   Package Cache: {manager.config.config.get('package_cache') or 'none'}")
                 print(f"   Base Path: {manager.config.base_path}")
                 print(f"   Rules Directory: {manager.config.rules_dir}")
                 print(f"   Commands Path: {manager.config.commands_path}")
@@ -1366,9 +1576,14 @@ def main():
                     supports_cmds = "✓" if config.get('supports_commands', False) else "✗"
                     print(f"   {target}: {supports_cmds} commands")
             else:
-                print("[ERROR] Must specify --set-default-target, --update-remote, --auto-update, or --show")
+                print("[ERROR] Must specify --set-default-target, --update-remote, --auto-update, --state-journal, "
+                      "--package-ref-ttl, --package-prefetch, --package-clone, --package-cache, or --show")
                 return 1
 
+        # Refresh expired package refs off the critical path (opt-in)
+        if manager.config.config.get('package_prefetch', False) and manager.has_stale_package_refs():
+            start_package_prefetch()
+
         # Perform auto-update if available (after successful command execution)
         if update_info:
             auto_updater.perform_update()